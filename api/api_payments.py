@@ -13,15 +13,27 @@ Integration: Lemon Squeezy for payment processing
 """
 
 import os
-import time
 import secrets
 import hashlib
 import logging
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, Response, request, jsonify, g
 from redis import Redis
 
+try:
+    from .dataset import get_dataset, public_repo
+    from .repo_index import RepoIndex
+    from .search_index import get_search_index
+    from .export import FORMATS, COLUMNAR_FORMATS, PYARROW_AVAILABLE, stream_export, gzip_stream
+    from .rate_limit import RateLimiter, window_keys
+except ImportError:
+    from api.dataset import get_dataset, public_repo
+    from api.repo_index import RepoIndex
+    from api.search_index import get_search_index
+    from api.export import FORMATS, COLUMNAR_FORMATS, PYARROW_AVAILABLE, stream_export, gzip_stream
+    from api.rate_limit import RateLimiter, window_keys
+
 # Configure logging
 logger = logging.getLogger("APIPayments")
 
@@ -71,6 +83,24 @@ PRICING_TIERS = {
     }
 }
 
+# Counts requests per API key (set up by init_api_payments)
+rate_limiter = None
+
+
+def init_api_payments(conn):
+    """Use ``conn`` for API key storage and rate limiting."""
+    global redis_conn, rate_limiter
+    redis_conn = conn
+    rate_limiter = None
+    if conn:
+        rate_limiter = RateLimiter(conn, {
+            name: (tier["rate_limit_per_minute"], tier["requests_per_day"])
+            for name, tier in PRICING_TIERS.items()
+        })
+
+
+init_api_payments(redis_conn)
+
 
 def generate_api_key():
     """Generate a secure API key."""
@@ -123,25 +153,28 @@ def check_rate_limit(api_key, tier):
         return True, 0, 0
 
     tier_config = PRICING_TIERS.get(tier, PRICING_TIERS["free"])
-    key_hash = hash_api_key(api_key)
 
-    # Check minute rate limit
-    minute_key = f"rate:{key_hash}:minute:{int(time.time() // 60)}"
-    minute_count = redis_conn.incr(minute_key)
-    redis_conn.expire(minute_key, 60)
+    # Minute and daily windows, checked atomically in one round trip
+    return rate_limiter.hit(
+        hash_api_key(api_key),
+        tier_config["rate_limit_per_minute"],
+        tier_config["requests_per_day"]
+    )
 
-    if minute_count > tier_config["rate_limit_per_minute"]:
-        return False, minute_count, tier_config["rate_limit_per_minute"]
 
-    # Check daily limit
-    day_key = f"rate:{key_hash}:day:{datetime.utcnow().strftime('%Y-%m-%d')}"
-    day_count = redis_conn.incr(day_key)
-    redis_conn.expire(day_key, 86400)
+def authorize_request(api_key):
+    """
+    Look up an API key and count the request against its rate limits.
 
-    if day_count > tier_config["requests_per_day"]:
-        return False, day_count, tier_config["requests_per_day"]
+    Returns:
+        (key data or None, (allowed, current, limit) or None if the key is
+        unknown or inactive)
+    """
+    if not redis_conn:
+        return None, None
 
-    return True, day_count, tier_config["requests_per_day"]
+    # One round trip for the key lookup and both rate windows
+    return rate_limiter.authorize(hash_api_key(api_key))
 
 
 def require_api_key(f):
@@ -157,17 +190,16 @@ def require_api_key(f):
                 "docs": "https://bestof-opensource.dev/api/docs"
             }), 401
 
-        # Validate API key
-        key_data = get_api_key_data(api_key)
+        # Validate API key and check rate limits
+        key_data, rate = authorize_request(api_key)
         if not key_data or key_data.get("active") != "true":
             return jsonify({
                 "error": "Invalid API key",
                 "message": "The provided API key is invalid or has been revoked"
             }), 401
 
-        # Check rate limits
         tier = key_data.get("tier", "free")
-        allowed, current, limit = check_rate_limit(api_key, tier)
+        allowed, current, limit = rate
 
         # Add rate limit headers
         g.rate_limit_remaining = max(0, limit - current)
@@ -215,10 +247,8 @@ def list_repos():
         - category (str): Filter by category
         - sort (str): Sort by field (stars, score, updated)
         - order (str): Sort order (asc, desc)
+        - cursor (str): meta.next_cursor of the previous page (instead of page; meta.page is then null)
     """
-    import json
-    from pathlib import Path
-
     # Parse query parameters
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
@@ -227,63 +257,43 @@ def list_repos():
     category = request.args.get('category')
     sort_by = request.args.get('sort', 'score')
     order = request.args.get('order', 'desc')
+    cursor = request.args.get('cursor')
+
+    # Filter/sort indexes of ai_scan.json (main scan results), built once per
+    # loaded snapshot
+    dataset = get_dataset()
+    index = dataset.derived("repo_index", lambda snapshot: RepoIndex(snapshot.repos))
+
+    try:
+        ids, total, next_cursor = index.page(
+            language=language,
+            category=category,
+            min_score=min_score,
+            sort_by=sort_by,
+            descending=order.lower() == 'desc',
+            offset=(page - 1) * per_page,
+            limit=per_page,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        return jsonify({
+            "error": "Invalid cursor",
+            "message": str(e)
+        }), 400
 
-    # Load repository data
-    output_dir = Path(__file__).parent.parent / "output"
-    repos = []
-
-    # Load from ai_scan.json (main scan results)
-    ai_scan_path = output_dir / "ai_scan.json"
-    if ai_scan_path.exists():
-        try:
-            with open(ai_scan_path) as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    repos.extend(data)
-                elif isinstance(data, dict) and "repos" in data:
-                    repos.extend(data["repos"])
-        except Exception as e:
-            logger.error(f"Error loading ai_scan.json: {e}")
-
-    # Apply filters
-    if language:
-        repos = [r for r in repos if r.get("language", "").lower() == language.lower()]
-
-    if min_score:
-        repos = [r for r in repos if r.get("score", 0) >= min_score]
-
-    if category:
-        repos = [r for r in repos if category.lower() in [c.lower() for c in r.get("categories", [])]]
-
-    # Sort
-    reverse = order.lower() == 'desc'
-    if sort_by == 'stars':
-        repos.sort(key=lambda x: x.get("stargazers_count", 0), reverse=reverse)
-    elif sort_by == 'updated':
-        repos.sort(key=lambda x: x.get("updated_at", ""), reverse=reverse)
-    else:
-        repos.sort(key=lambda x: x.get("score", 0), reverse=reverse)
-
-    # Paginate
-    total = len(repos)
-    start = (page - 1) * per_page
-    end = start + per_page
-    repos_page = repos[start:end]
-
-    # Filter data based on tier
-    if "insights" not in g.api_features:
-        # Remove insights for free tier
-        for repo in repos_page:
-            repo.pop("insights", None)
-            repo.pop("ai_analysis", None)
+    # Filter data based on tier (per-response copies; the snapshot is shared)
+    include_insights = "insights" in g.api_features
+    repos_page = [public_repo(dataset.repos[doc_id], include_insights) for doc_id in ids]
 
     return jsonify({
         "data": repos_page,
         "meta": {
             "total": total,
-            "page": page,
+            # A cursor replaces page-based paging
+            "page": None if cursor else page,
             "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
+            "total_pages": (total + per_page - 1) // per_page,
+            "next_cursor": next_cursor
         }
     })
 
@@ -297,29 +307,11 @@ def get_repo(repo_name):
     Path Parameters:
         - repo_name: Full repository name (owner/repo)
     """
-    import json
-    from pathlib import Path
-
-    output_dir = Path(__file__).parent.parent / "output"
-
-    # Search for the repository
-    ai_scan_path = output_dir / "ai_scan.json"
-    if ai_scan_path.exists():
-        try:
-            with open(ai_scan_path) as f:
-                data = json.load(f)
-                repos = data if isinstance(data, list) else data.get("repos", [])
-
-                for repo in repos:
-                    if repo.get("full_name", "").lower() == repo_name.lower():
-                        # Filter based on tier
-                        if "insights" not in g.api_features:
-                            repo.pop("insights", None)
-                            repo.pop("ai_analysis", None)
-
-                        return jsonify({"data": repo})
-        except Exception as e:
-            logger.error(f"Error searching for repo: {e}")
+    # Look up the repository by name
+    repo = get_dataset().get(repo_name)
+    if repo is not None:
+        # Filter based on tier
+        return jsonify({"data": public_repo(repo, "insights" in g.api_features)})
 
     return jsonify({
         "error": "Repository not found",
@@ -334,13 +326,11 @@ def search_repos():
     Search repositories by keyword.
 
     Query Parameters:
-        - q (str): Search query (searches name, description, topics)
+        - q (str): Search query (searches name, description, topics; words
+          match exactly, by prefix or inside longer words)
         - page (int): Page number
         - per_page (int): Results per page
     """
-    import json
-    from pathlib import Path
-
     query = request.args.get('q', '').lower()
     if not query:
         return jsonify({
@@ -351,54 +341,14 @@ def search_repos():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
 
-    output_dir = Path(__file__).parent.parent / "output"
-    repos = []
+    # Ranked full-text search (BM25 blended with score), kept in sync with
+    # the dataset
+    index = get_search_index(get_dataset())
+    repos, total = index.search(query, offset=(page - 1) * per_page, limit=per_page)
 
-    ai_scan_path = output_dir / "ai_scan.json"
-    if ai_scan_path.exists():
-        try:
-            with open(ai_scan_path) as f:
-                data = json.load(f)
-                all_repos = data if isinstance(data, list) else data.get("repos", [])
-
-                for repo in all_repos:
-                    searchable = " ".join([
-                        repo.get("name", ""),
-                        repo.get("full_name", ""),
-                        repo.get("description", "") or "",
-                        " ".join(repo.get("topics", []))
-                    ]).lower()
-
-                    if query in searchable:
-                        repos.append(repo)
-        except Exception as e:
-            logger.error(f"Error searching repos: {e}")
-
-    # Sort by relevance (simple scoring)
-    def relevance_score(repo):
-        score = 0
-        name = repo.get("name", "").lower()
-        if query == name:
-            score += 100
-        elif query in name:
-            score += 50
-        if query in repo.get("description", "").lower():
-            score += 20
-        score += repo.get("score", 0) / 10
-        return score
-
-    repos.sort(key=relevance_score, reverse=True)
-
-    # Paginate
-    total = len(repos)
-    start = (page - 1) * per_page
-    repos_page = repos[start:start + per_page]
-
-    # Filter based on tier
-    if "insights" not in g.api_features:
-        for repo in repos_page:
-            repo.pop("insights", None)
-            repo.pop("ai_analysis", None)
+    # Filter based on tier (per-response copies; the snapshot is shared)
+    include_insights = "insights" in g.api_features
+    repos_page = [public_repo(repo, include_insights) for repo in repos]
 
     return jsonify({
         "data": repos_page,
@@ -415,11 +365,7 @@ def search_repos():
 @require_api_key
 def get_stats():
     """Get overall statistics about scanned repositories."""
-    import json
-    from pathlib import Path
-    from collections import Counter
-
-    output_dir = Path(__file__).parent.parent / "output"
+    dataset = get_dataset()
 
     stats = {
         "total_repos": 0,
@@ -429,36 +375,40 @@ def get_stats():
         "last_updated": None
     }
 
-    ai_scan_path = output_dir / "ai_scan.json"
-    if ai_scan_path.exists():
+    if dataset.fingerprint is not None:
         try:
-            with open(ai_scan_path) as f:
-                data = json.load(f)
-                repos = data if isinstance(data, list) else data.get("repos", [])
-
-                stats["total_repos"] = len(repos)
-
-                languages = Counter()
-                categories = Counter()
-                total_score = 0
-
-                for repo in repos:
-                    if repo.get("language"):
-                        languages[repo["language"]] += 1
-                    for cat in repo.get("categories", []):
-                        categories[cat] += 1
-                    total_score += repo.get("score", 0)
-
-                stats["languages"] = dict(languages.most_common(20))
-                stats["categories"] = dict(categories.most_common(20))
-                stats["average_score"] = round(total_score / max(1, len(repos)), 2)
-                stats["last_updated"] = datetime.utcnow().isoformat()
+            # Aggregates are computed once per loaded snapshot
+            stats.update(dataset.derived("stats", _compute_stats))
+            stats["last_updated"] = datetime.utcnow().isoformat()
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
 
     return jsonify({"data": stats})
 
 
+def _compute_stats(dataset):
+    """Aggregate language/category counts and the mean score of a snapshot."""
+    from collections import Counter
+
+    languages = Counter()
+    categories = Counter()
+    total_score = 0
+
+    for repo in dataset.repos:
+        if repo.get("language"):
+            languages[repo["language"]] += 1
+        for cat in repo.get("categories", []):
+            categories[cat] += 1
+        total_score += repo.get("score", 0)
+
+    return {
+        "total_repos": len(dataset.repos),
+        "languages": dict(languages.most_common(20)),
+        "categories": dict(categories.most_common(20)),
+        "average_score": round(total_score / max(1, len(dataset.repos)), 2),
+    }
+
+
 @api_bp.route('/export', methods=['GET'])
 @require_api_key
 def export_data():
@@ -466,7 +416,10 @@ def export_data():
     Export all repository data (Enterprise only).
 
     Query Parameters:
-        - format (str): Export format (json, csv)
+        - format (str): Export format (json, ndjson, csv, parquet, arrow)
+
+    The response is streamed, and gzip-encoded when the client sends
+    ``Accept-Encoding: gzip`` (except for Parquet/Arrow).
     """
     if "bulk_export" not in g.api_features:
         return jsonify({
@@ -475,36 +428,31 @@ def export_data():
             "upgrade_url": "https://bestof-opensource.dev/api/pricing"
         }), 403
 
-    import json
-    from pathlib import Path
-
     export_format = request.args.get('format', 'json')
-    output_dir = Path(__file__).parent.parent / "output"
+    if export_format not in FORMATS:
+        export_format = 'json'
 
-    ai_scan_path = output_dir / "ai_scan.json"
-    if ai_scan_path.exists():
-        with open(ai_scan_path) as f:
-            data = json.load(f)
-            repos = data if isinstance(data, list) else data.get("repos", [])
-
-            if export_format == 'csv':
-                import csv
-                import io
-
-                output = io.StringIO()
-                if repos:
-                    writer = csv.DictWriter(output, fieldnames=repos[0].keys())
-                    writer.writeheader()
-                    writer.writerows(repos)
+    if export_format in COLUMNAR_FORMATS and not PYARROW_AVAILABLE:
+        return jsonify({
+            "error": "Format not available",
+            "message": f"{export_format} export is not available on this server, use ndjson or csv"
+        }), 400
 
-                return output.getvalue(), 200, {
-                    'Content-Type': 'text/csv',
-                    'Content-Disposition': 'attachment; filename=repos_export.csv'
-                }
+    # The snapshot is immutable, so the generator can keep reading it after
+    # a reload swaps in a newer one
+    repos = get_dataset().repos
+    content_type, extension = FORMATS[export_format]
+    headers = {}
+    if export_format != 'json':
+        headers['Content-Disposition'] = f'attachment; filename=repos_export.{extension}'
 
-            return jsonify({"data": repos})
+    chunks = stream_export(repos, export_format)
+    if export_format not in COLUMNAR_FORMATS and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        chunks = gzip_stream(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
 
-    return jsonify({"data": []})
+    return Response(chunks, content_type=content_type, headers=headers)
 
 
 # ============================================================
@@ -592,8 +540,7 @@ def get_key_status():
     tier_config = PRICING_TIERS[tier]
 
     # Get current usage
-    key_hash = hash_api_key(g.api_key)
-    day_key = f"rate:{key_hash}:day:{datetime.utcnow().strftime('%Y-%m-%d')}"
+    _, day_key = window_keys(hash_api_key(g.api_key))
 
     daily_usage = 0
     if redis_conn:
@@ -0,0 +1,164 @@
+"""
+Process-wide, read-only cache of the scan dataset served by /api/v1.
+
+``output/ai_scan.json`` is loaded once and shared by every request. Each
+access stats the file; when its mtime, inode or size changes the file is
+re-parsed into a new snapshot and swapped in atomically, so a request always
+sees one consistent snapshot. Repos are exposed as read-only mappings;
+only the top level is protected (nested lists and dicts stay plain JSON
+values for the indexes and export writers), so code must not mutate nested
+values in place. Endpoints build per-response deep copies (see
+``public_repo``) instead of touching shared data.
+"""
+
+import os
+import copy
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger("APIDataset")
+
+DEFAULT_PATH = Path(__file__).parent.parent / "output" / "ai_scan.json"
+
+# Fields only paid tiers with the "insights" feature receive
+PREMIUM_FIELDS = ("insights", "ai_analysis")
+
+
+def _freeze(repo: Dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a repo's top-level fields (nested values are shared as is)."""
+    return MappingProxyType(repo)
+
+
+class DatasetSnapshot:
+    """One immutable load of the dataset, plus memoized derived data."""
+
+    def __init__(self, repos: List[Dict[str, Any]], fingerprint: Optional[Tuple[int, int, int]] = None):
+        self.repos: Tuple[Mapping[str, Any], ...] = tuple(_freeze(repo) for repo in repos)
+        self.fingerprint = fingerprint
+        self.loaded_at = time.time()
+        self._by_name: Dict[str, Mapping[str, Any]] = {}
+        for repo in self.repos:
+            # First occurrence wins, as the old linear scan did
+            self._by_name.setdefault((repo.get("full_name") or "").lower(), repo)
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.repos)
+
+    def get(self, full_name: str) -> Optional[Mapping[str, Any]]:
+        """Repo by full name (case-insensitive)."""
+        return self._by_name.get(full_name.lower())
+
+    def derived(self, name: str, build: Callable[["DatasetSnapshot"], Any]) -> Any:
+        """
+        Data computed from this snapshot once (e.g. stats or an index).
+
+        It is dropped together with the snapshot when the file changes.
+        """
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+
+class DatasetHolder:
+    """
+    Loads a JSON scan file once and reloads it when it changes on disk.
+
+    Args:
+        path: JSON file holding a list of repos or ``{"repos": [...]}``.
+        check_interval: Minimum seconds between stat() checks (0 checks on
+            every access).
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH, check_interval: float = 0.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._snapshot = DatasetSnapshot([])
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._failed: Optional[Tuple[int, int, int]] = None
+        self.reloads = 0
+
+    def _fingerprint(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def _load(self, fingerprint: Tuple[int, int, int]) -> DatasetSnapshot:
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            repos = data
+        elif isinstance(data, dict):
+            repos = data.get("repos", [])
+        else:
+            repos = []
+        return DatasetSnapshot(repos, fingerprint)
+
+    def get(self) -> DatasetSnapshot:
+        """The current snapshot, reloading first if the file changed."""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if self.check_interval and now - self._last_check < self.check_interval:
+            return snapshot
+        self._last_check = now
+
+        fingerprint = self._fingerprint()
+        if fingerprint == snapshot.fingerprint or (fingerprint is not None and fingerprint == self._failed):
+            return snapshot
+
+        with self._lock:
+            # Another request may have reloaded while we waited
+            if self._snapshot.fingerprint == fingerprint:
+                return self._snapshot
+            if fingerprint is None:
+                self._snapshot = DatasetSnapshot([])
+                return self._snapshot
+            try:
+                new_snapshot = self._load(fingerprint)
+            except Exception as e:
+                # e.g. a writer mid-update: keep serving the previous snapshot
+                logger.error(f"Error loading {self.path.name}: {e}")
+                self._failed = fingerprint
+                return self._snapshot
+            self._snapshot = new_snapshot
+            self.reloads += 1
+            logger.info(f"Loaded {len(new_snapshot)} repos from {self.path.name}")
+            return new_snapshot
+
+
+def public_repo(repo: Mapping[str, Any], include_premium: bool) -> Dict[str, Any]:
+    """
+    Response copy of ``repo``, without premium fields unless allowed.
+
+    Nested values (``insights``, ``topics``, ...) are deep-copied, so
+    changing the response cannot reach the shared snapshot.
+    """
+    return {
+        key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for key, value in repo.items()
+        if include_premium or key not in PREMIUM_FIELDS
+    }
+
+
+_holder: Optional[DatasetHolder] = None
+_holder_lock = threading.Lock()
+
+
+def get_dataset() -> DatasetSnapshot:
+    """Current snapshot of the process-wide dataset (``AI_SCAN_PATH`` overrides the file)."""
+    global _holder
+    if _holder is None:
+        with _holder_lock:
+            if _holder is None:
+                _holder = DatasetHolder(Path(os.getenv("AI_SCAN_PATH", str(DEFAULT_PATH))))
+    return _holder.get()
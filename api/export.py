@@ -0,0 +1,213 @@
+"""
+Streaming bulk export for /api/v1/export.
+
+Each format is a generator of byte chunks, written a batch of rows at a
+time, so the response starts immediately and memory stays flat however
+large the dataset is. CSV and the columnar formats use the fixed
+``EXPORT_COLUMNS`` schema; JSON and NDJSON export every field.
+
+Parquet and Arrow output need ``pyarrow`` (optional).
+"""
+
+import io
+import csv
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Mapping
+
+# Check if pyarrow is available for Parquet/Arrow output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Stable export schema: (column, type). Lists and objects are JSON-encoded in CSV.
+EXPORT_COLUMNS = (
+    ("full_name", "string"),
+    ("name", "string"),
+    ("description", "string"),
+    ("html_url", "string"),
+    ("language", "string"),
+    ("stargazers_count", "int"),
+    ("forks_count", "int"),
+    ("open_issues_count", "int"),
+    ("topics", "list"),
+    ("categories", "list"),
+    ("score", "float"),
+    ("created_at", "string"),
+    ("updated_at", "string"),
+    ("pushed_at", "string"),
+    ("insights", "json"),
+    ("ai_analysis", "json"),
+)
+
+# format -> (content type, file extension)
+FORMATS = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+BATCH_SIZE = 500
+
+
+def _batches(repos: Iterable[Mapping[str, Any]], size: int = BATCH_SIZE) -> Iterator[list]:
+    batch = []
+    for repo in repos:
+        batch.append(repo)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _dumps(repo: Mapping[str, Any]) -> str:
+    return json.dumps(dict(repo), ensure_ascii=False, default=str)
+
+
+def stream_json(repos: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    """``{"data": [...]}``, as the non-streaming export returned."""
+    yield b'{"data": ['
+    first = True
+    for batch in _batches(repos):
+        chunk = ",\n".join(_dumps(repo) for repo in batch)
+        yield (chunk if first else ",\n" + chunk).encode("utf-8")
+        first = False
+    yield b"]}\n"
+
+
+def stream_ndjson(repos: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    """One JSON object per line."""
+    for batch in _batches(repos):
+        yield "".join(_dumps(repo) + "\n" for repo in batch).encode("utf-8")
+
+
+def _csv_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return ""
+    if kind in ("list", "json") or isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def stream_csv(repos: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    """CSV with the ``EXPORT_COLUMNS`` header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column for column, _ in EXPORT_COLUMNS])
+    for batch in _batches(repos):
+        for repo in batch:
+            writer.writerow([_csv_value(repo.get(column), kind) for column, kind in EXPORT_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only (no repos)
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema():
+    types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "list": pa.list_(pa.string()),
+        "json": pa.string(),
+    }
+    return pa.schema([(column, types[kind]) for column, kind in EXPORT_COLUMNS])
+
+
+def _arrow_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return None
+    try:
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    if kind == "list":
+        return [str(item) for item in value] if isinstance(value, list) else None
+    if kind == "json":
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def _arrow_batch(batch: list, schema) -> "pa.RecordBatch":
+    columns: Dict[str, list] = {column: [] for column, _ in EXPORT_COLUMNS}
+    for repo in batch:
+        for column, kind in EXPORT_COLUMNS:
+            columns[column].append(_arrow_value(repo.get(column), kind))
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def stream_columnar(repos: Iterable[Mapping[str, Any]], export_format: str) -> Iterator[bytes]:
+    """Parquet (one row group per batch) or an Arrow IPC stream."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet/Arrow export. Install with: pip install pyarrow")
+
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for batch in _batches(repos):
+            if export_format == "parquet":
+                writer.write_batch(_arrow_batch(batch, schema), row_group_size=BATCH_SIZE)
+            else:
+                writer.write_batch(_arrow_batch(batch, schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(repos: Iterable[Mapping[str, Any]], export_format: str) -> Iterator[bytes]:
+    """Chunks of ``repos`` in ``export_format`` (a key of ``FORMATS``)."""
+    if export_format in COLUMNAR_FORMATS:
+        return stream_columnar(repos, export_format)
+    if export_format == "csv":
+        return stream_csv(repos)
+    if export_format == "ndjson":
+        return stream_ndjson(repos)
+    return stream_json(repos)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a chunk stream incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,176 @@
+"""
+Redis rate limiting for the paid API in one round trip.
+
+Requests are counted in fixed per-minute and per-day windows
+(``rate:<key hash>:minute:<minute>`` / ``rate:<key hash>:day:<date>``). The
+counting runs as a Lua script, so both windows are checked and updated
+atomically in a single call; ``authorize`` also reads the API key's hash in
+the same script, making authentication plus rate limiting one round trip
+instead of five.
+
+If the server does not run scripts (no EVAL/EVALSHA, scripting disabled
+or denied by ACL), the limiter switches to pipelined commands (three round
+trips) for good; other script errors fall back for that call only.
+"""
+
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger("RateLimit")
+
+MINUTE_TTL = 60
+DAY_TTL = 86400
+
+# (allowed, current count, limit) of the window that decided
+RateResult = Tuple[bool, int, int]
+
+# Error text meaning the server will never run the scripts
+_SCRIPTING_UNAVAILABLE = ("unknown command", "no permissions", "scripting is disabled", "noscript")
+
+_COUNT_WINDOWS = """
+local function hit(minute_key, day_key, minute_limit, day_limit)
+    local minute_count = redis.call('INCR', minute_key)
+    if minute_count == 1 then redis.call('EXPIRE', minute_key, ARGV[1]) end
+    if minute_count > minute_limit then return {0, minute_count, minute_limit} end
+
+    local day_count = redis.call('INCR', day_key)
+    if day_count == 1 then redis.call('EXPIRE', day_key, ARGV[2]) end
+    if day_count > day_limit then return {0, day_count, day_limit} end
+    return {1, day_count, day_limit}
+end
+"""
+
+# KEYS: minute key, day key. ARGV: minute TTL, day TTL, minute limit, day limit.
+RATE_LIMIT_SCRIPT = _COUNT_WINDOWS + """
+return hit(KEYS[1], KEYS[2], tonumber(ARGV[3]), tonumber(ARGV[4]))
+"""
+
+# KEYS: API key hash, minute key, day key.
+# ARGV: minute TTL, day TTL, then (tier, minute limit, day limit) triples
+# with the default tier first.
+AUTHORIZE_SCRIPT = _COUNT_WINDOWS + """
+local data = redis.call('HGETALL', KEYS[1])
+local fields = {}
+for i = 1, #data, 2 do fields[data[i]] = data[i + 1] end
+if fields['active'] ~= 'true' then return {data} end
+
+local tier = fields['tier'] or ''
+local minute_limit, day_limit = tonumber(ARGV[4]), tonumber(ARGV[5])
+for i = 3, #ARGV, 3 do
+    if ARGV[i] == tier then
+        minute_limit, day_limit = tonumber(ARGV[i + 1]), tonumber(ARGV[i + 2])
+    end
+end
+
+local result = hit(KEYS[2], KEYS[3], minute_limit, day_limit)
+return {data, result[1], result[2], result[3]}
+"""
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def window_keys(key_hash: str, now: Optional[float] = None) -> Tuple[str, str]:
+    """Minute and day counter keys of an API key for the time ``now``."""
+    now = time.time() if now is None else now
+    day = datetime.utcfromtimestamp(now).strftime('%Y-%m-%d')
+    return f"rate:{key_hash}:minute:{int(now // 60)}", f"rate:{key_hash}:day:{day}"
+
+
+class RateLimiter:
+    """
+    Per-minute and per-day request limits for API keys.
+
+    Args:
+        redis_conn: Redis connection.
+        tiers: Tier name -> (requests per minute, requests per day).
+        default_tier: Tier whose limits apply to unknown tiers.
+    """
+
+    def __init__(self, redis_conn, tiers: Dict[str, Tuple[int, int]], default_tier: str = "free"):
+        self.redis = redis_conn
+        self.scripting = True
+        self._rate_limit = redis_conn.register_script(RATE_LIMIT_SCRIPT)
+        self._authorize = redis_conn.register_script(AUTHORIZE_SCRIPT)
+
+        self.tiers = dict(tiers)
+        self.default_tier = default_tier
+        ordered = [default_tier] + [name for name in self.tiers if name != default_tier]
+        self._tier_args = []
+        for name in ordered:
+            minute_limit, day_limit = self.tiers[name]
+            self._tier_args.extend([name, minute_limit, day_limit])
+
+    def _script_failed(self, e: ResponseError):
+        """Stop using scripts if the server cannot run them; otherwise just this call falls back."""
+        if any(marker in str(e).lower() for marker in _SCRIPTING_UNAVAILABLE):
+            logger.warning(f"Redis scripting unavailable, falling back to pipelines: {e}")
+            self.scripting = False
+        else:
+            logger.warning(f"Rate limit script failed, using pipelines for this request: {e}")
+
+    def _hit_pipelined(self, minute_key: str, day_key: str, minute_limit: int, day_limit: int) -> RateResult:
+        pipe = self.redis.pipeline()
+        pipe.incr(minute_key)
+        pipe.expire(minute_key, MINUTE_TTL)
+        minute_count = pipe.execute()[0]
+        if minute_count > minute_limit:
+            return False, minute_count, minute_limit
+
+        pipe = self.redis.pipeline()
+        pipe.incr(day_key)
+        pipe.expire(day_key, DAY_TTL)
+        day_count = pipe.execute()[0]
+        if day_count > day_limit:
+            return False, day_count, day_limit
+        return True, day_count, day_limit
+
+    def hit(self, key_hash: str, minute_limit: int, day_limit: int, now: Optional[float] = None) -> RateResult:
+        """Count one request for ``key_hash`` against both windows."""
+        minute_key, day_key = window_keys(key_hash, now)
+        if self.scripting:
+            try:
+                allowed, current, limit = self._rate_limit(
+                    keys=[minute_key, day_key],
+                    args=[MINUTE_TTL, DAY_TTL, minute_limit, day_limit],
+                )
+                return bool(allowed), int(current), int(limit)
+            except ResponseError as e:
+                self._script_failed(e)
+        return self._hit_pipelined(minute_key, day_key, minute_limit, day_limit)
+
+    def authorize(self, key_hash: str, now: Optional[float] = None) -> Tuple[Optional[Dict[str, str]], Optional[RateResult]]:
+        """
+        Look up an API key and, if it is active, count the request.
+
+        Returns:
+            ``(key data or None, rate result or None)``; the rate result is
+            None when the key is unknown or inactive (nothing is counted).
+        """
+        minute_key, day_key = window_keys(key_hash, now)
+        if self.scripting:
+            try:
+                reply = self._authorize(
+                    keys=[f"api_key:{key_hash}", minute_key, day_key],
+                    args=[MINUTE_TTL, DAY_TTL] + self._tier_args,
+                )
+            except ResponseError as e:
+                self._script_failed(e)
+            else:
+                raw = reply[0]
+                key_data = {_text(raw[i]): _text(raw[i + 1]) for i in range(0, len(raw), 2)} or None
+                if len(reply) == 1:
+                    return key_data, None
+                return key_data, (bool(reply[1]), int(reply[2]), int(reply[3]))
+
+        key_data = {_text(k): _text(v) for k, v in self.redis.hgetall(f"api_key:{key_hash}").items()} or None
+        if not key_data or key_data.get("active") != "true":
+            return key_data, None
+        tier = key_data.get("tier", "")
+        minute_limit, day_limit = self.tiers.get(tier, self.tiers[self.default_tier])
+        return key_data, self._hit_pipelined(minute_key, day_key, minute_limit, day_limit)
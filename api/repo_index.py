@@ -0,0 +1,229 @@
+"""
+Secondary indexes over a dataset snapshot for /api/v1/repos.
+
+Built once per loaded snapshot (via ``DatasetSnapshot.derived``): for every
+sort key and direction, the repo ids in that order, overall and per
+language, per category and per (language, category) pair. A page request
+picks the array for its filters and slices it; ``min_score`` is a cut-off
+found by binary search (on the score-sorted array of the same filter), so
+a page costs O(page size) instead of a filter and sort of the whole
+dataset.
+
+Orders match what ``list.sort`` produced before: ties keep the file order in
+both directions.
+"""
+
+import json
+import base64
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+# sort parameter -> (repo field, default value)
+SORT_FIELDS = {
+    "score": ("score", 0),
+    "stars": ("stargazers_count", 0),
+    "updated": ("updated_at", ""),
+}
+DEFAULT_SORT = "score"
+
+# With min_score on another sort, the filter's array is walked (skipping
+# low scores) when at least this fraction passes; otherwise the passing ids
+# are taken from the score order and sorted
+_WALK_ABOVE = 0.25
+
+# Filter key for "no language/category filter"
+ALL = ()
+
+
+def encode_cursor(sort_by: str, descending: bool, value: Any, full_name: str) -> str:
+    """Opaque cursor pointing just after the repo ``full_name``."""
+    raw = json.dumps([sort_by, descending, value, full_name], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, Any, str]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_by, descending, value, full_name = json.loads(raw)
+    except Exception as e:
+        raise ValueError(f"Malformed cursor: {e}") from e
+    if sort_by not in SORT_FIELDS or not isinstance(descending, bool) or not isinstance(full_name, str):
+        raise ValueError("Malformed cursor")
+    return sort_by, descending, value, full_name
+
+
+class RepoIndex:
+    """
+    Filter and sort indexes over a sequence of repos.
+
+    Args:
+        repos: The snapshot's repos; ids are positions in this sequence.
+    """
+
+    def __init__(self, repos: Sequence[Mapping[str, Any]]):
+        self.repos = repos
+        self._by_name: Dict[str, int] = {}
+        self._values: Dict[str, List[Any]] = {sort_by: [] for sort_by in SORT_FIELDS}
+        keys: List[List[Hashable]] = []
+
+        for doc_id, repo in enumerate(repos):
+            self._by_name.setdefault((repo.get("full_name") or "").lower(), doc_id)
+            for sort_by, (field, default) in SORT_FIELDS.items():
+                value = repo.get(field, default)
+                self._values[sort_by].append(default if value is None else value)
+            keys.append(self._filter_keys(repo))
+
+        # (sort, descending) -> filter key -> ids in that order; and
+        # (sort, descending) -> id -> position in the unfiltered order
+        self._orders: Dict[Tuple[str, bool], Dict[Hashable, List[int]]] = {}
+        self._ranks: Dict[Tuple[str, bool], List[int]] = {}
+        for sort_by, values in self._values.items():
+            for descending in (False, True):
+                order = sorted(range(len(repos)), key=values.__getitem__, reverse=descending)
+                rank = [0] * len(order)
+                groups: Dict[Hashable, List[int]] = {ALL: order}
+                for position, doc_id in enumerate(order):
+                    rank[doc_id] = position
+                    for key in keys[doc_id]:
+                        groups.setdefault(key, []).append(doc_id)
+                self._orders[sort_by, descending] = groups
+                self._ranks[sort_by, descending] = rank
+
+    def __len__(self) -> int:
+        return len(self.repos)
+
+    @staticmethod
+    def _filter_keys(repo: Mapping[str, Any]) -> List[Hashable]:
+        language = (repo.get("language") or "").lower()
+        categories = dict.fromkeys(str(category).lower() for category in repo.get("categories") or [])
+        keys: List[Hashable] = [("language", language)]
+        for category in categories:
+            keys.append(("category", category))
+            keys.append(("both", language, category))
+        return keys
+
+    @staticmethod
+    def _filter_key(language: Optional[str], category: Optional[str]) -> Hashable:
+        if language and category:
+            return ("both", language.lower(), category.lower())
+        if language:
+            return ("language", language.lower())
+        if category:
+            return ("category", category.lower())
+        return ALL
+
+    def _start_after(self, sort_by: str, descending: bool, value: Any, full_name: str) -> int:
+        """Position in the (sort, direction) order just after the cursor's repo."""
+        order = self._orders[sort_by, descending][ALL]
+        values = self._values[sort_by]
+        doc_id = self._by_name.get(full_name.lower())
+        if doc_id is not None and values[doc_id] == value:
+            return self._ranks[sort_by, descending][doc_id] + 1
+
+        # The repo is gone or changed since the cursor was issued: resume
+        # after every repo sorting at or before the cursor's value
+        low, high = 0, len(order)
+        try:
+            while low < high:
+                middle = (low + high) // 2
+                current = values[order[middle]]
+                if (current >= value) if descending else (current <= value):
+                    low = middle + 1
+                else:
+                    high = middle
+        except TypeError as e:
+            raise ValueError("Cursor does not match this sort") from e
+        return low
+
+    def page(
+        self,
+        language: Optional[str] = None,
+        category: Optional[str] = None,
+        min_score: Optional[float] = None,
+        sort_by: str = DEFAULT_SORT,
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[int], int, Optional[str]]:
+        """
+        One page of matching repo ids.
+
+        Args:
+            offset: Matches to skip (ignored when ``cursor`` is given).
+            cursor: ``next_cursor`` of a previous page with the same sort.
+
+        Returns:
+            ``(ids, total matches, next_cursor)``; ``next_cursor`` is None on
+            the last page.
+
+        Raises:
+            ValueError: If ``cursor`` is malformed or for a different sort.
+        """
+        if sort_by not in SORT_FIELDS:
+            sort_by = DEFAULT_SORT
+        key = self._filter_key(language, category)
+        ordered = self._orders[sort_by, descending].get(key, [])
+        rank = self._ranks[sort_by, descending]
+
+        # Rank (in the unfiltered order) of the first repo to return, and the
+        # position of that rank in this filter's array
+        start = first = 0
+        if cursor:
+            cursor_sort, cursor_descending, value, full_name = decode_cursor(cursor)
+            if (cursor_sort, cursor_descending) != (sort_by, descending):
+                raise ValueError("Cursor was issued for a different sort")
+            start = self._start_after(sort_by, descending, value, full_name)
+            # The filtered array is in rank order too
+            first = bisect_left(ordered, start, key=rank.__getitem__)
+            offset = 0
+        if offset < 0:
+            # Pages before the first one are empty, as slicing used to give
+            offset, limit = 0, 0
+        limit = max(limit, 0)
+        # One extra id tells whether another page follows
+        wanted = limit + 1
+
+        if not min_score:
+            total = len(ordered)
+            ids = ordered[first + offset:first + offset + wanted]
+        else:
+            scores = self._values["score"]
+            by_score = self._orders["score", False].get(key, [])
+            cut = bisect_left(by_score, min_score, key=scores.__getitem__)
+            total = len(by_score) - cut
+
+            if sort_by == "score":
+                # Passing repos are a prefix (descending) or suffix of the array
+                low, high = (0, total) if descending else (len(ordered) - total, len(ordered))
+                begin = max(first, low) + offset
+                ids = ordered[begin:min(high, begin + wanted)]
+            elif total >= _WALK_ABOVE * len(ordered):
+                ids = []
+                skip = offset
+                for position in range(first, len(ordered)):
+                    doc_id = ordered[position]
+                    if scores[doc_id] < min_score:
+                        continue
+                    if skip:
+                        skip -= 1
+                        continue
+                    ids.append(doc_id)
+                    if len(ids) == wanted:
+                        break
+            else:
+                passing = sorted(by_score[cut:], key=rank.__getitem__)
+                first = bisect_left(passing, start, key=rank.__getitem__)
+                ids = passing[first + offset:first + offset + wanted]
+
+        next_cursor = None
+        if len(ids) > limit:
+            ids = ids[:limit]
+            if ids:
+                last = ids[-1]
+                next_cursor = encode_cursor(
+                    sort_by, descending, self._values[sort_by][last],
+                    self.repos[last].get("full_name") or "",
+                )
+        return ids, total, next_cursor
@@ -0,0 +1,315 @@
+"""
+Full-text search index for /api/v1/search.
+
+A pure-Python inverted index over each repo's name, full name, description
+and topics, ranked with BM25 (field-weighted term frequencies) blended with
+the repo's own ``score``. Every query word must match. It matches a term
+exactly, by prefix (``tensor`` -> ``tensorflow``), or inside a term via a
+trigram index over the vocabulary (``gpt`` -> ``chatgpt``). When nothing
+matches, it falls back to close spellings (trigram similarity).
+
+The index is keyed by ``full_name`` and synced incrementally: when the
+dataset reloads, only added, changed or removed repos touch the postings.
+"""
+
+import re
+import math
+import heapq
+import hashlib
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Term frequency weight per field (BM25F-style)
+FIELD_WEIGHTS = {"name": 3.0, "full_name": 1.0, "description": 1.0, "topics": 2.0}
+
+# Weight of a query word's match, by how it matched
+EXACT, PREFIX, INFIX, FUZZY = 1.0, 0.8, 0.6, 0.4
+MAX_EXPANSIONS = 50
+MIN_FUZZY_SIMILARITY = 0.5
+
+K1 = 1.2
+B = 0.75
+# Blend: relevance = BM25 + SCORE_WEIGHT * score (+ a bonus for an exact name)
+SCORE_WEIGHT = 0.05
+EXACT_NAME_BONUS = 5.0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric words."""
+    return _TOKEN.findall((text or "").lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _inner_trigrams(term: str) -> Set[str]:
+    """Trigrams of ``term`` itself (for substring lookups)."""
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def _fields(repo: Mapping[str, Any]) -> Dict[str, str]:
+    topics = repo.get("topics") or []
+    return {
+        "name": repo.get("name") or "",
+        "full_name": repo.get("full_name") or "",
+        "description": repo.get("description") or "",
+        "topics": " ".join(str(topic) for topic in topics) if isinstance(topics, list) else "",
+    }
+
+
+def _fingerprint(repo: Mapping[str, Any]) -> str:
+    fields = _fields(repo)
+    raw = "\x00".join([fields[name] for name in FIELD_WEIGHTS] + [repr(repo.get("score", 0))])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SearchIndex:
+    """
+    Inverted index of repos, synced from dataset snapshots.
+
+    Doc ids are internal and stable across syncs; ``search`` returns repos
+    from the sequence last passed to ``sync``.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_length: Dict[int, float] = {}
+        self._doc_score: Dict[int, float] = {}
+        self._doc_name: Dict[int, str] = {}
+        self._total_length = 0.0
+        self._ids: Dict[str, Tuple[int, str]] = {}  # full_name -> (doc id, fingerprint)
+        self._next_id = 0
+        self._repos: Sequence[Mapping[str, Any]] = ()
+        self._position: Dict[int, int] = {}  # doc id -> position in self._repos
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._trigram_terms: Dict[str, Set[str]] = {}
+        # doc id -> BM25 length normalisation, rebuilt after changes
+        self._norms: Optional[Dict[int, float]] = None
+        self.version = None
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    # ---- maintenance ----
+
+    def _add(self, repo: Mapping[str, Any]) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+
+        terms: Dict[str, float] = {}
+        for field, text in _fields(repo).items():
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + FIELD_WEIGHTS[field]
+
+        for term, tf in terms.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                self._vocabulary_dirty = True
+                for gram in trigrams(term):
+                    self._trigram_terms.setdefault(gram, set()).add(term)
+            posting[doc_id] = tf
+
+        self._doc_terms[doc_id] = terms
+        self._doc_length[doc_id] = sum(terms.values())
+        self._total_length += self._doc_length[doc_id]
+        score = repo.get("score", 0)
+        self._doc_score[doc_id] = score if isinstance(score, (int, float)) else 0
+        self._doc_name[doc_id] = " ".join(tokenize(repo.get("name") or ""))
+        self._norms = None
+        return doc_id
+
+    def _remove(self, doc_id: int):
+        for term in self._doc_terms.pop(doc_id):
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+                for gram in trigrams(term):
+                    grams = self._trigram_terms[gram]
+                    grams.discard(term)
+                    if not grams:
+                        del self._trigram_terms[gram]
+        self._total_length -= self._doc_length.pop(doc_id)
+        del self._doc_score[doc_id]
+        del self._doc_name[doc_id]
+        self._norms = None
+
+    def sync(self, repos: Sequence[Mapping[str, Any]], version: Any = None) -> Tuple[int, int]:
+        """
+        Bring the index in line with ``repos`` (first occurrence per full name).
+
+        Only new or changed repos are (re)indexed and vanished ones removed.
+
+        Returns:
+            ``(indexed, removed)`` repo counts.
+        """
+        with self._lock:
+            indexed = 0
+            seen: Dict[str, Tuple[int, str]] = {}
+            position: Dict[int, int] = {}
+            for pos, repo in enumerate(repos):
+                key = (repo.get("full_name") or "").lower()
+                if key in seen:
+                    continue
+                fingerprint = _fingerprint(repo)
+                current = self._ids.get(key)
+                if current and current[1] == fingerprint:
+                    doc_id = current[0]
+                else:
+                    if current:
+                        self._remove(current[0])
+                    doc_id = self._add(repo)
+                    indexed += 1
+                seen[key] = (doc_id, fingerprint)
+                position[doc_id] = pos
+
+            removed = 0
+            for key, (doc_id, _) in self._ids.items():
+                if key not in seen:
+                    self._remove(doc_id)
+                    removed += 1
+
+            self._ids = seen
+            self._repos = repos
+            self._position = position
+            self.version = version
+            return indexed, removed
+
+    # ---- querying ----
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        return self._vocabulary
+
+    def _by_frequency(self, terms) -> List[str]:
+        return sorted(terms, key=lambda term: (-len(self._postings[term]), term))[:MAX_EXPANSIONS]
+
+    def expand(self, token: str) -> List[Tuple[str, float]]:
+        """Index terms a query word matches, with their match weights."""
+        expansions: Dict[str, float] = {}
+        if token in self._postings:
+            expansions[token] = EXACT
+
+        vocabulary = self._sorted_vocabulary()
+        prefixed = []
+        for position in range(bisect_left(vocabulary, token), len(vocabulary)):
+            term = vocabulary[position]
+            if not term.startswith(token):
+                break
+            if term != token:
+                prefixed.append(term)
+        for term in self._by_frequency(prefixed):
+            expansions.setdefault(term, PREFIX)
+
+        grams = _inner_trigrams(token)
+        if grams:
+            sets = sorted((self._trigram_terms.get(gram, set()) for gram in grams), key=len)
+            infix = [term for term in sets[0].intersection(*sets[1:]) if token in term]
+            for term in self._by_frequency(infix):
+                expansions.setdefault(term, INFIX)
+
+        if not expansions and len(token) >= 3:
+            # Likely a typo: terms sharing most of the word's trigrams
+            query_grams = trigrams(token)
+            shared: Dict[str, int] = {}
+            for gram in query_grams:
+                for term in self._trigram_terms.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            similar = [
+                term for term, count in shared.items()
+                if count / len(query_grams | trigrams(term)) >= MIN_FUZZY_SIMILARITY
+            ]
+            for term in self._by_frequency(similar):
+                expansions[term] = FUZZY
+        return list(expansions.items())
+
+    def _length_norms(self) -> Dict[int, float]:
+        if self._norms is None:
+            average_length = self._total_length / max(1, len(self._doc_length)) or 1.0
+            self._norms = {
+                doc_id: K1 * (1 - B + B * length / average_length)
+                for doc_id, length in self._doc_length.items()
+            }
+        return self._norms
+
+    def _match(self, token: str, within: Optional[Dict[int, float]]) -> Dict[int, float]:
+        """Best weighted BM25 contribution of ``token`` per doc (only docs in ``within``, if given)."""
+        doc_count = len(self._doc_terms)
+        norms = self._length_norms()
+        scores: Dict[int, float] = {}
+        for term, weight in self.expand(token):
+            posting = self._postings[term]
+            factor = weight * (K1 + 1) * math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            if within is not None and len(within) < len(posting):
+                # Probe the posting from the (smaller) set of docs still matching
+                pairs = ((doc_id, posting.get(doc_id)) for doc_id in within)
+            else:
+                pairs = posting.items()
+            for doc_id, tf in pairs:
+                if tf is None or (within is not None and doc_id not in within):
+                    continue
+                value = factor * tf / (tf + norms[doc_id])
+                if value > scores.get(doc_id, 0.0):
+                    scores[doc_id] = value
+        return scores
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> Tuple[List[Mapping[str, Any]], int]:
+        """
+        Rank repos for ``query``.
+
+        Returns:
+            ``(repos, total matches)``: one page of the synced repos, best
+            first (ties in dataset order).
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            if not tokens or not self._doc_terms:
+                return [], 0
+
+            scores: Optional[Dict[int, float]] = None
+            for token in tokens:
+                token_scores = self._match(token, scores)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {doc_id: scores[doc_id] + value for doc_id, value in token_scores.items()}
+                if not scores:
+                    return [], 0
+
+            if offset < 0:
+                return [], len(scores)
+            query_name = " ".join(tokens)
+            ranked = (
+                (
+                    -(text + SCORE_WEIGHT * self._doc_score[doc_id]
+                      + (EXACT_NAME_BONUS if self._doc_name[doc_id] == query_name else 0.0)),
+                    self._position[doc_id],
+                )
+                for doc_id, text in scores.items()
+            )
+            top = heapq.nsmallest(offset + limit, ranked)
+            return [self._repos[position] for _, position in top[offset:]], len(scores)
+
+
+_index = SearchIndex()
+
+
+def get_search_index(snapshot) -> SearchIndex:
+    """The process-wide index, synced to a dataset snapshot if it changed."""
+    if _index.version != snapshot.fingerprint:
+        with _index._lock:
+            if _index.version != snapshot.fingerprint:
+                _index.sync(snapshot.repos, snapshot.fingerprint)
+    return _index
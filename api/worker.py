@@ -167,6 +167,54 @@ def run_pipeline_task(repo_url, upload=False):
         }
 
 
+def scan_candidates_task(max_results=5, query=None, timeout=300):
+    """
+    Find candidate repositories with the persistent Rust scanner worker.
+
+    The worker process is started on the first call and reused by later
+    tasks in the same worker process, so they skip process startup and TLS
+    setup. RQ forks a new work horse per job by default; run the queue with
+    ``rq worker -w rq.SimpleWorker`` to keep the scanner warm across jobs.
+
+    Args:
+        max_results: Number of valid repositories to return
+        query: Optional GitHub search query (defaults to the scanner's own)
+        timeout: Seconds to wait for the scan
+
+    Returns:
+        dict: Status and the repositories found
+    """
+    logger.info("Starting candidate scan")
+    start_time = datetime.now()
+
+    try:
+        sys.path.insert(0, str(project_root / "src"))
+        from scanner.rust_bridge import get_scanner, RustScannerWorker
+
+        token = os.getenv("GITHUB_TOKEN") or os.getenv("GH_PAT")
+        scanner = get_scanner(token, prefer_rust=True, persistent=True)
+
+        if isinstance(scanner, RustScannerWorker):
+            repos = list(scanner.iter_repos(timeout=timeout, max_results=max_results, query=query))
+        else:
+            repos = [r for r in scanner.scan_recent_repos(limit=max_results * 4) if scanner.validate_repo(r)]
+            repos = repos[:max_results]
+
+        return {
+            "success": True,
+            "repos": repos,
+            "duration": (datetime.now() - start_time).total_seconds()
+        }
+
+    except Exception as e:
+        logger.error(f"Candidate scan failed: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "duration": (datetime.now() - start_time).total_seconds()
+        }
+
+
 def process_batch_repos(repos, upload=False):
     """
     Process multiple repositories in batch mode.
@@ -207,3 +255,4 @@ if __name__ == "__main__":
     print("Available tasks:")
     print("- generate_content_task")
     print("- run_pipeline_task")
+    print("- scan_candidates_task")
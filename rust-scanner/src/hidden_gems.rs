@@ -2,6 +2,7 @@
 use serde::{Deserialize, Serialize};
 use reqwest;
 use std::error::Error;
+use std::io::Write;
 
 #[derive(Debug, Serialize, Deserialize)]
 pub struct HiddenGemRepo {
@@ -56,6 +57,14 @@ impl HiddenGemsScanner {
     }
 
     pub async fn scan_tier(&self, tier: &str) -> Result<Vec<HiddenGemRepo>, Box<dyn Error>> {
+        self.scan_tier_with(tier, |_| Ok(())).await
+    }
+
+    /// Like `scan_tier`, but calls `on_found` for each gem as soon as it passes validation.
+    pub async fn scan_tier_with<F>(&self, tier: &str, mut on_found: F) -> Result<Vec<HiddenGemRepo>, Box<dyn Error>>
+    where
+        F: FnMut(&HiddenGemRepo) -> Result<(), Box<dyn Error>>,
+    {
         let (min_stars, max_stars, min_forks, max_forks) = match tier {
             "micro" => (10, 100, 5, 50),
             "small" => (100, 500, 10, 100),
@@ -107,6 +116,7 @@ impl HiddenGemsScanner {
                 if self.is_valid_hidden_gem(&repo)? {
                     info!("✅ Valid gem: {} ({} ⭐, {} 🍴)",
                           repo.full_name, repo.stars, repo.forks);
+                    on_found(&repo)?;
                     found_repos.push(repo);
 
                     if found_repos.len() >= MAX_PROJECTS {
@@ -245,20 +255,38 @@ async fn main() -> Result<(), Box<dyn Error>> {
     let github_token = std::env::var("GITHUB_TOKEN")
         .expect("GITHUB_TOKEN environment variable not set");
 
-    let tier = std::env::args()
-        .nth(1)
-        .unwrap_or_else(|| "small".to_string());
+    // Usage: hidden-gems-scanner [tier] [--jsonl]
+    let mut tier = "small".to_string();
+    let mut jsonl = false;
+    for arg in std::env::args().skip(1) {
+        if arg == "--jsonl" {
+            jsonl = true;
+        } else {
+            tier = arg;
+        }
+    }
 
     info!("🚀 Hidden Gems Scanner starting...");
     info!("📊 Target tier: {}", tier);
 
     let scanner = HiddenGemsScanner::new(github_token);
 
-    let repos = scanner.scan_tier(&tier).await?;
-
-    println!("__REPO_JSON__");
-    println!("{}", serde_json::to_string_pretty(&repos)?);
-    println!("__END_JSON__");
+    let repos = if jsonl {
+        // One JSON object per line, flushed as each gem is found
+        let stdout = std::io::stdout();
+        scanner.scan_tier_with(&tier, |repo| {
+            let mut out = stdout.lock();
+            writeln!(out, "{}", serde_json::to_string(repo)?)?;
+            out.flush()?;
+            Ok(())
+        }).await?
+    } else {
+        let repos = scanner.scan_tier(&tier).await?;
+        println!("__REPO_JSON__");
+        println!("{}", serde_json::to_string_pretty(&repos)?);
+        println!("__END_JSON__");
+        repos
+    };
 
     info!("✨ Scan complete! Found {} hidden gems", repos.len());
 
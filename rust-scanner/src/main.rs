@@ -3,6 +3,7 @@ use chrono::{DateTime, Utc};
 use reqwest::Client;
 use serde::{Deserialize, Serialize};
 use std::env;
+use std::io::Write;
 use log::{info, warn, error};
 
 #[derive(Debug, Deserialize, Serialize)]
@@ -50,6 +51,89 @@ struct WorkflowRun {
     conclusion: Option<String>,
 }
 
+// Buscar repos con buen engagement, últimos 6 meses, sin filtros negativos de template
+const DEFAULT_QUERY: &str = "stars:>200 forks:>20 pushed:>2025-05-01";
+
+/// One scan request in `--serve` mode (one JSON object per stdin line).
+#[derive(Debug, Deserialize)]
+struct ScanRequest {
+    id: u64,
+    #[serde(default)]
+    query: Option<String>,
+    /// Search results fetched (GitHub allows up to 100 per page)
+    #[serde(default = "default_search_limit")]
+    limit: u32,
+    /// Stop after this many valid repositories
+    #[serde(default = "default_max_results")]
+    max_results: usize,
+}
+
+fn default_search_limit() -> u32 {
+    100
+}
+
+fn default_max_results() -> usize {
+    3
+}
+
+fn write_line(value: &serde_json::Value) -> Result<()> {
+    let mut out = std::io::stdout().lock();
+    writeln!(out, "{}", value)?;
+    out.flush()?;
+    Ok(())
+}
+
+/// Persistent worker: read scan requests from stdin until EOF, reusing one
+/// HTTP client (warm connection pool) for every request.
+///
+/// Replies are JSON lines tagged with the request id: one `{"id", "repo"}`
+/// per valid repository as it is found, then `{"id", "done", "count"}`, or
+/// `{"id", "error"}` if the scan failed.
+async fn serve(scanner: &GitHubScanner) -> Result<()> {
+    use tokio::io::{AsyncBufReadExt, BufReader};
+
+    info!("🔁 Serving scan requests on stdin");
+    write_line(&serde_json::json!({ "ready": true }))?;
+
+    let mut lines = BufReader::new(tokio::io::stdin()).lines();
+    while let Some(line) = lines.next_line().await? {
+        if line.trim().is_empty() {
+            continue;
+        }
+        let request: ScanRequest = match serde_json::from_str(&line) {
+            Ok(request) => request,
+            Err(e) => {
+                error!("Invalid request: {}", e);
+                write_line(&serde_json::json!({ "id": null, "error": format!("invalid request: {}", e) }))?;
+                continue;
+            }
+        };
+
+        let query = request.query.as_deref().unwrap_or(DEFAULT_QUERY);
+        match scanner.search_repos(query, request.limit).await {
+            Ok(repos) => {
+                let mut count = 0;
+                for repo in repos {
+                    if count >= request.max_results {
+                        break;
+                    }
+                    if scanner.validate_repo(&repo).await {
+                        write_line(&serde_json::json!({ "id": request.id, "repo": repo }))?;
+                        count += 1;
+                    }
+                }
+                write_line(&serde_json::json!({ "id": request.id, "done": true, "count": count }))?;
+            }
+            Err(e) => {
+                write_line(&serde_json::json!({ "id": request.id, "error": e.to_string() }))?;
+            }
+        }
+    }
+
+    info!("stdin closed, worker exiting");
+    Ok(())
+}
+
 pub struct GitHubScanner {
     client: Client,
     token: String,
@@ -66,20 +150,26 @@ impl GitHubScanner {
     }
 
     pub async fn scan_recent_repos(&self, limit: u32) -> Result<Vec<GitHubRepo>> {
-        info!("🔍 Scanning GitHub for recent quality repositories...");
+        self.search_repos(DEFAULT_QUERY, limit).await
+    }
 
-        // Buscar repos con buen engagement, últimos 6 meses, sin filtros negativos de template
-        let query = "stars:>200+forks:>20+pushed:>2025-05-01";
-        let url = format!(
-            "https://api.github.com/search/repositories?q={}&sort=stars&order=desc&per_page={}",
-            query, limit
-        );
+    pub async fn search_repos(&self, query: &str, limit: u32) -> Result<Vec<GitHubRepo>> {
+        info!("🔍 Scanning GitHub for recent quality repositories...");
 
-        info!("Query URL: {}", url);
+        info!("Query: {}", query);
 
+        // `query` is percent-encoded here, so callers pass plain search
+        // syntax (spaces, quotes, `>`), never a pre-encoded string
+        let per_page = limit.to_string();
         let response = self
             .client
-            .get(&url)
+            .get("https://api.github.com/search/repositories")
+            .query(&[
+                ("q", query),
+                ("sort", "stars"),
+                ("order", "desc"),
+                ("per_page", per_page.as_str()),
+            ])
             .header("Authorization", format!("token {}", self.token))
             .header("Accept", "application/vnd.github.v3+json")
             .send()
@@ -251,8 +341,16 @@ async fn main() -> Result<()> {
     let token = env::var("GITHUB_TOKEN")
         .context("GITHUB_TOKEN environment variable not set")?;
 
+    // --jsonl: print each valid repo as one JSON line as soon as it passes validation
+    let jsonl = env::args().skip(1).any(|arg| arg == "--jsonl");
+
     let scanner = GitHubScanner::new(token);
 
+    // --serve: stay alive and answer scan requests over stdin/stdout
+    if env::args().skip(1).any(|arg| arg == "--serve") {
+        return serve(&scanner).await;
+    }
+
     // Scan for repositories (aumentar cantidad para mejor selección)
     let repos = scanner.scan_recent_repos(100).await?;
 
@@ -261,6 +359,11 @@ async fn main() -> Result<()> {
     let mut valid_repos = Vec::new();
     for repo in repos {
         if scanner.validate_repo(&repo).await {
+            if jsonl {
+                let mut out = std::io::stdout().lock();
+                writeln!(out, "{}", serde_json::to_string(&repo)?)?;
+                out.flush()?;
+            }
             valid_repos.push(repo);
 
             // Encontrar hasta 3 repos válidos
@@ -280,11 +383,13 @@ async fn main() -> Result<()> {
         info!("  Stars: ⭐ {}", repo.stargazers_count);
         info!("  Description: {}", repo.description.as_ref().unwrap_or(&"N/A".to_string()));
 
-        // Output JSON for Python to consume
-        let json_output = serde_json::to_string(&repo)?;
-        println!("\n__REPO_JSON__");
-        println!("{}", json_output);
-        println!("__END_JSON__");
+        // Output JSON for Python to consume (already streamed in --jsonl mode)
+        if !jsonl {
+            let json_output = serde_json::to_string(&repo)?;
+            println!("\n__REPO_JSON__");
+            println!("{}", json_output);
+            println!("__END_JSON__");
+        }
     } else {
         warn!("⚠️  No valid repositories found");
     }
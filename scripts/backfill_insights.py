@@ -10,10 +10,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 try:
     from scanner.insights_collector import InsightsCollector
+    from scanner.github_transport import GitHubTransport
+    from scanner.response_cache import ResponseCache
+    from scanner.rate_limiter import RateLimitScheduler
+    from blog_generator.frontmatter import parse_frontmatter
 except ImportError:
     # Fallback if running from root
     sys.path.insert(0, "src")
     from scanner.insights_collector import InsightsCollector
+    from scanner.github_transport import GitHubTransport
+    from scanner.response_cache import ResponseCache
+    from scanner.rate_limiter import RateLimitScheduler
+    from blog_generator.frontmatter import parse_frontmatter
 
 # Configure logging
 logging.basicConfig(
@@ -78,7 +86,10 @@ def main():
         logger.error("❌ No GITHUB_TOKEN or GH_PAT found in environment or .env file")
         return
 
-    collector = InsightsCollector(token)
+    # Re-runs revalidate with ETags; unchanged repos answer 304 and cost no quota
+    cache = ResponseCache(os.getenv("GITHUB_HTTP_CACHE", ".cache/github_http.sqlite"))
+    transport = GitHubTransport(cache=cache, rate_limiter=RateLimitScheduler.from_env())
+    collector = InsightsCollector(token, transport=transport)
 
     # Find all blog posts
     blog_dir = Path("website/src/content/blog")
@@ -97,15 +108,12 @@ def main():
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
-            # Extract repo name
-            # Matches "repo: user/repo" or "repo: 'user/repo'"
-            match = re.search(r'^repo:\s*["\']?([\w\-\.]+/[[\w\-\.]+)["\']?', content, re.MULTILINE)
+            # Extract repo name ("user/repo")
+            repo_full_name = str(parse_frontmatter(content).get("repo") or "").strip()
 
-            if not match:
+            if not re.fullmatch(r'[\w\-\.]+/[\w\-\.]+', repo_full_name):
                 logger.warning(f"⚠️ Skipping {file_path.name}: No 'repo' field found in frontmatter")
                 continue
-
-            repo_full_name = match.group(1)
             logger.info(f"[{i+1}/{len(files)}] Processing {repo_full_name} ({file_path.name})...")
 
             # Collect insights
@@ -128,6 +136,8 @@ def main():
         except Exception as e:
             logger.error(f"❌ Error processing {file_path.name}: {e}")
 
+    collector.transport.log_stats()
+
     logger.info("="*60)
     logger.info(f"🎉 Backfill complete! Updated {success_count}/{len(files)} files.")
     logger.info("="*60)
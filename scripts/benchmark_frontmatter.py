@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark frontmatter parsing over the blog content tree.
+
+Compares the old per-script approach (read the whole file, split on
+``---``, ``yaml.safe_load``) with the shared parser in
+``blog_generator.frontmatter``, cold and with its (path, mtime, size) cache
+warm.
+
+Usage:
+    python scripts/benchmark_frontmatter.py [--rounds 5] [--dir website/src/content/blog]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from blog_generator import frontmatter
+
+
+def legacy_parse(path):
+    content = Path(path).read_text(encoding="utf-8")
+    if not content.startswith("---"):
+        return {}
+    parts = content.split("---", 2)
+    return yaml.safe_load(parts[1]) if len(parts) >= 3 else {}
+
+
+def timed(label, rounds, files, fn, setup=None):
+    best = float("inf")
+    for _ in range(rounds):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for path in files:
+            fn(path)
+        best = min(best, time.perf_counter() - start)
+    per_file = best / max(1, len(files)) * 1e6
+    print(f"{label:<28} {best * 1000:9.2f} ms  ({per_file:7.1f} µs/file)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="website/src/content/blog", help="Blog content directory")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per variant (best is reported)")
+    args = parser.parse_args()
+
+    files = sorted(Path(args.dir).rglob("*.md"))
+    if not files:
+        print(f"No markdown files under {args.dir}")
+        return
+
+    print(f"{len(files)} files, libyaml: {yaml.__with_libyaml__}, best of {args.rounds} rounds\n")
+    legacy = timed("legacy (read all + safe_load)", args.rounds, files, legacy_parse)
+    cold = timed("shared, cold cache", args.rounds, files, frontmatter.load_frontmatter,
+                 setup=frontmatter.clear_cache)
+    warm = timed("shared, warm cache", args.rounds, files, frontmatter.load_frontmatter)
+    print(f"\nspeedup: cold {legacy / cold:.1f}x, warm {legacy / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
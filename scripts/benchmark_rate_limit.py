@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request Redis overhead of API key auth + rate limiting.
+
+Compares the old sequence (HGETALL, then INCR/EXPIRE for the minute window
+and INCR/EXPIRE for the day window) with ``api.rate_limit``: the
+single-script ``authorize`` and the pipelined fallback. Reports the mean
+time per request and the number of Redis round trips.
+
+Runs against a real server with --redis-url, otherwise against fakeredis
+(in-process, so it shows round trip counts rather than network cost).
+
+Usage:
+    python scripts/benchmark_rate_limit.py [--redis-url redis://localhost:6379/15] [--requests 5000]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.rate_limit import RateLimiter
+
+TIERS = {"free": (10**9, 10**9)}
+KEY_HASH = "benchmark"
+
+
+def legacy_request(conn):
+    data = conn.hgetall(f"api_key:{KEY_HASH}")
+    key_data = {k.decode(): v.decode() for k, v in data.items()}
+
+    minute_key = f"rate:{KEY_HASH}:minute:{int(time.time() // 60)}"
+    minute_count = conn.incr(minute_key)
+    conn.expire(minute_key, 60)
+    day_key = f"rate:{KEY_HASH}:day:{datetime.utcnow().strftime('%Y-%m-%d')}"
+    day_count = conn.incr(day_key)
+    conn.expire(day_key, 86400)
+    return key_data, minute_count, day_count
+
+
+class RoundTrips:
+    """Counts connections taken from the pool (one per command or pipeline)."""
+
+    def __init__(self, conn):
+        self.count = 0
+        pool = conn.connection_pool
+        get_connection = pool.get_connection
+
+        def counting(*args, **kwargs):
+            self.count += 1
+            return get_connection(*args, **kwargs)
+
+        pool.get_connection = counting
+
+
+def run(label, fn, requests, trips):
+    fn()  # warm up (script load, connection)
+    trips.count = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26} {elapsed / requests * 1e6:9.1f} µs/request   {trips.count / requests:4.1f} round trips")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", help="Redis server to use (a scratch database; keys are deleted)")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per variant")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        from redis import Redis
+        conn = Redis.from_url(args.redis_url)
+        target = args.redis_url
+    else:
+        import fakeredis
+        conn = fakeredis.FakeRedis()
+        target = "fakeredis (in-process)"
+
+    conn.hset(f"api_key:{KEY_HASH}", mapping={"tier": "free", "active": "true"})
+    trips = RoundTrips(conn)
+    print(f"{target}, {args.requests} requests per variant\n")
+
+    try:
+        legacy = run("legacy (5 commands)", lambda: legacy_request(conn), args.requests, trips)
+
+        limiter = RateLimiter(conn, TIERS)
+        script = run("lua authorize", lambda: limiter.authorize(KEY_HASH), args.requests, trips)
+
+        fallback = RateLimiter(conn, TIERS)
+        fallback.scripting = False
+        run("pipeline fallback", lambda: fallback.authorize(KEY_HASH), args.requests, trips)
+
+        print(f"\nlua vs legacy: {legacy / script:.1f}x")
+    finally:
+        conn.delete(f"api_key:{KEY_HASH}", *conn.keys(f"rate:{KEY_HASH}:*"))
+
+
+if __name__ == "__main__":
+    main()
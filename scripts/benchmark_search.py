@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/v1/search over synthetic datasets.
+
+Compares the old per-request scan (substring test over the concatenated
+fields, then a sort by ``relevance_score``) with ``api.search_index``:
+full build, query latency, and an incremental sync after 1% of the repos
+changed.
+
+Usage:
+    python scripts/benchmark_search.py [--sizes 10000 100000] [--queries 200]
+"""
+
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.search_index import SearchIndex
+
+WORDS = (
+    "agent llm vector database graph search engine rust python go typescript cli web framework "
+    "async api server client kubernetes docker observability tracing metrics embedding rag "
+    "compiler parser wasm editor terminal notebook dataset training inference gpu cuda"
+).split()
+
+
+def make_vocabulary(rng, size=20000):
+    """Common domain words followed by pseudo-words, with Zipf-like weights."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = list(WORDS)
+    while len(vocabulary) < size:
+        vocabulary.append("".join(rng.choices(letters, k=rng.randint(4, 10))))
+    weights = [1 / (rank + 10) for rank in range(len(vocabulary))]
+    return vocabulary, weights
+
+
+def make_repos(count, rng, vocabulary, weights):
+    def words(k):
+        return rng.choices(vocabulary, weights=weights, k=k)
+
+    repos = []
+    for i in range(count):
+        name = "-".join(words(2)) + str(i)
+        repos.append({
+            "name": name,
+            "full_name": f"owner{i % 997}/{name}",
+            "description": " ".join(words(12)),
+            "topics": words(3),
+            "score": rng.randint(0, 100),
+        })
+    return repos
+
+
+def legacy_search(repos, query, per_page=20):
+    matches = []
+    for repo in repos:
+        searchable = " ".join([
+            repo.get("name", ""),
+            repo.get("full_name", ""),
+            repo.get("description", "") or "",
+            " ".join(repo.get("topics", []))
+        ]).lower()
+        if query in searchable:
+            matches.append(repo)
+
+    def relevance_score(repo):
+        score = 0
+        name = repo.get("name", "").lower()
+        if query == name:
+            score += 100
+        elif query in name:
+            score += 50
+        if query in repo.get("description", "").lower():
+            score += 20
+        score += repo.get("score", 0) / 10
+        return score
+
+    matches.sort(key=relevance_score, reverse=True)
+    return matches[:per_page], len(matches)
+
+
+def latency(label, fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<22} median {statistics.median(samples):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Dataset sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per variant")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary, weights = make_vocabulary(rng)
+    for size in args.sizes:
+        repos = make_repos(size, rng, vocabulary, weights)
+        # Single words, prefixes and two-word queries, skewed to common words
+        queries = []
+        for _ in range(args.queries):
+            first, second = rng.choices(vocabulary[:2000], weights=weights[:2000], k=2)
+            queries.append(rng.choice([first, first[:4], f"{first} {second}"]))
+        print(f"{size} repos, {len(queries)} queries")
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.sync(repos)
+        print(f"  full build             {time.perf_counter() - start:8.2f} s")
+
+        changed = list(repos)
+        for i in rng.sample(range(size), size // 100):
+            changed[i] = dict(changed[i], description=" ".join(rng.choices(vocabulary, weights=weights, k=12)))
+        start = time.perf_counter()
+        indexed, removed = index.sync(changed)
+        print(f"  incremental sync       {(time.perf_counter() - start) * 1000:8.1f} ms ({indexed} reindexed)")
+
+        latency("legacy scan", lambda query: legacy_search(changed, query), queries[:max(1, len(queries) // 10)])
+        latency("index", lambda query: index.search(query, limit=20), queries)
+        print()
+
+
+if __name__ == "__main__":
+    main()
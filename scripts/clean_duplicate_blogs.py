@@ -9,11 +9,14 @@ as the canonical one.
 
 import os
 import sys
-import re
 import shutil
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from blog_generator.post_index import PostIndex
+
 
 def find_duplicates(blog_dir: Path) -> Dict[str, List[dict]]:
     """
@@ -24,32 +27,18 @@ def find_duplicates(blog_dir: Path) -> Dict[str, List[dict]]:
     """
     repos = {}
     
-    for md_file in blog_dir.rglob('index.md'):
-        content = md_file.read_text(encoding='utf-8', errors='ignore')
-        
-        # Search for repo field (format: owner/repo)
-        repo_key = None
-        
-        # Method 1: Look for "repo: owner/name" 
-        match = re.search(r'^repo:\s*([^\n]+)', content, re.MULTILINE)
-        if match:
-            repo_key = match.group(1).strip().strip('"\'')
-        
-        # Method 2: Look for full_name in repo_data
-        if not repo_key:
-            match = re.search(r'full_name:\s*["\']?([^"\'\n]+)', content)
-            if match:
-                repo_key = match.group(1).strip()
-        
-        if repo_key:
-            if repo_key not in repos:
-                repos[repo_key] = []
-            repos[repo_key].append({
+    # Repo of each page bundle, from the persistent post index (only new or
+    # modified posts are re-read)
+    for repo_key, md_files in PostIndex(str(blog_dir)).groups().items():
+        repos[repo_key] = [
+            {
                 'folder': str(md_file.parent.name),
                 'path': str(md_file.parent),
                 'file': str(md_file),
                 'category': str(md_file.parent.parent.name)
-            })
+            }
+            for md_file in md_files
+        ]
     
     return repos
 
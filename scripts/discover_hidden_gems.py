@@ -6,16 +6,23 @@ import os
 import sys
 import json
 import logging
+import threading
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterable, Iterator
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from github import Github
 from scanner.gem_analyzer import GemAnalyzer
+from scanner.graphql_backend import GraphQLBackend
+from scanner.repo_snapshot import RepoSnapshot
+from scanner.rust_bridge import iter_json_records
+from scanner.github_transport import GitHubTransport
+from scanner.rate_limiter import RateLimitScheduler, PooledGithub
 from scanner.grok_reviewer import GrokReviewer
 from blog_generator.markdown_writer import MarkdownWriter
 
@@ -30,12 +37,25 @@ logger = logging.getLogger(__name__)
 class HiddenGemsPipeline:
     """Complete pipeline for discovering and publishing hidden gems"""
 
-    def __init__(self, github_token: str):
+    def __init__(self, github_token: str, use_graphql: bool = False, max_workers: int = 4):
         self.github_token = github_token
-        self.github_client = Github(github_token)
-        self.analyzer = GemAnalyzer(self.github_client)
+        # Spread repos over every configured token (GITHUB_TOKENS / GITHUB_TOKEN / GH_PAT);
+        # GraphQL requests are scheduled individually, PyGithub calls per repo lookup
+        self.scheduler = RateLimitScheduler.from_env() or RateLimitScheduler([github_token])
+        # Full pages keep paginated listings (commits, issue comments) to one request
+        self.github_client = PooledGithub(self.scheduler, per_page=100)
+        # GraphQL fetches each repo's analysis data in one batched query
+        self.graphql = GraphQLBackend(
+            github_token, transport=GitHubTransport(rate_limiter=self.scheduler)
+        ) if use_graphql else None
+        # Candidates analyzed at once; each runs its sub-analyses in parallel too
+        self.max_workers = max(1, max_workers)
+        self.analyzer = GemAnalyzer(self.graphql or self.github_client, max_workers=self.max_workers * 4)
         self.ai_reviewer = GrokReviewer()  # Uses GitHub Copilot auth
         self.markdown_writer = MarkdownWriter()
+        # Per-repo snapshots shared by analysis, AI review and blog generation
+        self._snapshots: Dict[str, RepoSnapshot] = {}
+        self._snapshots_lock = threading.Lock()
 
         # Find Rust scanner
         self.rust_scanner_path = self._find_rust_scanner()
@@ -57,53 +77,56 @@ class HiddenGemsPipeline:
         logger.warning("⚠️  Rust scanner not found, will skip pre-filtering")
         return None
 
-    def run_rust_scanner(self, tier: str = "small") -> List[Dict]:
-        """Run Rust scanner to get initial candidate repos"""
+    def iter_rust_candidates(self, tier: str = "small") -> Iterator[Dict]:
+        """
+        Stream candidate repos from the Rust scanner as it finds them.
+
+        The scanner runs in ``--jsonl`` mode; closing the generator early
+        stops the scan.
+        """
         if not self.rust_scanner_path:
             logger.warning("Rust scanner not available")
-            return []
+            return
 
-        try:
-            logger.info(f"🚀 Running Rust scanner for tier: {tier}")
+        logger.info(f"🚀 Running Rust scanner for tier: {tier}")
 
-            env = os.environ.copy()
-            env["GITHUB_TOKEN"] = self.github_token
-            env["RUST_LOG"] = "info"
+        env = os.environ.copy()
+        env["GITHUB_TOKEN"] = self.github_token
+        env["RUST_LOG"] = "info"
 
-            result = subprocess.run(
-                [str(self.rust_scanner_path), tier],
-                env=env,
-                capture_output=True,
-                text=False,  # Use bytes instead of text
-                timeout=120
-            )
+        count = 0
+        try:
+            for repo in iter_json_records([str(self.rust_scanner_path), tier, "--jsonl"], env, timeout=120):
+                count += 1
+                logger.info(f"🦀 Candidate {count}: {repo.get('full_name')}")
+                yield repo
+        except subprocess.TimeoutExpired:
+            logger.error("Rust scanner timed out")
+        except Exception as e:
+            logger.error(f"Error running Rust scanner: {e}")
 
-            if result.returncode != 0:
-                stderr = result.stderr.decode('utf-8', errors='ignore')
-                logger.error(f"Rust scanner failed: {stderr}")
-                return []
+        logger.info(f"✅ Rust scanner found {count} candidate repositories")
 
-            # Parse output with explicit UTF-8 decoding
-            output = result.stdout.decode('utf-8', errors='ignore')
+    def run_rust_scanner(self, tier: str = "small") -> List[Dict]:
+        """Run Rust scanner to get initial candidate repos"""
+        return list(self.iter_rust_candidates(tier))
 
-            if "__REPO_JSON__" in output and "__END_JSON__" in output:
-                json_start = output.index("__REPO_JSON__") + len("__REPO_JSON__")
-                json_end = output.index("__END_JSON__")
-                json_str = output[json_start:json_end].strip()
+    def _snapshot(self, repo_full_name: str) -> RepoSnapshot:
+        """Snapshot of a repo; each resource is fetched from GitHub once."""
+        with self._snapshots_lock:
+            snapshot = self._snapshots.get(repo_full_name)
+        if snapshot is not None:
+            return snapshot
 
-                repos = json.loads(json_str)
-                logger.info(f"✅ Rust scanner found {len(repos)} candidate repositories")
-                return repos
+        # get_repo may wait on the rate limit scheduler, so it runs outside
+        # the lock; if two threads race, the first insert wins
+        snapshot = RepoSnapshot(self.github_client.get_repo(repo_full_name, lazy=True))
+        with self._snapshots_lock:
+            return self._snapshots.setdefault(repo_full_name, snapshot)
 
-            logger.warning("No JSON output from Rust scanner")
-            return []
-
-        except subprocess.TimeoutExpired:
-            logger.error("Rust scanner timed out")
-            return []
-        except Exception as e:
-            logger.error(f"Error running Rust scanner: {e}")
-            return []
+    def _drop_snapshot(self, repo_full_name: str) -> Optional[RepoSnapshot]:
+        with self._snapshots_lock:
+            return self._snapshots.pop(repo_full_name, None)
 
     def analyze_candidate(self, repo_full_name: str) -> Optional[Dict]:
         """Run complete analysis on a candidate repository"""
@@ -112,12 +135,16 @@ class HiddenGemsPipeline:
         logger.info(f"{'='*80}\n")
 
         try:
-            repo = self.github_client.get_repo(repo_full_name)
+            repo = self._snapshot(repo_full_name)
+            # With GraphQL, scoring reads the batched snapshot; the REST
+            # snapshot still serves the AI review (file contents, commit files)
+            scoring_repo = self.graphql.get_repo(repo_full_name) if self.graphql else repo
 
             # Step 1: Check for red flags
-            has_red_flags, flags = self.analyzer.has_red_flags(repo)
+            has_red_flags, flags = self.analyzer.has_red_flags(scoring_repo)
             if has_red_flags:
                 logger.warning(f"🚩 RED FLAGS DETECTED: {', '.join(flags)}")
+                self._drop_snapshot(repo_full_name)
                 return {
                     "repo": repo_full_name,
                     "status": "REJECTED",
@@ -126,8 +153,9 @@ class HiddenGemsPipeline:
                 }
 
             # Step 2: Deep analysis
-            analysis = self.analyzer.analyze_repo(repo_full_name)
+            analysis = self.analyzer.analyze_repo(repo_full_name, repo=scoring_repo)
             if not analysis:
+                self._drop_snapshot(repo_full_name)
                 logger.error("Analysis failed")
                 return None
 
@@ -179,10 +207,15 @@ class HiddenGemsPipeline:
             logger.info(f"🎯 FINAL RESULT: {analysis['recommendation']} ({analysis['priority']} priority)")
             logger.info(f"{'='*80}\n")
 
+            # Only approved repos need their snapshot again (blog generation)
+            if analysis['recommendation'] != 'APPROVE':
+                self._drop_snapshot(repo_full_name)
+
             return analysis
 
         except Exception as e:
             logger.error(f"Error analyzing {repo_full_name}: {e}")
+            self._drop_snapshot(repo_full_name)
             return None
 
     def _get_recent_files(self, repo, max_files: int = 5) -> List[Dict]:
@@ -261,7 +294,7 @@ class HiddenGemsPipeline:
             repo_name = analysis['repo']
             logger.info(f"📝 Generating blog post for {repo_name}...")
 
-            repo = self.github_client.get_repo(repo_name)
+            repo = self._drop_snapshot(repo_name) or RepoSnapshot(self.github_client.get_repo(repo_name))
 
             # Get README
             try:
@@ -343,6 +376,90 @@ class HiddenGemsPipeline:
             logger.error(f"Error generating blog post: {e}")
             return None
 
+    def _analyze_candidates(self, candidates: Iterable[Dict], max_repos: int):
+        """
+        Analyze candidates on a bounded pool, logging results as they complete.
+
+        ``candidates`` may be a stream; it is only read when a worker is free.
+        With GraphQL it is read ``batch_size`` candidates at a time, and each
+        chunk's analysis data is fetched in one batched request before its
+        candidates are submitted. At most ``max_workers`` candidates are in
+        flight; no new ones start once ``max_repos`` are approved. Results
+        are ordered by score (then name), but which candidates get analyzed
+        before the approvals run out depends on completion order, so runs
+        can differ.
+
+        Returns:
+            (approved, review, number of candidates submitted)
+        """
+        approved_repos = []
+        review_repos = []
+        pending = iter(candidates)
+        # Read but not yet submitted (already fetched with GraphQL)
+        prefetched = deque()
+        read_count = 0
+        done_count = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gem-candidate") as pool:
+            in_flight = {}
+
+            def submit_next():
+                nonlocal read_count
+                if not prefetched:
+                    chunk_size = self.graphql.batch_size if self.graphql else 1
+                    for candidate in pending:
+                        prefetched.append(candidate['full_name'])
+                        if len(prefetched) == chunk_size:
+                            break
+                    if self.graphql and prefetched:
+                        try:
+                            self.graphql.fetch_repos(prefetched)
+                        except Exception as e:
+                            # analyze_candidate fetches each one on its own
+                            logger.error(f"GraphQL prefetch failed: {e}")
+                if prefetched:
+                    read_count += 1
+                    repo_name = prefetched.popleft()
+                    in_flight[pool.submit(self.analyze_candidate, repo_name)] = repo_name
+
+            for _ in range(self.max_workers):
+                submit_next()
+
+            while in_flight:
+                future = next(as_completed(in_flight))
+                repo_name = in_flight.pop(future)
+                done_count += 1
+                analysis = future.result()
+
+                if analysis and analysis.get('status') != 'REJECTED':
+                    logger.info(
+                        f"📬 [{done_count}/{read_count}] {repo_name}: "
+                        f"{analysis['recommendation']} ({analysis['total_score']:.2f})"
+                    )
+                    if analysis['recommendation'] == 'APPROVE':
+                        approved_repos.append(analysis)
+                    elif analysis['recommendation'] == 'REVIEW':
+                        review_repos.append(analysis)
+                else:
+                    logger.info(f"📬 [{done_count}/{read_count}] {repo_name}: rejected")
+
+                if len(approved_repos) < max_repos:
+                    submit_next()
+
+        if self.graphql:
+            # Prefetched but never analyzed
+            for repo_name in prefetched:
+                self.graphql.forget(repo_name)
+
+        by_score = lambda a: (-a['total_score'], a['repo'])
+        approved_repos.sort(key=by_score)
+        review_repos.sort(key=by_score)
+
+        # In-flight candidates may push the approved count past max_repos; keep the best
+        for extra in approved_repos[max_repos:]:
+            self._drop_snapshot(extra['repo'])
+        return approved_repos[:max_repos], review_repos, read_count
+
     def run_pipeline(self, tier: str = "small", max_repos: int = 5):
         """Run complete hidden gems discovery pipeline"""
         logger.info("\n" + "="*80)
@@ -351,10 +468,15 @@ class HiddenGemsPipeline:
         logger.info(f"   Target: {max_repos} quality repos")
         logger.info("="*80 + "\n")
 
-        # Step 1: Rust scanner pre-filter
-        candidates = self.run_rust_scanner(tier)
+        # Steps 1-2: Rust scanner pre-filter, streamed into deep analysis so
+        # the first candidate is analyzed while the scan is still running
+        candidates = self.iter_rust_candidates(tier)
+        try:
+            approved_repos, review_repos, candidate_count = self._analyze_candidates(candidates, max_repos)
+        finally:
+            candidates.close()
 
-        if not candidates:
+        if not candidate_count:
             logger.error("No candidates found by Rust scanner")
             return {
                 "candidates": 0,
@@ -363,27 +485,7 @@ class HiddenGemsPipeline:
                 "posts_generated": []
             }
 
-        logger.info(f"\n✅ Phase 1 complete: {len(candidates)} candidates")
-
-        # Step 2: Deep analysis
-        approved_repos = []
-        review_repos = []
-
-        for candidate in candidates:
-            if len(approved_repos) >= max_repos:
-                break
-
-            repo_name = candidate['full_name']
-            analysis = self.analyze_candidate(repo_name)
-
-            if analysis:
-                if analysis.get('status') == 'REJECTED':
-                    continue
-
-                if analysis['recommendation'] == 'APPROVE':
-                    approved_repos.append(analysis)
-                elif analysis['recommendation'] == 'REVIEW':
-                    review_repos.append(analysis)
+        logger.info(f"\n✅ Phase 1 complete: {candidate_count} candidates")
 
         logger.info(f"\n✅ Phase 2 complete:")
         logger.info(f"   - {len(approved_repos)} approved")
@@ -398,18 +500,19 @@ class HiddenGemsPipeline:
                 generated_posts.append(post_path)
 
         logger.info(f"\n✅ Phase 3 complete: {len(generated_posts)} blog posts generated")
+        self._snapshots.clear()
 
         # Summary
         logger.info("\n" + "="*80)
         logger.info("🎉 PIPELINE COMPLETE!")
-        logger.info(f"   Candidates scanned: {len(candidates)}")
+        logger.info(f"   Candidates scanned: {candidate_count}")
         logger.info(f"   Approved: {len(approved_repos)}")
         logger.info(f"   For review: {len(review_repos)}")
         logger.info(f"   Blog posts: {len(generated_posts)}")
         logger.info("="*80 + "\n")
 
         return {
-            "candidates": len(candidates),
+            "candidates": candidate_count,
             "approved": approved_repos,
             "review": review_repos,
             "posts_generated": generated_posts
@@ -433,7 +536,9 @@ def main():
     max_repos = int(sys.argv[2]) if len(sys.argv) > 2 else 5
 
     # Run pipeline
-    pipeline = HiddenGemsPipeline(github_token)
+    use_graphql = os.getenv("GITHUB_BACKEND", "rest").lower() == "graphql"
+    max_workers = int(os.getenv("HIDDEN_GEMS_WORKERS", "4"))
+    pipeline = HiddenGemsPipeline(github_token, use_graphql=use_graphql, max_workers=max_workers)
     results = pipeline.run_pipeline(tier, max_repos)
 
     # Save results
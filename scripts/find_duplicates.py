@@ -3,39 +3,29 @@ Script to find duplicate blog posts by repo field or html_url.
 """
 
 import os
+import sys
 from pathlib import Path
-import re
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from blog_generator.post_index import PostIndex
 
 def find_duplicates():
     """Find blogs with duplicate repo values."""
     blog_dir = Path('website/src/content/blog')
     repos = {}
     
-    for md_file in blog_dir.rglob('index.md'):
-        content = md_file.read_text(encoding='utf-8', errors='ignore')
-        
-        # Search for repo field (format: owner/repo) or full_name in repo_data
-        repo_key = None
-        
-        # Method 1: Look for "repo: owner/name" 
-        match = re.search(r'^repo:\s*([^\n]+)', content, re.MULTILINE)
-        if match:
-            repo_key = match.group(1).strip().strip('"\'')
-        
-        # Method 2: Look for full_name in repo_data
-        if not repo_key:
-            match = re.search(r'full_name:\s*["\']?([^"\'\n]+)', content)
-            if match:
-                repo_key = match.group(1).strip()
-        
-        if repo_key:
-            if repo_key not in repos:
-                repos[repo_key] = []
-            repos[repo_key].append({
+    # Repo (repo field or repo_data.full_name) of each page bundle, from the
+    # persistent post index
+    for repo_key, md_files in PostIndex(str(blog_dir)).groups().items():
+        repos[repo_key] = [
+            {
                 'folder': str(md_file.parent.name),
                 'path': str(md_file.parent),
                 'category': str(md_file.parent.parent.name)
-            })
+            }
+            for md_file in md_files
+        ]
     
     print('=== REPOS DUPLICADOS ===')
     duplicates = 0
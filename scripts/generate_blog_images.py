@@ -12,10 +12,13 @@ from typing import Dict, Optional, List
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from google import genai
 from google.genai import types
 
+from blog_generator.frontmatter import load_frontmatter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -145,24 +148,6 @@ def generate_image(prompt: str, output_path: Path, retries: int = 3) -> bool:
 # BLOG POST PROCESSING
 # =============================================================================
 
-def parse_frontmatter(content: str) -> Dict:
-    """Parse YAML frontmatter from markdown."""
-    if not content.startswith('---'):
-        return {}
-
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return {}
-
-    data = {}
-    for line in parts[1].strip().split('\n'):
-        if ':' in line:
-            key, value = line.split(':', 1)
-            data[key.strip()] = value.strip().strip('"\'[]')
-
-    return data
-
-
 def create_professional_prompt(title: str, description: str, language: str = "", category: str = "") -> str:
     """
     Create a detailed prompt for generating professional tech infographics.
@@ -264,14 +249,13 @@ def generate_images_for_blog_posts(blog_dir: Path = None, limit: int = None) ->
 
         try:
             # Parse frontmatter
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            meta = parse_frontmatter(content)
+            meta = load_frontmatter(md_file)
             title = meta.get('title', md_file.parent.name)
             description = meta.get('description', '')
             language = meta.get('language', '')
             category = meta.get('category', meta.get('categories', ''))
+            if isinstance(category, list):
+                category = ', '.join(str(c) for c in category)
 
             logger.info(f"\n{'='*60}")
             logger.info(f"📝 Processing: {title}")
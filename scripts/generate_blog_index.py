@@ -1,62 +1,181 @@
+"""
+Generate website/public/blog_index.json from the blog page bundles.
+
+Generation is incremental: per-post content hashes are kept in
+.cache/blog_index_state.json, only new or changed posts are re-parsed,
+deleted posts drop out, and the index file is only rewritten when its
+posts actually change. Entries depend only on post content (and git
+history), never on file mtimes, so a fresh checkout without the state file
+rebuilds an identical index and leaves the file untouched.
+
+Standard library only: the deploy workflows run this right after
+setup-python, without installing requirements.
+"""
+
 import os
 import json
-import re
+import hashlib
+import subprocess
 from pathlib import Path
 from datetime import datetime
 
-def parse_frontmatter(content):
-    if not content.startswith("---"):
+STATE_VERSION = 2
+
+FRONTMATTER_DELIMITER = "---"
+BLOCK_SCALARS = ("|", "|-", "|+", ">", ">-", ">+")
+
+
+def _scalar(value: str):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        # YAML double-quoted escapes are JSON's for what posts use
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    # Handle lists roughly
+    if value.startswith("[") and value.endswith("]"):
+        return [x.strip().strip('"\'') for x in value[1:-1].split(",") if x.strip()]
+    return value
+
+
+def parse_frontmatter(lines) -> dict:
+    """
+    Top-level ``key: value`` pairs of a frontmatter block.
+
+    Nested mappings and list items are skipped; ``|``/``>`` block scalars
+    are joined (folded with spaces for ``>``).
+    """
+    data = {}
+    block_key, block_lines, folded = None, [], False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if block_key is not None:
+            if not line.strip() or line[:1] in (" ", "\t"):
+                block_lines.append(line.strip())
+                continue
+            data[block_key] = (" " if folded else "\n").join(block_lines).strip()
+            block_key = None
+        if not line.strip() or line.startswith((" ", "\t", "-", "#")) or ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        key, value = key.strip(), value.strip()
+        if value in BLOCK_SCALARS:
+            block_key, block_lines, folded = key, [], value.startswith(">")
+        else:
+            data[key] = _scalar(value)
+    if block_key is not None:
+        data[block_key] = (" " if folded else "\n").join(block_lines).strip()
+    return data
+
+
+def read_frontmatter(content: str) -> dict:
+    """Frontmatter of a post's text ({} if it has none)."""
+    lines = content.splitlines(keepends=True)
+    if not lines or lines[0].rstrip() != FRONTMATTER_DELIMITER:
         return {}
+    for end in range(1, len(lines)):
+        if lines[end].rstrip() == FRONTMATTER_DELIMITER:
+            return parse_frontmatter(lines[1:end])
+    return {}
+
 
+def git_commit_time(path: Path) -> str:
+    """ISO time of the last commit touching ``path`` ("" if unknown)."""
     try:
-        _, fm, _ = content.split("---", 2)
-        data = {}
-        for line in fm.strip().split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip()
-                value = value.strip().strip('"\'')
-                # Handle lists roughly
-                if value.startswith("[") and value.endswith("]"):
-                    value = [x.strip().strip('"\'') for x in value[1:-1].split(",")]
-                data[key] = value
-        return data
-    except Exception:
+        result = subprocess.run(
+            ["git", "log", "-1", "--format=%cI", "--", path.name],
+            cwd=path.parent, capture_output=True, text=True, timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def build_entry(md_file: Path, site_dir: Path, content: str) -> dict:
+    data = read_frontmatter(content)
+
+    # Get slug from directory name
+    slug = md_file.parent.name
+    category = md_file.parent.parent.name
+
+    return {
+        "slug": slug,
+        "category": category,
+        "title": data.get("title", ""),
+        "repo": data.get("repo", ""),
+        "date": data.get("date", ""),
+        "description": data.get("description", ""),
+        "path": str(md_file.relative_to(site_dir)).replace("\\", "/"),
+        # Stable across runs and checkouts (unlike now() or file mtimes)
+        "last_updated": str(data.get("date") or git_commit_time(md_file))
+    }
+
+
+def load_json(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
         return {}
 
-def generate_blog_index():
-    blog_dir = Path("website/src/content/blog")
-    output_file = Path("website/public/blog_index.json")
 
-    posts = []
+def write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
 
-    for md_file in blog_dir.rglob("index.md"):
-        with open(md_file, "r", encoding="utf-8") as f:
-            content = f.read()
+def generate_blog_index(
+    blog_dir: str = "website/src/content/blog",
+    output_file: str = "website/public/blog_index.json",
+    state_file: str = ".cache/blog_index_state.json",
+    site_dir: str = "website",
+) -> bool:
+    """
+    Update the blog index.
 
-        data = parse_frontmatter(content)
+    Returns:
+        True if the index file was (re)written.
+    """
+    blog_dir, output_file, state_file, site_dir = map(Path, (blog_dir, output_file, state_file, site_dir))
+
+    state = load_json(state_file)
+    previous = state.get("posts", {}) if state.get("version") == STATE_VERSION else {}
+
+    fingerprints = {}
+    posts = []
+    parsed = 0
+    for md_file in sorted(blog_dir.rglob("index.md")):
+        key = md_file.as_posix()
+        raw = md_file.read_bytes()
+        fingerprint = hashlib.sha256(raw).hexdigest()
 
-        # Get slug from directory name
-        slug = md_file.parent.name
-        category = md_file.parent.parent.name
+        cached = previous.get(key)
+        if cached and cached["fingerprint"] == fingerprint:
+            entry = cached["entry"]
+        else:
+            entry = build_entry(md_file, site_dir, raw.decode("utf-8"))
+            parsed += 1
 
-        post_data = {
-            "slug": slug,
-            "category": category,
-            "title": data.get("title", ""),
-            "repo": data.get("repo", ""),
-            "date": data.get("date", ""),
-            "description": data.get("description", ""),
-            "path": str(md_file.relative_to(Path("website"))).replace("\\", "/"),
-            "last_updated": datetime.now().isoformat()
-        }
+        fingerprints[key] = {"fingerprint": fingerprint, "entry": entry}
+        posts.append(entry)
 
-        posts.append(post_data)
+    removed = len(set(previous) - set(fingerprints))
+    if fingerprints != previous:
+        write_json(state_file, {"version": STATE_VERSION, "posts": fingerprints})
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump({"posts": posts, "generated_at": datetime.now().isoformat()}, f, indent=2)
+    if load_json(output_file).get("posts") == posts:
+        print(f"Blog index unchanged ({len(posts)} posts, {parsed} re-parsed)")
+        return False
 
-    print(f"Generated blog index with {len(posts)} posts at {output_file}")
+    write_json(output_file, {"posts": posts, "generated_at": datetime.now().isoformat()})
+    print(f"Generated blog index with {len(posts)} posts at {output_file} ({parsed} re-parsed, {removed} removed)")
+    return True
 
 if __name__ == "__main__":
     generate_blog_index()
@@ -14,40 +14,37 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from blog_generator.blog_post_generator import BlogPostGenerator
+from blog_generator.similarity import SimilarityIndex
 
 
-def find_similar_projects(current, all_projects, limit=3):
-    """Find similar projects based on language and topics."""
-    similar = []
-    current_lang = current['metadata'].get('language', 'Unknown')
-    current_topics = set(current['metadata'].get('topics', []))
-    current_name = current['repo']
-
-    for other in all_projects:
-        if other['repo'] == current_name:
-            continue
+def find_similar_projects(current, all_projects, limit=3, index=None):
+    """
+    Find similar projects based on language and topics.
 
-        score = 0
-        # Same language
-        if other['metadata'].get('language') == current_lang:
-            score += 2
+    Pass a ``SimilarityIndex`` built once over ``all_projects`` when calling
+    this in a loop; without one, an index is built for this call.
+    """
+    if index is None:
+        index = SimilarityIndex.from_analyses(all_projects)
 
-        # Shared topics
-        other_topics = set(other['metadata'].get('topics', []))
-        shared = current_topics.intersection(other_topics)
-        score += len(shared)
+    metadata = current['metadata']
+    neighbours = index.query(
+        language=metadata.get('language', 'Unknown'),
+        topics=metadata.get('topics', []),
+        exclude=current['repo'],
+        k=limit,
+    )
 
-        if score > 0:
-            similar.append({
-                'name': other['repo'],
-                'url': f"https://github.com/{other['repo']}",
-                'description': other['metadata'].get('description', ''),
-                'score': score
-            })
-
-    # Sort by score desc
-    similar.sort(key=lambda x: x['score'], reverse=True)
-    return similar[:limit]
+    similar = []
+    for doc_id, score in neighbours:
+        other = index.payload(doc_id)
+        similar.append({
+            'name': other['repo'],
+            'url': f"https://github.com/{other['repo']}",
+            'description': other['metadata'].get('description', ''),
+            'score': score
+        })
+    return similar
 
 
 def create_blog_post(analysis, generator, similar_projects=None):
@@ -151,8 +148,9 @@ def main():
 
     # Generate blog posts
     generated = []
+    similarity_index = SimilarityIndex.from_analyses(approved)
     for analysis in approved:
-        similar = find_similar_projects(analysis, approved)
+        similar = find_similar_projects(analysis, approved, index=similarity_index)
         filepath = create_blog_post(analysis, generator, similar_projects=similar)
         if filepath:
             generated.append(filepath)
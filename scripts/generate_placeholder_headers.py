@@ -5,8 +5,13 @@ This creates visually appealing placeholders without needing an API.
 """
 import hashlib
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from blog_generator.frontmatter import parse_frontmatter
+
 # Color palettes based on category/language
 PALETTES = {
     'ai': ['#10b981', '#059669', '#047857'],       # Emerald
@@ -201,23 +206,6 @@ def create_svg_header(title: str, category: str, language: str, stars: int = 0)
 
     return svg
 
-def parse_frontmatter(content: str) -> dict:
-    """Parse YAML frontmatter from markdown."""
-    if not content.startswith('---'):
-        return {}
-
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return {}
-
-    data = {}
-    for line in parts[1].strip().split('\n'):
-        if ':' in line:
-            key, value = line.split(':', 1)
-            data[key.strip()] = value.strip().strip('"\'')
-
-    return data
-
 def generate_placeholders():
     """Generate SVG placeholders for all blog posts missing headers."""
     blog_dir = Path("website/src/content/blog")
@@ -238,10 +226,11 @@ def generate_placeholders():
         meta = parse_frontmatter(content)
         title = meta.get('title', md_file.parent.name)
         category = meta.get('category', meta.get('categories', 'General'))
-        if category.startswith('['):
-            category = category.strip('[]"\' ').split(',')[0]
-        language = meta.get('language', '')
-        stars = int(meta.get('stars', 0)) if meta.get('stars', '').isdigit() else 0
+        if isinstance(category, list):
+            category = str(category[0]) if category else 'General'
+        language = meta.get('language') or ''
+        stars = meta.get('stars', 0)
+        stars = int(stars) if str(stars).isdigit() else 0
 
         # Generate SVG
         svg_content = create_svg_header(title, category, language, stars)
@@ -15,32 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from blog_generator.markdown_writer import MarkdownWriter
-
-def parse_frontmatter(content):
-    """Simple manual frontmatter parser."""
-    if not content.startswith("---"):
-        return {}
-
-    try:
-        _, fm, _ = content.split("---", 2)
-        metadata = {}
-        for line in fm.strip().split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-                # Handle basic types
-                if value.startswith("[") and value.endswith("]"):
-                    try:
-                        value = json.loads(value)
-                    except:
-                        pass
-                elif value.startswith('"') and value.endswith('"'):
-                    value = value[1:-1]
-                metadata[key] = value
-        return metadata
-    except Exception:
-        return {}
+from blog_generator.frontmatter import parse_frontmatter
 
 
 def get_slug_from_filename(filename: str) -> str:
@@ -98,6 +98,16 @@ def main():
 
             logger.info(f"Found {len(repos)} repositories")
 
+            # Skip repos already processed by earlier runs (one bulk check)
+            if os.getenv("FIREBASE_CREDENTIALS"):
+                try:
+                    from persistence.firebase_store import FirebaseStore
+                    unprocessed = set(FirebaseStore().filter_unprocessed([r['full_name'] for r in repos]))
+                    repos = [r for r in repos if r['full_name'] in unprocessed]
+                    logger.info(f"{len(repos)} repositories not processed yet")
+                except Exception as e:
+                    logger.warning(f"Processed-repo check unavailable: {e}")
+
             # Find valid repos
             valid_repos = []
             for repo in repos:
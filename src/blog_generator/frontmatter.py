@@ -0,0 +1,142 @@
+"""
+Shared YAML frontmatter parsing for blog posts and investigations.
+
+Reads only the frontmatter block of a file (up to the closing ``---`` line),
+parses it with the libyaml-backed loader when available, and memoizes the
+result per ``(path, mtime, size)`` so repeated scans of the blog tree do not
+re-read unchanged posts.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+_BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class FrontmatterLoader(_BaseLoader):
+    """
+    Safe loader that keeps dates as strings.
+
+    ``date: 2025-11-27`` stays ``"2025-11-27"`` (as the old hand-written
+    parsers returned it), so the values can go straight into JSON.
+    """
+
+
+FrontmatterLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag != "tag:yaml.org,2002:timestamp"]
+    for first, resolvers in _BaseLoader.yaml_implicit_resolvers.items()
+}
+
+DELIMITER = "---"
+
+# Memoized frontmatter: (path, mtime_ns, size) -> parsed dict
+CACHE_SIZE = 4096
+_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _fallback_parse(text: str) -> Dict[str, Any]:
+    """Line-based ``key: value`` parse for frontmatter that is not valid YAML."""
+    data = {}
+    for line in text.split("\n"):
+        if ":" in line and not line.startswith((" ", "\t", "-")):
+            key, value = line.split(":", 1)
+            data[key.strip()] = value.strip().strip('"\'')
+    return data
+
+
+def parse_frontmatter_text(text: str) -> Dict[str, Any]:
+    """Parse the YAML between the delimiters (without them)."""
+    try:
+        data = yaml.load(text, Loader=FrontmatterLoader)
+    except yaml.YAMLError as e:
+        logger.debug(f"Invalid YAML frontmatter, using line parser: {e}")
+        return _fallback_parse(text)
+    return data if isinstance(data, dict) else {}
+
+
+def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
+    """
+    Split a document into ``(frontmatter text, body)``.
+
+    The frontmatter is the text between a leading ``---`` line and the next
+    ``---`` line; the body is everything after that line. Returns
+    ``(None, content)`` when the document has no frontmatter.
+    """
+    if not content.startswith(DELIMITER):
+        return None, content
+
+    first_break = content.find("\n")
+    if first_break == -1 or content[:first_break].rstrip() != DELIMITER:
+        return None, content
+
+    start = first_break + 1
+    position = start
+    while True:
+        end = content.find("\n", position)
+        line = content[position:] if end == -1 else content[position:end]
+        if line.rstrip() == DELIMITER:
+            return content[start:position], "" if end == -1 else content[end + 1:]
+        if end == -1:
+            return None, content
+        position = end + 1
+
+
+def parse_frontmatter(content: str) -> Dict[str, Any]:
+    """Parse the frontmatter of an in-memory document ({} if it has none)."""
+    text, _ = split_frontmatter(content)
+    return parse_frontmatter_text(text) if text is not None else {}
+
+
+def read_frontmatter_text(path: Union[str, Path]) -> Optional[str]:
+    """Read only the frontmatter block of ``path``, stopping at the closing delimiter."""
+    with open(path, "rb") as f:
+        if f.readline().rstrip() != DELIMITER.encode():
+            return None
+        lines = []
+        for line in f:
+            if line.rstrip() == DELIMITER.encode():
+                return b"".join(lines).decode("utf-8", errors="replace")
+            lines.append(line)
+    return None
+
+
+def load_frontmatter(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Frontmatter of the file at ``path`` ({} if it has none).
+
+    Results are memoized per ``(path, mtime, size)``; callers get their own
+    copy of the top-level dict.
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        data = _cache.get(key)
+        if data is not None:
+            _cache.move_to_end(key)
+            return dict(data)
+
+    text = read_frontmatter_text(path)
+    data = parse_frontmatter_text(text) if text is not None else {}
+
+    with _cache_lock:
+        _cache[key] = data
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return dict(data)
+
+
+def clear_cache():
+    """Forget all memoized frontmatter."""
+    with _cache_lock:
+        _cache.clear()
@@ -10,6 +10,8 @@ from datetime import datetime
 from pathlib import Path
 import json
 
+from .post_index import PostIndex
+
 
 class MarkdownWriter:
     """
@@ -18,16 +20,18 @@ class MarkdownWriter:
     Creates Jekyll-compatible posts from repository and script data.
     """
 
-    def __init__(self, output_dir: str = "website/src/content/blog"):
+    def __init__(self, output_dir: str = "website/src/content/blog", post_index_path: Optional[str] = None):
         """
         Initialize MarkdownWriter.
 
         Args:
             output_dir: Directory to save generated posts.
+            post_index_path: Repo -> post manifest (defaults to .cache/post_index.json).
         """
         self.logger = logging.getLogger(__name__)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.post_index = PostIndex(str(self.output_dir), post_index_path)
 
     def create_post(
         self,
@@ -85,6 +89,12 @@ class MarkdownWriter:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(full_content)
 
+            try:
+                self.post_index.record(str(filepath), full_name)
+            except Exception as e:
+                # The next refresh picks the post up from the tree
+                self.logger.warning(f"Failed to update post index: {e}")
+
             self.logger.info(f"Created blog post: {filepath}")
             return str(filepath)
 
@@ -95,6 +105,9 @@ class MarkdownWriter:
     def _find_existing_post(self, full_name: str) -> Optional[Path]:
         """
         Check if a blog post already exists for this repository.
+
+        Looks the repo up in the persistent post index instead of reading
+        every post.
         
         Args:
             full_name: Full repository name (owner/repo).
@@ -102,30 +115,11 @@ class MarkdownWriter:
         Returns:
             Path to existing post if found, None otherwise.
         """
-        import re
-        
-        for md_file in self.output_dir.rglob('index.md'):
-            try:
-                content = md_file.read_text(encoding='utf-8', errors='ignore')
-                
-                # Check for repo field match
-                match = re.search(r'^repo:\s*([^\n]+)', content, re.MULTILINE)
-                if match:
-                    repo_value = match.group(1).strip().strip('"\'')
-                    if repo_value.lower() == full_name.lower():
-                        return md_file
-                
-                # Also check full_name in repo_data
-                match = re.search(r'full_name:\s*["\']?([^"\'\n]+)', content)
-                if match:
-                    repo_value = match.group(1).strip()
-                    if repo_value.lower() == full_name.lower():
-                        return md_file
-                        
-            except Exception:
-                continue
-        
-        return None
+        try:
+            return self.post_index.find(full_name)
+        except Exception as e:
+            self.logger.warning(f"Post index lookup failed for {full_name}: {e}")
+            return None
 
     def _determine_categories(self, tags: List[str], language: str) -> List[str]:
         """
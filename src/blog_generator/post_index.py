@@ -0,0 +1,198 @@
+"""
+Persistent manifest of blog posts keyed by repository.
+
+Maps each Markdown post under the content directory to the repository it
+covers (``repo`` or ``repo_data.full_name`` in its frontmatter), with the
+file's mtime, size and content hash. The manifest lives outside the Astro
+content tree (``.cache/post_index.json`` by default) so the site build never
+sees it. Entries are validated lazily: a refresh only stats files and
+re-reads the ones whose mtime or size changed.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from .frontmatter import load_frontmatter
+
+MANIFEST_VERSION = 1
+
+
+def repo_from_frontmatter(meta: Dict[str, Any]) -> Optional[str]:
+    """Repository full name a post covers, from its frontmatter."""
+    repo = meta.get("repo")
+    if not repo and isinstance(meta.get("repo_data"), dict):
+        repo = meta["repo_data"].get("full_name")
+    repo = str(repo).strip() if repo else ""
+    return repo or None
+
+
+class PostIndex:
+    """
+    Repo -> post manifest for a blog content directory.
+
+    Args:
+        content_dir: Root of the Markdown posts.
+        manifest_path: JSON manifest location (defaults to
+            ``.cache/post_index.json``).
+    """
+
+    def __init__(self, content_dir: str, manifest_path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.content_dir = Path(content_dir)
+        self.manifest_path = Path(manifest_path or ".cache/post_index.json")
+        self._lock = threading.Lock()
+        # Relative post path -> {"repo", "mtime_ns", "size", "hash"}
+        self._posts: Dict[str, Dict[str, Any]] = {}
+        self._by_repo: Dict[str, List[str]] = {}
+        self._refreshed = False
+        self._load()
+
+    def _load(self):
+        if not self.manifest_path.exists():
+            return
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable post index {self.manifest_path}: {e}")
+            return
+        # A manifest built for another tree (or format) is rebuilt from scratch
+        if data.get("version") != MANIFEST_VERSION or data.get("root") != str(self.content_dir.resolve()):
+            return
+        self._posts = data.get("posts", {})
+        self._reindex()
+
+    def _reindex(self):
+        self._by_repo = {}
+        for rel_path, entry in sorted(self._posts.items()):
+            if entry.get("repo"):
+                self._by_repo.setdefault(entry["repo"].lower(), []).append(rel_path)
+
+    def save(self):
+        """Write the manifest atomically."""
+        with self._lock:
+            data = {
+                "version": MANIFEST_VERSION,
+                "root": str(self.content_dir.resolve()),
+                "posts": self._posts,
+            }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    def _entry(self, path: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """Read one post (frontmatter and content hash)."""
+        return {
+            "repo": repo_from_frontmatter(load_frontmatter(path)),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": hashlib.sha256(path.read_bytes()).hexdigest(),
+        }
+
+    def refresh(self) -> bool:
+        """
+        Bring the manifest in line with the tree.
+
+        Only posts that are new or whose mtime/size changed are read;
+        vanished posts are dropped. Saves the manifest if anything changed.
+
+        Returns:
+            True if the manifest changed.
+        """
+        changed = False
+        seen = set()
+        for path in self.content_dir.rglob("*.md"):
+            rel_path = path.relative_to(self.content_dir).as_posix()
+            seen.add(rel_path)
+            try:
+                stat = path.stat()
+                entry = self._posts.get(rel_path)
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    continue
+                new_entry = self._entry(path, stat)
+            except OSError as e:
+                self.logger.warning(f"Skipping unreadable post {path}: {e}")
+                continue
+            with self._lock:
+                self._posts[rel_path] = new_entry
+            changed = True
+
+        with self._lock:
+            for rel_path in set(self._posts) - seen:
+                del self._posts[rel_path]
+                changed = True
+            if changed:
+                self._reindex()
+            self._refreshed = True
+
+        if changed:
+            self.save()
+        return changed
+
+    def _ensure_refreshed(self):
+        if not self._refreshed:
+            self.refresh()
+
+    def _is_current(self, rel_path: str) -> bool:
+        entry = self._posts.get(rel_path)
+        try:
+            stat = (self.content_dir / rel_path).stat()
+        except OSError:
+            return False
+        return bool(entry) and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+
+    def find(self, full_name: str) -> Optional[Path]:
+        """
+        Path of an existing post for ``full_name`` (case-insensitive), or None.
+
+        The tree is refreshed once per index; after that only the matching
+        entries are re-validated against their mtimes.
+        """
+        self._ensure_refreshed()
+        with self._lock:
+            candidates = list(self._by_repo.get(full_name.lower(), []))
+        if any(not self._is_current(rel_path) for rel_path in candidates):
+            # A matching post was edited, moved or removed since it was indexed
+            self.refresh()
+            with self._lock:
+                candidates = list(self._by_repo.get(full_name.lower(), []))
+
+        # Page bundles first, as the old directory scan only looked at index.md
+        candidates.sort(key=lambda rel_path: (not rel_path.endswith("/index.md"), rel_path))
+        return self.content_dir / candidates[0] if candidates else None
+
+    def record(self, path: str, full_name: Optional[str] = None):
+        """Add or update one post after writing it, and save the manifest."""
+        path = Path(path)
+        rel_path = path.relative_to(self.content_dir).as_posix()
+        entry = self._entry(path, path.stat())
+        if full_name:
+            entry["repo"] = full_name
+        with self._lock:
+            self._posts[rel_path] = entry
+            self._reindex()
+        self.save()
+
+    def groups(self, bundles_only: bool = True) -> Dict[str, List[Path]]:
+        """
+        Posts grouped by repository (as written in the first post found).
+
+        Args:
+            bundles_only: Only page bundles (``<category>/<slug>/index.md``).
+        """
+        self._ensure_refreshed()
+        groups: Dict[str, List[Path]] = {}
+        with self._lock:
+            for rel_paths in self._by_repo.values():
+                paths = [
+                    self.content_dir / rel_path for rel_path in rel_paths
+                    if not bundles_only or rel_path.endswith("/index.md")
+                ]
+                if paths:
+                    groups[self._posts[rel_paths[0]]["repo"]] = paths
+        return groups
@@ -0,0 +1,196 @@
+"""
+Inverted-index similarity engine for "similar projects" / "related posts".
+
+Projects are scored against each other the way ``find_similar_projects``
+always has: +2 for the same language, +1 per shared topic (and, optionally,
+an IDF-weighted bonus for shared description words). Instead of comparing a
+project with every other one, the index keeps posting lists per language,
+topic and term, so a query only touches projects that share something with
+it; same-language-only matches are cut off after ``k`` because they all tie.
+"""
+
+import re
+import math
+import heapq
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+from .frontmatter import load_frontmatter
+
+LANGUAGE_WEIGHT = 2
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]{2,}")
+_STOP_WORDS = frozenset(
+    "the and for with that this from your you are was were has have not but all can its "
+    "into use using used based built more most than then them they their what when which "
+    "who will would about also just like over such only other some any how our out one "
+    "tool tools project projects open source".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase description words, without stop words."""
+    return [w for w in _WORD.findall((text or "").lower()) if w not in _STOP_WORDS]
+
+
+class SimilarityIndex:
+    """
+    Top-k similar projects over language, topics and (optionally) text.
+
+    Args:
+        text_weight: Weight of the description term bonus (sum of the IDF of
+            shared terms). 0 keeps the plain language/topic scores.
+        max_term_df: Terms used by more than this fraction of projects are
+            ignored (they say little and would make queries scan widely).
+    """
+
+    def __init__(self, text_weight: float = 0.0, max_term_df: float = 0.2):
+        self.text_weight = text_weight
+        self.max_term_df = max_term_df
+        self._keys: List[str] = []
+        self._payloads: List[Any] = []
+        self._languages: List[Optional[str]] = []
+        self._topics: List[frozenset] = []
+        self._terms: List[frozenset] = []
+        self._ids_by_key: Dict[str, List[int]] = {}
+        self._by_language: Dict[Optional[str], List[int]] = {}
+        self._by_topic: Dict[str, List[int]] = {}
+        self._by_term: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(
+        self,
+        key: str,
+        language: Optional[str] = None,
+        topics: Iterable[str] = (),
+        description: str = "",
+        payload: Any = None,
+    ) -> int:
+        """Index one project; returns its id (ids follow insertion order)."""
+        doc_id = len(self._keys)
+        topics = frozenset(topics or ())
+        terms = frozenset(tokenize(description)) if self.text_weight else frozenset()
+
+        self._keys.append(key)
+        self._payloads.append(payload)
+        self._languages.append(language)
+        self._topics.append(topics)
+        self._terms.append(terms)
+
+        self._ids_by_key.setdefault(key, []).append(doc_id)
+        self._by_language.setdefault(language, []).append(doc_id)
+        for topic in topics:
+            self._by_topic.setdefault(topic, []).append(doc_id)
+        for term in terms:
+            self._by_term.setdefault(term, []).append(doc_id)
+        return doc_id
+
+    @classmethod
+    def from_analyses(cls, analyses: Iterable[Dict[str, Any]], **kwargs) -> "SimilarityIndex":
+        """Index repo analyses (``{"repo", "metadata": {...}}``) as produced by the AI review."""
+        index = cls(**kwargs)
+        for analysis in analyses:
+            metadata = analysis.get("metadata", {})
+            index.add(
+                analysis["repo"],
+                language=metadata.get("language"),
+                topics=metadata.get("topics", []),
+                description=metadata.get("description", ""),
+                payload=analysis,
+            )
+        return index
+
+    @classmethod
+    def from_blog(cls, content_dir: str = "website/src/content/blog", **kwargs) -> "SimilarityIndex":
+        """Index every published page bundle (frontmatter only), for cross-corpus related posts."""
+        index = cls(**kwargs)
+        for md_file in sorted(Path(content_dir).rglob("index.md")):
+            meta = load_frontmatter(md_file)
+            repo_data = meta.get("repo_data") if isinstance(meta.get("repo_data"), dict) else {}
+            repo = meta.get("repo") or repo_data.get("full_name")
+            if not repo:
+                continue
+            topics = meta.get("tags") or repo_data.get("topics") or []
+            index.add(
+                str(repo),
+                language=meta.get("language") or repo_data.get("language"),
+                topics=topics if isinstance(topics, list) else [],
+                description=meta.get("description", ""),
+                payload={"path": str(md_file), "title": meta.get("title", ""), "frontmatter": meta},
+            )
+        return index
+
+    def _idf(self, term: str) -> float:
+        return math.log(1 + len(self._keys) / len(self._by_term[term]))
+
+    def query(
+        self,
+        language: Optional[str] = None,
+        topics: Iterable[str] = (),
+        description: str = "",
+        exclude: Optional[str] = None,
+        k: int = 3,
+    ) -> List[Tuple[int, float]]:
+        """
+        Top ``k`` ``(id, score)`` pairs for a project, best first.
+
+        Ties keep insertion order, and projects scoring 0 or keyed ``exclude``
+        are left out.
+        """
+        if k <= 0:
+            return []
+
+        scores: Dict[int, float] = {}
+        for topic in set(topics or ()):
+            for doc_id in self._by_topic.get(topic, ()):
+                scores[doc_id] = scores.get(doc_id, 0) + 1
+
+        if self.text_weight and self._keys:
+            max_df = max(1, int(self.max_term_df * len(self._keys)))
+            for term in set(tokenize(description)):
+                posting = self._by_term.get(term)
+                if posting and len(posting) <= max_df:
+                    bonus = self.text_weight * self._idf(term)
+                    for doc_id in posting:
+                        scores[doc_id] = scores.get(doc_id, 0) + bonus
+
+        same_language = self._by_language.get(language, [])
+        for doc_id in scores:
+            if self._languages[doc_id] == language:
+                scores[doc_id] += LANGUAGE_WEIGHT
+
+        # Language-only matches all score LANGUAGE_WEIGHT and tie by id,
+        # so the first k of them (posting lists are in id order) suffice
+        taken = 0
+        for doc_id in same_language:
+            if taken >= k:
+                break
+            if doc_id in scores or self._keys[doc_id] == exclude:
+                continue
+            scores[doc_id] = LANGUAGE_WEIGHT
+            taken += 1
+
+        candidates = (
+            (-score, doc_id) for doc_id, score in scores.items()
+            if score > 0 and self._keys[doc_id] != exclude
+        )
+        return [(doc_id, -neg_score) for neg_score, doc_id in heapq.nsmallest(k, candidates)]
+
+    def similar(self, key: str, k: int = 3) -> List[Tuple[int, float]]:
+        """Top ``k`` neighbours of an indexed project (by its first id for ``key``)."""
+        doc_id = self._ids_by_key[key][0]
+        return self.query(
+            language=self._languages[doc_id],
+            topics=self._topics[doc_id],
+            description=" ".join(self._terms[doc_id]),
+            exclude=key,
+            k=k,
+        )
+
+    def key(self, doc_id: int) -> str:
+        return self._keys[doc_id]
+
+    def payload(self, doc_id: int) -> Any:
+        return self._payloads[doc_id]
@@ -5,6 +5,11 @@ import time
 import asyncio
 from dotenv import load_dotenv
 from scanner.github_scanner import GitHubScanner
+from scanner.github_transport import GitHubTransport
+from scanner.response_cache import ResponseCache
+from scanner.rate_limiter import RateLimitScheduler
+from scanner.rust_bridge import get_scanner, RustScannerWorker
+from scanner.scan_state import ScanState
 from agents.scriptwriter import ScriptWriter
 from video_generator.reel_creator import ReelCreator
 from persistence.firebase_store import FirebaseStore
@@ -25,6 +30,17 @@ def main():
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
     parser.add_argument("--use-firebase", action="store_true", help="Enable Firebase persistence")
     parser.add_argument("--generate-images", action="store_true", help="Generate explanatory images with Nano Banana 2")
+    parser.add_argument("--http-cache", default=os.getenv("GITHUB_HTTP_CACHE", ".cache/github_http.sqlite"),
+                        help="On-disk ETag cache for GitHub API responses (304s are free)")
+    parser.add_argument("--no-http-cache", action="store_true", help="Disable the GitHub response cache")
+    parser.add_argument("--rust-worker", action="store_true",
+                        help="Find candidates with one long-lived Rust scanner process (reused across daemon runs)")
+    parser.add_argument("--insights-backend", choices=["rest", "graphql"], default=os.getenv("GITHUB_BACKEND", "rest"),
+                        help="API used to collect repo insights (graphql batches several repos per request)")
+    parser.add_argument("--scan-state", default=os.getenv("SCAN_STATE_PATH", ".cache/scan_state.json"),
+                        help="Watermark file: each run only searches repos pushed since the previous run")
+    parser.add_argument("--no-scan-state", action="store_true",
+                        help="Disable incremental scanning (re-run the full search every time)")
 
     args = parser.parse_args()
 
@@ -37,7 +53,24 @@ def main():
         return
 
     # Initialize Components
-    scanner = GitHubScanner(token=github_token)
+    cache = None if args.no_http_cache else ResponseCache(args.http_cache)
+    scanner = GitHubScanner(
+        token=github_token,
+        # Spreads requests over GITHUB_TOKENS / GITHUB_TOKEN / GH_PAT within their rate limits
+        transport=GitHubTransport(cache=cache, rate_limiter=RateLimitScheduler.from_env()),
+        insights_backend=args.insights_backend,
+    )
+
+    scan_state = None if args.no_scan_state else ScanState(args.scan_state)
+
+    # Warm Rust scanner shared by every job() run (falls back to the Python search)
+    rust_worker = None
+    if args.rust_worker:
+        candidate_scanner = get_scanner(github_token, prefer_rust=True, persistent=True)
+        if isinstance(candidate_scanner, RustScannerWorker):
+            rust_worker = candidate_scanner
+        else:
+            logging.warning("Rust scanner binary not found; using the Python scanner")
 
     api_key = os.getenv("GOOGLE_API_KEY") if args.provider == "gemini" else None
     try:
@@ -58,7 +91,10 @@ def main():
     firebase_store = None
     if args.use_firebase:
         try:
-            firebase_store = FirebaseStore()
+            # Status writes are buffered and committed in batches (flushed at exit)
+            firebase_store = FirebaseStore(write_behind=True)
+            # Read the processed names while the first scan runs
+            firebase_store.warm_processed_filter()
             logging.info("Firebase persistence enabled")
         except Exception as e:
             logging.warning(f"Failed to initialize Firebase: {e}. Continuing without persistence.")
@@ -74,17 +110,32 @@ def main():
 
     def job():
         logging.info("Starting scan job...")
-        repos = scanner.scan_recent_repos(limit=5)
+        repos = []
+        if rust_worker:
+            try:
+                repos = list(rust_worker.iter_repos(max_results=5))
+            except Exception as e:
+                logging.warning(f"Rust scanner worker failed: {e}. Using the Python scanner.")
+        if not repos and scan_state:
+            # Only repos pushed since the last run; unchanged ones never reach Firebase
+            repos = scanner.scan_recent_repos(query="created:>2023-01-01", limit=5, scan_state=scan_state)
+        elif not repos:
+            repos = scanner.scan_recent_repos(limit=5)
         logging.info(f"Found {len(repos)} potential repos.")
 
+        # Drop already processed repos in one bulk check (if Firebase enabled)
+        if firebase_store and repos:
+            unprocessed = set(firebase_store.filter_unprocessed([r['full_name'] for r in repos]))
+            for repo in repos:
+                if repo['full_name'] not in unprocessed:
+                    logging.info(f"Skipping {repo['full_name']} - already processed")
+                    if scan_state:
+                        scan_state.mark(repo)
+            repos = [r for r in repos if r['full_name'] in unprocessed]
+
         for repo in repos:
             repo_full_name = repo['full_name']
 
-            # Check if already processed (if Firebase enabled)
-            if firebase_store and firebase_store.is_processed(repo_full_name):
-                logging.info(f"Skipping {repo_full_name} - already processed")
-                continue
-
             if scanner.validate_repo(repo):
                 logging.info(f"Processing repo: {repo_full_name}")
 
@@ -167,6 +218,9 @@ def main():
                         )
 
                     logging.info(f"Finished processing {repo_full_name}")
+                    # Only now is the repo done; unhandled ones come back next scan
+                    if scan_state:
+                        scan_state.mark(repo)
 
                 except Exception as e:
                     logging.error(f"Error processing {repo_full_name}: {e}")
@@ -179,6 +233,18 @@ def main():
 
                 # Break after one successful video for testing
                 break
+            elif scan_state:
+                # A verdict: not worth a video
+                scan_state.mark(repo)
+
+        if firebase_store:
+            firebase_store.flush()
+        if scan_state:
+            try:
+                scan_state.save()
+            except Exception as e:
+                logging.error(f"Error saving scan state: {e}")
+        scanner.transport.log_stats()
 
     if args.mode == "once":
         job()
@@ -0,0 +1,58 @@
+"""
+Small in-memory Bloom filter for "definitely not seen" membership checks.
+"""
+
+import math
+import hashlib
+import threading
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings.
+
+    ``name in bloom`` is False only for names that were never added; a True
+    answer may be a false positive (about ``error_rate`` while fewer than
+    ``capacity`` names were added), so callers confirm it with the source of
+    truth.
+    """
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], error_rate: float = 0.01, headroom: float = 2.0) -> "BloomFilter":
+        """Build a filter holding ``names``, sized for ``headroom`` times as many."""
+        names = list(names)
+        bloom = cls(capacity=max(1000, int(len(names) * headroom)), error_rate=error_rate)
+        for name in names:
+            bloom.add(name)
+        return bloom
+
+    def _positions(self, name: str):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(name.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, name: str):
+        positions = self._positions(name)
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def __contains__(self, name: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(name))
+
+    def __len__(self) -> int:
+        return self.count
@@ -13,8 +13,13 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core import exceptions as google_exceptions
 import json
 import base64
+import atexit
+import threading
+
+from .bloom_filter import BloomFilter
 
 
 class FirebaseStore:
@@ -26,13 +31,31 @@ class FirebaseStore:
     2. Base64-encoded credentials (for CI/CD)
     """
 
-    def __init__(self, credentials_path: Optional[str] = None):
+    # Document references per Firestore get_all() call
+    GET_ALL_CHUNK_SIZE = 100
+
+    # Firestore's limit on operations per WriteBatch
+    MAX_BATCH_OPS = 500
+
+    # Flushes a buffered write may fail (transiently) before it is dropped
+    MAX_FLUSH_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        write_behind: bool = False,
+        flush_interval: float = 5.0,
+    ):
         """
         Initialize Firebase connection.
 
         Args:
             credentials_path: Path to service account JSON or base64-encoded credentials.
                             If None, reads from FIREBASE_CREDENTIALS env var.
+            write_behind: Buffer save_repo/update_status writes, coalesced per
+                          repo, and commit them as WriteBatches every
+                          ``flush_interval`` seconds and on close/exit.
+            flush_interval: Seconds between background flushes (write_behind only).
 
         Raises:
             ValueError: If credentials are not provided or invalid.
@@ -58,6 +81,27 @@ class FirebaseStore:
             self.db = firestore.client()
             self.collection = self.db.collection('processed_repos')
 
+            # Bloom filter of processed repo names, built by warm_processed_filter()
+            # or else on the first bulk check
+            self._processed_filter: Optional[BloomFilter] = None
+            self._filter_lock = threading.Lock()
+
+            # Write-behind buffer: repo name -> {"set": full document or None, "update": fields}
+            self.write_behind = write_behind
+            self.flush_interval = flush_interval
+            self._pending: Dict[str, Dict[str, Any]] = {}
+            # Failed flushes per buffered repo
+            self._attempts: Dict[str, int] = {}
+            self._pending_lock = threading.Lock()
+            self._flush_lock = threading.Lock()
+            self._stop = threading.Event()
+            self._flusher: Optional[threading.Thread] = None
+            if write_behind:
+                self._flusher = threading.Thread(target=self._flush_loop, name="firestore-flush", daemon=True)
+                self._flusher.start()
+                # Clean exit flushes whatever is still buffered
+                atexit.register(self.close)
+
         except Exception as e:
             self.logger.error(f"Failed to initialize Firebase: {e}")
             raise
@@ -99,6 +143,10 @@ class FirebaseStore:
         Returns:
             True if repository exists in database, False otherwise.
         """
+        if self._is_pending(repo_full_name):
+            self.logger.info(f"Repository {repo_full_name} already processed")
+            return True
+
         try:
             doc = self.collection.document(repo_full_name).get()
             exists = doc.exists
@@ -113,6 +161,95 @@ class FirebaseStore:
             # Fail-safe: return False to allow processing
             return False
 
+    def _load_processed_filter(self) -> BloomFilter:
+        """
+        Build the processed-name Bloom filter from one collection scan.
+
+        Only the ``repo_name`` field is read. The filter is kept up to date
+        by ``save_repo``; repos saved by other processes after the scan are
+        not in it, so call ``rebuild_processed_filter`` to pick them up.
+        """
+        with self._filter_lock:
+            if self._processed_filter is None:
+                names = []
+                for doc in self.collection.select(["repo_name"]).stream():
+                    data = doc.to_dict() or {}
+                    names.append(data.get("repo_name") or doc.id)
+                self._processed_filter = BloomFilter.from_names(names)
+                self.logger.info(f"Loaded {len(names)} processed repositories into the Bloom filter")
+            return self._processed_filter
+
+    def warm_processed_filter(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Build the Bloom filter now rather than on the first bulk check.
+
+        With ``background`` the collection scan runs in a daemon thread (a
+        ``filter_unprocessed`` call made meanwhile waits for it), so it
+        overlaps with the GitHub scan instead of delaying it.
+        """
+        def load():
+            try:
+                self._load_processed_filter()
+            except Exception as e:
+                self.logger.error(f"Error loading processed repositories: {e}")
+
+        if not background:
+            load()
+            return None
+        thread = threading.Thread(target=load, name="firestore-bloom", daemon=True)
+        thread.start()
+        return thread
+
+    def rebuild_processed_filter(self):
+        """Drop the Bloom filter; the next bulk check rebuilds it."""
+        with self._filter_lock:
+            self._processed_filter = None
+
+    def filter_unprocessed(self, repo_full_names: List[str]) -> List[str]:
+        """
+        Return the names that have not been processed yet, in input order.
+
+        Names the Bloom filter has never seen are unprocessed without a
+        Firestore call; possible hits are confirmed with batched
+        ``get_all`` reads (``GET_ALL_CHUNK_SIZE`` documents per call).
+
+        Args:
+            repo_full_names: Full repository names (e.g., "owner/repo").
+
+        Returns:
+            The subset of ``repo_full_names`` not found in the database.
+        """
+        try:
+            bloom = self._load_processed_filter()
+        except Exception as e:
+            self.logger.error(f"Error loading processed repositories: {e}")
+            bloom = None
+
+        # Buffered saves count as processed before they are flushed
+        processed = {name for name in repo_full_names if self._is_pending(name)}
+
+        # Without a filter every name needs confirming
+        maybe_processed = [
+            name for name in dict.fromkeys(repo_full_names)
+            if name not in processed and (bloom is None or name in bloom)
+        ]
+
+        for start in range(0, len(maybe_processed), self.GET_ALL_CHUNK_SIZE):
+            chunk = maybe_processed[start:start + self.GET_ALL_CHUNK_SIZE]
+            refs = [self.collection.document(name) for name in chunk]
+            names_by_path = {ref.path: name for ref, name in zip(refs, chunk)}
+            try:
+                for snapshot in self.db.get_all(refs):
+                    if snapshot.exists:
+                        processed.add(names_by_path.get(snapshot.reference.path))
+            except Exception as e:
+                # Fail-safe, as in is_processed: treat the chunk as unprocessed
+                self.logger.error(f"Error checking processed repositories: {e}")
+
+        if processed:
+            self.logger.info(f"Skipping {len(processed)} already processed repositories")
+        return [name for name in repo_full_names if name not in processed]
+
     def save_repo(
         self,
         repo_full_name: str,
@@ -142,7 +279,12 @@ class FirebaseStore:
                 "url": repo_data.get("html_url", ""),
             }
 
-            self.collection.document(repo_full_name).set(doc_data)
+            if self.write_behind:
+                self._buffer(repo_full_name, {"set": doc_data, "update": {}})
+            else:
+                self.collection.document(repo_full_name).set(doc_data)
+            if self._processed_filter is not None:
+                self._processed_filter.add(repo_full_name)
             self.logger.info(f"Saved repository {repo_full_name} with status: {status}")
             return True
 
@@ -181,7 +323,10 @@ class FirebaseStore:
             if error_message:
                 update_data["error_message"] = error_message
 
-            self.collection.document(repo_full_name).update(update_data)
+            if self.write_behind:
+                self._buffer(repo_full_name, {"set": None, "update": update_data})
+            else:
+                self.collection.document(repo_full_name).update(update_data)
             self.logger.info(f"Updated {repo_full_name} status to: {status}")
             return True
 
@@ -199,6 +344,10 @@ class FirebaseStore:
         Returns:
             Dictionary with repository data or None if not found.
         """
+        if self._is_pending(repo_full_name):
+            # Read your own writes
+            self.flush()
+
         try:
             doc = self.collection.document(repo_full_name).get()
 
@@ -236,3 +385,127 @@ class FirebaseStore:
         except Exception as e:
             self.logger.error(f"Error retrieving recent repos: {e}")
             return []
+
+    # --- Write-behind buffer -------------------------------------------------
+
+    @staticmethod
+    def _merge(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        """Coalesce two buffered writes to one document (``new`` is later)."""
+        if new["set"] is not None:
+            return new
+        if old["set"] is not None:
+            return {"set": {**old["set"], **new["update"]}, "update": {}}
+        return {"set": None, "update": {**old["update"], **new["update"]}}
+
+    def _buffer(self, repo_full_name: str, op: Dict[str, Any]):
+        with self._pending_lock:
+            previous = self._pending.get(repo_full_name)
+            self._pending[repo_full_name] = self._merge(previous, op) if previous else op
+
+    def _is_pending(self, repo_full_name: str) -> bool:
+        with self._pending_lock:
+            return repo_full_name in self._pending
+
+    def _write(self, repo_full_name: str, op: Dict[str, Any], batch=None):
+        """Apply one buffered write, to ``batch`` if given, else directly."""
+        ref = self.collection.document(repo_full_name)
+        if batch is not None:
+            if op["set"] is not None:
+                batch.set(ref, op["set"])
+            else:
+                batch.update(ref, op["update"])
+        elif op["set"] is not None:
+            ref.set(op["set"])
+        else:
+            ref.update(op["update"])
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Whether a failed write may succeed if retried (outage, contention, quota)."""
+        if isinstance(error, (google_exceptions.TooManyRequests, google_exceptions.Conflict)):
+            return True
+        # Other 4xx (permission, invalid data, missing document) and
+        # client-side validation fail the same way every time
+        return not isinstance(error, (google_exceptions.ClientError, ValueError, TypeError))
+
+    def flush(self) -> int:
+        """
+        Commit all buffered writes as WriteBatches of up to ``MAX_BATCH_OPS``.
+
+        A batch that fails is retried one write at a time so one bad
+        document (e.g. an update to a missing repo) does not hold back the
+        rest. A write that still fails transiently goes back into the buffer
+        (under any newer writes to the same repo) for the next flush, up to
+        ``MAX_FLUSH_ATTEMPTS`` flushes; permanent errors (permission,
+        validation, missing document) drop it at once. A dropped repo no
+        longer counts as processed, so a later scan picks it up again.
+
+        Returns:
+            Number of documents written.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            written = 0
+            failed = []
+            items = list(pending.items())
+            for start in range(0, len(items), self.MAX_BATCH_OPS):
+                chunk = items[start:start + self.MAX_BATCH_OPS]
+                try:
+                    batch = self.db.batch()
+                    for name, op in chunk:
+                        self._write(name, op, batch)
+                    batch.commit()
+                    written += len(chunk)
+                except Exception as e:
+                    self.logger.warning(f"Batch write of {len(chunk)} repos failed ({e}); retrying individually")
+                    for name, op in chunk:
+                        try:
+                            self._write(name, op)
+                            written += 1
+                        except Exception as e:
+                            self.logger.error(f"Error writing repository {name}: {e}")
+                            failed.append((name, op, self._is_transient(e)))
+
+            failed_names = {name for name, _, _ in failed}
+            with self._pending_lock:
+                for name, _ in items:
+                    if name not in failed_names:
+                        self._attempts.pop(name, None)
+                kept = 0
+                for name, op, transient in failed:
+                    attempts = self._attempts.get(name, 0) + 1
+                    newer = self._pending.get(name)
+                    if not transient or attempts >= self.MAX_FLUSH_ATTEMPTS:
+                        self._attempts.pop(name, None)
+                        self.logger.error(f"Dropping buffered write for {name} after {attempts} failed flush(es)")
+                        continue
+                    self._attempts[name] = attempts
+                    self._pending[name] = self._merge(op, newer) if newer else op
+                    kept += 1
+            if kept:
+                self.logger.warning(f"Kept {kept} failed repository writes for the next flush")
+
+            self.logger.info(f"Flushed {written} buffered repository writes")
+            return written
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Background flush failed: {e}")
+
+    def close(self):
+        """Stop the background flusher and write everything still buffered."""
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+        with self._pending_lock:
+            lost = sorted(self._pending)
+        if lost:
+            self.logger.error(f"{len(lost)} repository writes could not be saved: {', '.join(lost)}")
@@ -0,0 +1,237 @@
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+# (st_mtime_ns, st_size) of a Markdown file when it was indexed
+FileStat = Tuple[int, int]
+
+class InvestigationIndex:
+    """
+    SQLite sidecar index over LocalStore investigation metadata.
+
+    The Markdown files remain the source of truth: the index only holds the
+    frontmatter fields needed for queries and can be rebuilt from the files
+    at any time. The database runs in WAL mode so readers are not blocked
+    while an investigation is being saved.
+
+    Each indexed file's ``(mtime_ns, size)`` is recorded too, so the store
+    can tell which files were added, edited or removed behind its back.
+    """
+
+    COLUMNS = (
+        "repo_full_name", "repo_name", "url", "language", "stars", "status",
+        "latest_commit", "version", "topics", "created_at", "pushed_at",
+        "last_updated", "file_name",
+    )
+
+    # Columns query() may sort by
+    SORTABLE = ("stars", "last_updated", "pushed_at", "created_at", "repo_full_name")
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS investigations (
+                repo_full_name TEXT PRIMARY KEY,
+                repo_name TEXT,
+                url TEXT,
+                language TEXT,
+                stars INTEGER,
+                status TEXT,
+                latest_commit TEXT,
+                version TEXT,
+                topics TEXT,
+                created_at TEXT,
+                pushed_at TEXT,
+                last_updated TEXT,
+                file_name TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_investigations_language_stars
+                ON investigations (language, stars DESC);
+            CREATE INDEX IF NOT EXISTS idx_investigations_status
+                ON investigations (status);
+            CREATE TABLE IF NOT EXISTS files (
+                file_name TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER
+            );
+        """)
+        self._conn.commit()
+
+    def _row(self, metadata: Dict[str, Any], file_name: str) -> tuple:
+        def text(value):
+            # YAML turns ISO timestamps into datetimes
+            return None if value is None else str(value)
+
+        return (
+            metadata.get("repo_full_name"),
+            metadata.get("repo_name"),
+            metadata.get("url"),
+            metadata.get("language"),
+            metadata.get("stars"),
+            metadata.get("status"),
+            text(metadata.get("latest_commit")),
+            text(metadata.get("version")),
+            json.dumps(metadata.get("topics") or []),
+            text(metadata.get("created_at")),
+            text(metadata.get("pushed_at")),
+            text(metadata.get("last_updated")),
+            file_name,
+        )
+
+    def _upsert(self, rows: Iterable[tuple]):
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO investigations ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+            rows,
+        )
+
+    def _record_files(self, stats: Dict[str, FileStat]):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (file_name, mtime_ns, size) VALUES (?, ?, ?)",
+            [(name, mtime_ns, size) for name, (mtime_ns, size) in stats.items()],
+        )
+
+    def upsert(self, metadata: Dict[str, Any], file_name: str, stat: Optional[FileStat] = None):
+        """Index (or re-index) one investigation in its own transaction."""
+        self.upsert_many([(metadata, file_name)], {file_name: stat} if stat else None)
+
+    def upsert_many(self, entries: Iterable[tuple], stats: Optional[Dict[str, FileStat]] = None):
+        """Index ``(metadata, file_name)`` entries (and their files' ``stats``) in a single transaction."""
+        rows = [self._row(metadata, file_name) for metadata, file_name in entries]
+        with self._lock, self._conn:
+            self._upsert(rows)
+            self._record_files(stats or {})
+
+    def replace_all(self, entries: Iterable[tuple], stats: Optional[Dict[str, FileStat]] = None):
+        """
+        Replace the whole index with ``(metadata, file_name)`` entries in a
+        single transaction (used to rebuild from the Markdown files).
+        """
+        rows = [self._row(metadata, file_name) for metadata, file_name in entries]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM investigations")
+            self._conn.execute("DELETE FROM files")
+            self._upsert(rows)
+            self._record_files(stats or {})
+
+    def sync_files(self, entries: Iterable[tuple], stats: Dict[str, FileStat], removed: Iterable[str]):
+        """
+        Catch up with changed files in a single transaction.
+
+        Args:
+            entries: ``(metadata, file_name)`` of the changed files that hold
+                an investigation.
+            stats: Current stat of every changed file (including unparseable
+                ones, so they are not retried until they change again).
+            removed: Names of indexed files that no longer exist.
+        """
+        rows = [self._row(metadata, file_name) for metadata, file_name in entries]
+        stale = [(name,) for name in list(stats) + list(removed)]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM investigations WHERE file_name = ?", stale)
+            self._conn.executemany("DELETE FROM files WHERE file_name = ?", stale)
+            self._upsert(rows)
+            self._record_files(stats)
+
+    def file_stats(self) -> Dict[str, FileStat]:
+        """Recorded ``(mtime_ns, size)`` per indexed file name."""
+        with self._lock:
+            rows = self._conn.execute("SELECT file_name, mtime_ns, size FROM files").fetchall()
+        return {name: (mtime_ns, size) for name, mtime_ns, size in rows}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM investigations").fetchone()[0]
+
+    def names(self) -> List[str]:
+        """All indexed repo full names, sorted."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT repo_full_name FROM investigations ORDER BY repo_full_name"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def query(
+        self,
+        language: Optional[str] = None,
+        status: Optional[str] = None,
+        min_stars: Optional[int] = None,
+        order_by: str = "stars",
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Indexed metadata matching all given filters.
+
+        Example: ``query(language="Rust", limit=10)`` is the top 10 Rust
+        investigations by stars.
+        """
+        if order_by not in self.SORTABLE:
+            raise ValueError(f"order_by must be one of {self.SORTABLE}")
+
+        clauses, params = [], []
+        if language is not None:
+            clauses.append("language = ? COLLATE NOCASE")
+            params.append(language)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if min_stars is not None:
+            clauses.append("stars >= ?")
+            params.append(min_stars)
+
+        sql = "SELECT * FROM investigations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, repo_full_name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def outdated(self, current_commits: Dict[str, str]) -> List[str]:
+        """
+        Indexed repos whose ``latest_commit`` differs from ``current_commits``.
+
+        Args:
+            current_commits: Mapping of repo full name to its current commit hash.
+                Repos without an investigation are ignored.
+        """
+        names = list(current_commits)
+        stale = []
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT repo_full_name, latest_commit FROM investigations "
+                    f"WHERE repo_full_name IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                ).fetchall()
+            stale.extend(
+                name for name, commit in rows if commit != current_commits[name]
+            )
+        return sorted(stale)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        data["topics"] = json.loads(data["topics"] or "[]")
+        return data
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,30 +1,73 @@
 import os
+import stat
 import yaml
+import hashlib
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+
+from .investigation_index import InvestigationIndex, FileStat
+
+try:
+    from blog_generator.frontmatter import split_frontmatter, parse_frontmatter_text, load_frontmatter
+except ImportError:
+    from src.blog_generator.frontmatter import split_frontmatter, parse_frontmatter_text, load_frontmatter
+
+
+def _new_file_mode() -> int:
+    """Mode ``open(path, "w")`` gives a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once at import: os.umask() can only be read by setting it, which would
+# race with files being created by other threads
+NEW_FILE_MODE = _new_file_mode()
 
 class LocalStore:
     """
     Manages persistence of investigations as Markdown files with YAML frontmatter.
     Acts as a file-based database for the repository.
+
+    Frontmatter is mirrored into a SQLite sidecar index (``.index.sqlite3``
+    in the storage directory) for queries; the Markdown files stay the
+    source of truth. On open, files whose ``(mtime_ns, size)`` differs from
+    what the index recorded (added, edited or deleted by hand, a git pull)
+    are re-indexed.
     """
 
-    def __init__(self, storage_dir: str = "investigations"):
+    INDEX_FILE = ".index.sqlite3"
+
+    def __init__(self, storage_dir: str = "investigations", use_index: bool = True):
         self.logger = logging.getLogger(__name__)
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
+        self.index: Optional[InvestigationIndex] = None
+        if use_index:
+            try:
+                self.index = InvestigationIndex(str(self.storage_dir / self.INDEX_FILE))
+                self.refresh_index()
+            except Exception as e:
+                self.logger.warning(f"Investigation index unavailable, falling back to files: {e}")
+                self.index = None
+
     def _get_file_path(self, repo_full_name: str) -> Path:
         """Generates a safe filename from the repo name."""
         safe_name = repo_full_name.replace("/", "_").replace(" ", "-")
         return self.storage_dir / f"{safe_name}.md"
 
-    def save_investigation(self, repo_data: Dict[str, Any], analysis: Dict[str, Any]) -> str:
+    def _render(self, repo_data: Dict[str, Any], analysis: Dict[str, Any]) -> Tuple[Path, Dict[str, Any], str]:
         """
-        Saves the investigation to a markdown file.
-        Updates existing file if it exists, preserving history if needed.
+        Renders an investigation file.
+
+        Returns:
+            (file path, frontmatter metadata, full file text). The metadata
+            carries a ``content_hash`` of everything except ``last_updated``.
         """
         file_path = self._get_file_path(repo_data["full_name"])
 
@@ -53,16 +96,130 @@ class LocalStore:
             content += "## Analysis\n\n"
             content += str(analysis)
 
-        # Write to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write("---\n")
-            yaml.dump(metadata, f, default_flow_style=False)
-            f.write("---\n\n")
-            f.write(content)
+        # The timestamp changes on every save, so it is left out of the hash
+        hashed = {k: v for k, v in metadata.items() if k != "last_updated"}
+        digest = hashlib.sha256()
+        digest.update(yaml.dump(hashed, default_flow_style=False).encode("utf-8"))
+        digest.update(content.encode("utf-8"))
+        metadata["content_hash"] = digest.hexdigest()
+
+        text = "---\n" + yaml.dump(metadata, default_flow_style=False) + "---\n\n" + content
+        return file_path, metadata, text
 
+    def _stored_hash(self, file_path: Path) -> Optional[str]:
+        """Reads ``content_hash`` from an existing file's frontmatter, without parsing YAML."""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                if f.readline().rstrip("\n") != "---":
+                    return None
+                for line in f:
+                    if line.rstrip("\n") == "---":
+                        break
+                    if line.startswith("content_hash:"):
+                        return line.split(":", 1)[1].strip().strip("'\"")
+        except FileNotFoundError:
+            pass
+        return None
+
+    def _write_atomic(self, file_path: Path, text: str):
+        """
+        Writes via a temp file in the same directory, fsync and rename.
+
+        The file keeps its previous permissions (new files get the usual
+        umask-based mode); mkstemp alone would leave it readable only by
+        its owner.
+        """
+        try:
+            mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        fd, tmp_path = tempfile.mkstemp(dir=self.storage_dir, prefix=f".{file_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _save(self, repo_data: Dict[str, Any], analysis: Dict[str, Any]) -> Tuple[Path, Optional[Dict[str, Any]]]:
+        """
+        Renders and writes one investigation unless its content is unchanged.
+
+        Returns:
+            (file path, metadata if the file was written else None).
+        """
+        file_path, metadata, text = self._render(repo_data, analysis)
+        if self._stored_hash(file_path) == metadata["content_hash"]:
+            self.logger.debug(f"Investigation unchanged, skipping write: {file_path}")
+            return file_path, None
+
+        self._write_atomic(file_path, text)
         self.logger.info(f"Saved investigation to {file_path}")
+        return file_path, metadata
+
+    def _index_saved(self, saved: List[Tuple[Path, Dict[str, Any]]]):
+        if not self.index or not saved:
+            return
+        try:
+            self.index.upsert_many(
+                ((metadata, file_path.name) for file_path, metadata in saved),
+                {file_path.name: self._stat(file_path) for file_path, _ in saved},
+            )
+        except Exception as e:
+            # The files are saved; a later rebuild_index() catches the index up
+            self.logger.error(f"Error indexing {len(saved)} investigations: {e}")
+
+    def save_investigation(self, repo_data: Dict[str, Any], analysis: Dict[str, Any]) -> str:
+        """
+        Saves the investigation to a markdown file.
+
+        The file is replaced atomically (temp file + rename), and not written
+        at all when its content (ignoring ``last_updated``) is unchanged.
+        """
+        file_path, metadata = self._save(repo_data, analysis)
+        if metadata:
+            self._index_saved([(file_path, metadata)])
         return str(file_path)
 
+    def save_many(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]],
+        max_workers: int = 8,
+    ) -> List[str]:
+        """
+        Saves many ``(repo_data, analysis)`` investigations.
+
+        Rendering and writing run in a thread pool, unchanged files are
+        skipped, and the index is updated in a single transaction.
+
+        Returns:
+            File paths, in input order.
+        """
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-store") as pool:
+            results = list(pool.map(lambda item: self._save(*item), items))
+
+        written = [(file_path, metadata) for file_path, metadata in results if metadata]
+        self._index_saved(written)
+        self.logger.info(f"Saved {len(written)} of {len(items)} investigations ({len(items) - len(written)} unchanged)")
+        return [str(file_path) for file_path, _ in results]
+
+    def _read_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Parses one investigation file into metadata and content."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            raw_content = f.read()
+
+        # Split frontmatter and content
+        frontmatter, content = split_frontmatter(raw_content)
+        if frontmatter is None:
+            return None
+        return {"metadata": parse_frontmatter_text(frontmatter), "content": content}
+
     def get_investigation(self, repo_full_name: str) -> Optional[Dict[str, Any]]:
         """Retrieves the investigation data including metadata."""
         file_path = self._get_file_path(repo_full_name)
@@ -70,22 +227,90 @@ class LocalStore:
             return None
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                # Split frontmatter and content
-                raw_content = f.read()
-
-            if raw_content.startswith("---"):
-                parts = raw_content.split("---", 2)
-                if len(parts) >= 3:
-                    metadata = yaml.safe_load(parts[1])
-                    content = parts[2]
-                    return {"metadata": metadata, "content": content}
-
-            return None
+            return self._read_file(file_path)
         except Exception as e:
             self.logger.error(f"Error reading investigation {repo_full_name}: {e}")
             return None
 
     def list_investigations(self) -> list:
         """Lists all stored investigations."""
+        if self.index:
+            return self.index.names()
         return [f.stem.replace("_", "/") for f in self.storage_dir.glob("*.md")]
+
+    @staticmethod
+    def _stat(file_path: Path) -> FileStat:
+        stat = file_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _file_stats(self) -> Dict[str, FileStat]:
+        """Current ``(mtime_ns, size)`` of every investigation file."""
+        return {file_path.name: self._stat(file_path) for file_path in self.storage_dir.glob("*.md")}
+
+    def _index_entries(self, file_names: Iterable[str]) -> List[Tuple[Dict[str, Any], str]]:
+        """``(metadata, file name)`` of the named files that hold an investigation."""
+        entries = []
+        for file_name in sorted(file_names):
+            file_path = self.storage_dir / file_name
+            try:
+                # Only the frontmatter block is read
+                metadata = load_frontmatter(file_path)
+            except Exception as e:
+                self.logger.error(f"Error reading investigation {file_path}: {e}")
+                continue
+            if metadata.get("repo_full_name"):
+                entries.append((metadata, file_name))
+        return entries
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuilds the SQLite index from the Markdown files.
+
+        Returns:
+            Number of investigations indexed.
+        """
+        if not self.index:
+            return 0
+
+        stats = self._file_stats()
+        entries = self._index_entries(stats)
+        self.index.replace_all(entries, stats)
+        self.logger.info(f"Rebuilt investigation index ({len(entries)} files)")
+        return len(entries)
+
+    def refresh_index(self) -> int:
+        """
+        Re-indexes files added, edited or removed since they were indexed
+        (by ``(mtime_ns, size)``); unchanged files are not read.
+
+        Returns:
+            Number of files re-indexed or dropped.
+        """
+        if not self.index:
+            return 0
+
+        current = self._file_stats()
+        known = self.index.file_stats()
+        changed = {name: stat for name, stat in current.items() if known.get(name) != stat}
+        removed = [name for name in known if name not in current]
+        if not changed and not removed:
+            return 0
+
+        self.index.sync_files(self._index_entries(changed), changed, removed)
+        self.logger.info(f"Refreshed investigation index ({len(changed)} changed, {len(removed)} removed)")
+        return len(changed) + len(removed)
+
+    def query_investigations(self, **filters) -> List[Dict[str, Any]]:
+        """
+        Queries indexed metadata, e.g. ``query_investigations(language="Rust", limit=10)``
+        for the top 10 Rust investigations by stars. See ``InvestigationIndex.query``.
+        """
+        if not self.index:
+            raise RuntimeError("Investigation index is disabled")
+        return self.index.query(**filters)
+
+    def outdated_investigations(self, current_commits: Dict[str, str]) -> List[str]:
+        """Repos whose stored ``latest_commit`` differs from ``current_commits``."""
+        if not self.index:
+            raise RuntimeError("Investigation index is disabled")
+        return self.index.outdated(current_commits)
@@ -2,34 +2,84 @@
 Hidden Gems Analyzer - Deep analysis for quality low-visibility projects
 """
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    from .repo_snapshot import RepoSnapshot
+except ImportError:
+    from src.scanner.repo_snapshot import RepoSnapshot
+
 logger = logging.getLogger(__name__)
 
 
 class GemAnalyzer:
-    """Analyzes repositories to find hidden gems"""
+    """
+    Analyzes repositories to find hidden gems.
 
-    def __init__(self, github_client):
-        self.client = github_client
+    ``github_client`` is a PyGithub ``Github`` instance or a
+    ``GraphQLBackend``; both provide ``get_repo``. The GraphQL snapshot
+    differs from REST in that issue lists exclude pull requests.
+
+    The four sub-analyses of a repo run concurrently on a pool shared by
+    every ``analyze_repo`` call; ``max_workers`` bounds it.
+    """
+
+    # Comments scanned in the repo-wide listing before falling back per issue
+    BULK_COMMENT_LIMIT = 200
 
-    def analyze_repo(self, repo_full_name: str) -> Dict:
+    SUB_ANALYSES = ("_analyze_commits", "_analyze_code_quality", "_analyze_engagement", "_analyze_maturity")
+
+    def __init__(self, github_client, max_workers: int = 8):
+        self.client = github_client
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the pool shared by all sub-analyses."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="gem-analysis"
+                )
+            return self._executor
+
+    def close(self):
+        """Shut down the analysis pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def analyze_repo(self, repo_full_name: str, repo=None) -> Dict:
         """
         Perform deep analysis on a repository
         Returns scoring and recommendation
+
+        Pass ``repo`` (ideally a ``RepoSnapshot`` shared with ``has_red_flags``
+        and the AI review) to skip re-fetching it. Either way the analyzers
+        share one snapshot, so each resource is fetched once.
         """
         logger.info(f"🔍 Analyzing {repo_full_name} for hidden gem potential...")
 
         try:
-            repo = self.client.get_repo(repo_full_name)
-
-            # Gather all metrics
-            commit_score, commit_data = self._analyze_commits(repo)
-            quality_score, quality_data = self._analyze_code_quality(repo)
-            engagement_score, engagement_data = self._analyze_engagement(repo)
-            maturity_score, maturity_data = self._analyze_maturity(repo)
+            repo = RepoSnapshot.wrap(repo if repo is not None else self.client.get_repo(repo_full_name))
+
+            # Gather all metrics (independent, so fetched concurrently; the
+            # snapshot makes shared resources such as the root tree load once)
+            executor = self._get_executor()
+            futures = [executor.submit(getattr(self, name), repo) for name in self.SUB_ANALYSES]
+            (
+                (commit_score, commit_data),
+                (quality_score, quality_data),
+                (engagement_score, engagement_data),
+                (maturity_score, maturity_data),
+            ) = [future.result() for future in futures]
 
             # Calculate weighted total score
             total_score = (
@@ -280,6 +330,43 @@ class GemAnalyzer:
         except:
             return 0
 
+    def _first_comment_times(self, repo, issues) -> Dict[int, datetime]:
+        """
+        Creation time of the first comment on each commented issue.
+
+        Reads the repo-wide comment listing (sorted by creation, starting at
+        the oldest sampled issue) and joins it to the issues locally, instead
+        of one request per issue. Issues not found within
+        ``BULK_COMMENT_LIMIT`` comments fall back to a per-issue request.
+        GraphQL snapshots carry the first comment already and skip the bulk
+        listing.
+        """
+        targets = {issue.number: issue for issue in issues if issue.comments > 0}
+        first = {}
+
+        if targets and hasattr(repo, "get_issues_comments"):
+            try:
+                since = min(issue.created_at for issue in targets.values())
+                comments = repo.get_issues_comments(sort="created", direction="asc", since=since)
+                for n, comment in enumerate(comments):
+                    if n >= self.BULK_COMMENT_LIMIT:
+                        break
+                    number = int(comment.issue_url.rsplit("/", 1)[-1])
+                    if number in targets and number not in first:
+                        first[number] = comment.created_at
+                        if len(first) == len(targets):
+                            break
+            except Exception as e:
+                logger.warning(f"Bulk comment listing failed: {e}")
+
+        for number, issue in targets.items():
+            if number not in first:
+                comments = list(issue.get_comments()[:1])
+                if comments:
+                    first[number] = comments[0].created_at
+
+        return first
+
     def _analyze_engagement(self, repo) -> Tuple[float, Dict]:
         """Analyze developer responsiveness and community engagement"""
         try:
@@ -294,12 +381,12 @@ class GemAnalyzer:
                 if closed_issues_list:
                     # Calculate average response time
                     response_times = []
-                    for issue in closed_issues_list[:10]:
-                        if issue.comments > 0:
-                            comments = list(issue.get_comments()[:1])
-                            if comments:
-                                time_to_response = (comments[0].created_at - issue.created_at).days
-                                response_times.append(time_to_response)
+                    sampled = closed_issues_list[:10]
+                    first_comment_at = self._first_comment_times(repo, sampled)
+                    for issue in sampled:
+                        if issue.number in first_comment_at:
+                            time_to_response = (first_comment_at[issue.number] - issue.created_at).days
+                            response_times.append(time_to_response)
 
                     if response_times:
                         avg_response_time = sum(response_times) / len(response_times)
@@ -1,19 +1,42 @@
-import requests
 import datetime
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterator, Callable
+from urllib.parse import quote
 
 try:
     from .insights_collector import InsightsCollector
     from .repo_classifier import RepoClassifier
+    from .github_transport import GitHubTransport, get_default_transport
+    from .scan_state import ScanState
 except ImportError:
     # Fallback for when running scripts from different cwd
     from src.scanner.insights_collector import InsightsCollector
     from src.scanner.repo_classifier import RepoClassifier
+    from src.scanner.github_transport import GitHubTransport, get_default_transport
+    from src.scanner.scan_state import ScanState
+
+def _earliest(timestamps: List[Optional[str]]) -> Optional[datetime.datetime]:
+    """Earliest of GitHub ISO timestamps, or None if any is missing or unreadable."""
+    try:
+        return min(datetime.datetime.fromisoformat(t.replace("Z", "+00:00")) for t in timestamps)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
 
 class GitHubScanner:
-    def __init__(self, token):
+    # GitHub search returns at most this many results per query
+    SEARCH_RESULT_CAP = 1000
+
+    def __init__(
+        self,
+        token,
+        max_workers: int = 8,
+        transport: Optional[GitHubTransport] = None,
+        insights_backend: str = "rest",
+    ):
         self.token = token
         self.headers = {
             "Authorization": f"token {self.token}",
@@ -22,58 +45,262 @@ class GitHubScanner:
         self.api_url = "https://api.github.com"
         self.logger = logging.getLogger(__name__)
 
+        # All HTTP traffic (search, insights, validation) shares one pooled transport
+        self.transport = transport or get_default_transport()
+
         # Initialize helpers
-        self.insights_collector = InsightsCollector(token)
+        self.insights_collector = InsightsCollector(
+            token, max_workers=max_workers, transport=self.transport, backend=insights_backend
+        )
         self.classifier = RepoClassifier()
 
-    def scan_recent_repos(self, query="created:>2023-01-01", limit=10) -> List[Dict[str, Any]]:
+    def scan_recent_repos(
+        self,
+        query: Optional[str] = None,
+        limit: int = 10,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        scan_state: Optional[ScanState] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Scans for recent repositories and filters them using enhanced analysis.
 
+        Without ``since`` a single search page is fetched (``limit * 2``
+        results, default query ``created:>2023-01-01``). With ``since`` the
+        whole ``created`` range ``since..until`` (until defaults to now) is
+        swept through ``iter_search_results``, so every repo created in the
+        range is considered, not only the top page; ``query`` then only adds
+        qualifiers.
+
+        With ``scan_state`` the sweep is incremental: it covers repos
+        *pushed* since the state's watermark, repos whose ``pushed_at`` did
+        not move since they were last evaluated are skipped before any
+        insights request. The search windows are walked oldest first and the
+        watermark advances to the end of the newest window that was consumed
+        completely, so a sweep cut short by ``limit`` resumes where it
+        stopped next time instead of re-searching the whole range.
+
+        Only rejected repos are marked as evaluated here. Accepted repos are
+        the caller's to ``scan_state.mark`` (and ``save``) once it has
+        processed them; until then, like repos whose analysis failed, they
+        hold the watermark back so the next scan finds them again.
+
         Returns:
             List of filtered and enriched repository data.
         """
-        # In a real scenario, we would calculate the timestamp for "last hour"
-        # one_hour_ago = (datetime.datetime.utcnow() - datetime.timedelta(hours=1)).isoformat()
-        # query = f"created:>{one_hour_ago} {query}"
+        swept_until = []
+        if scan_state is not None:
+            until = until or datetime.datetime.now(datetime.timezone.utc)
+            items = self.iter_search_results(
+                query or "", since or scan_state.since(), until, field="pushed",
+                oldest_first=True, on_window_done=swept_until.append,
+            )
+        elif since is not None:
+            items = self.iter_search_results(query or "", since, until or datetime.datetime.now(datetime.timezone.utc))
+        else:
+            query = query if query is not None else "created:>2023-01-01"
+            url = f"{self.api_url}/search/repositories?q={query}&sort=updated&order=desc&per_page={limit * 2}" # Fetch more to allow filtering
+            response = self.transport.get(url, headers=self.headers)
+            if response.status_code != 200:
+                self.logger.error(f"Error searching repos: {response.text}")
+                return []
+            items = response.json().get("items", [])
 
-        url = f"{self.api_url}/search/repositories?q={query}&sort=updated&order=desc&per_page={limit * 2}" # Fetch more to allow filtering
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            self.logger.error(f"Error searching repos: {response.text}")
-            return []
-
-        items = response.json().get("items", [])
         results = []
+        # pushed_at of repos this scan did not settle (errors, accepted repos)
+        unsettled = []
 
-        for repo in items:
-            # 1. Basic Validation (Cheap)
-            if not self.validate_repo_basic(repo):
-                continue
+        # 1. Basic Validation (Cheap); lazy, so a sweep is only read as far as needed
+        candidates = (repo for repo in items if self._is_candidate(repo, scan_state))
 
-            # 2. Enhanced Analysis (Expensive)
-            try:
-                insights = self.insights_collector.collect_insights(repo["full_name"])
-                classification = self.classifier.classify_repo(repo, insights)
+        # 2. Enhanced Analysis (Expensive)
+        # Candidates are analyzed in batches of "still needed" size so that
+        # their insight requests overlap instead of running one repo at a time,
+        # without spending quota on many more repos than the limit requires.
+        while len(results) < limit:
+            batch = list(islice(candidates, limit - len(results)))
+            if not batch:
+                break
+
+            for repo, outcome in zip(batch, self._collect_batch_insights(batch)):
+                if isinstance(outcome, Exception):
+                    self.logger.error(f"Error analyzing {repo['full_name']}: {outcome}")
+                    unsettled.append(repo.get("pushed_at"))
+                    continue
+
+                try:
+                    classification = self.classifier.classify_repo(repo, outcome)
+                except Exception as e:
+                    self.logger.error(f"Error analyzing {repo['full_name']}: {e}")
+                    unsettled.append(repo.get("pushed_at"))
+                    continue
 
                 if classification["is_real_project"]:
+                    unsettled.append(repo.get("pushed_at"))
                     # Merge data
                     enriched_repo = repo.copy()
-                    enriched_repo["insights"] = insights
+                    enriched_repo["insights"] = outcome
                     enriched_repo["analysis"] = classification
                     results.append(enriched_repo)
                     self.logger.info(f"✅ Accepted {repo['full_name']} (Score: {classification['score']})")
                 else:
                     self.logger.info(f"❌ Rejected {repo['full_name']} (Score: {classification['score']}). Reasons: {classification['reasons']}")
-            except Exception as e:
-                self.logger.error(f"Error analyzing {repo['full_name']}: {e}")
-                continue
+                    if scan_state is not None:
+                        scan_state.mark(repo)
 
-            if len(results) >= limit:
-                break
+                if len(results) >= limit:
+                    break
+
+        if scan_state is not None:
+            # Windows complete in order and every repo pulled from a completed
+            # window was analyzed; stop before the first one still unsettled
+            settled = swept_until
+            if unsettled:
+                first = _earliest(unsettled)
+                settled = [end for end in swept_until if first is not None and end < first]
+            if settled:
+                scan_state.advance(settled[-1])
+            try:
+                scan_state.save()
+            except Exception as e:
+                self.logger.error(f"Error saving scan state: {e}")
 
         return results
 
+    def _is_candidate(self, repo: Dict[str, Any], scan_state: Optional[ScanState]) -> bool:
+        """Cheap pre-insights filter: unchanged repos, then basic validation."""
+        if scan_state is not None:
+            if scan_state.is_unchanged(repo):
+                self.logger.debug(f"Skipping {repo['full_name']}: not pushed since last scan.")
+                return False
+            if not self.validate_repo_basic(repo):
+                scan_state.mark(repo)
+                return False
+            return True
+        return self.validate_repo_basic(repo)
+
+    def iter_search_results(
+        self,
+        query: str,
+        since: datetime.datetime,
+        until: datetime.datetime,
+        per_page: int = 100,
+        min_window: datetime.timedelta = datetime.timedelta(seconds=1),
+        field: str = "created",
+        oldest_first: bool = False,
+        on_window_done: Optional[Callable[[datetime.datetime], None]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every search result created between ``since`` and ``until``.
+
+        ``field`` selects the date qualifier the range applies to
+        (``created`` or ``pushed``). With ``oldest_first`` the windows are
+        walked in chronological order and ``on_window_done(end)`` is called
+        after the last result of each window was taken (never again once a
+        page failed, so every window up to ``end`` is known complete).
+
+        GitHub caps each search at 1000 results, so the ``created:`` range is
+        split into windows: a window reporting more than the cap is bisected
+        until each part fits (or is narrower than ``min_window``). Windows
+        are walked newest first, one page at a time, and results are
+        deduplicated by ``full_name`` (windows share their boundary second).
+        """
+        seen = set()
+        windows = [(since, until)]
+        failed = False
+
+        while windows:
+            start, end = windows.pop()
+            page = 1
+            complete = False
+            while True:
+                data = self._search_page(query, start, end, page, per_page, field)
+                if data is None:
+                    failed = True
+                    break
+
+                total = data.get("total_count", 0)
+                if page == 1 and total > self.SEARCH_RESULT_CAP and end - start > min_window:
+                    middle = start + (end - start) / 2
+                    # Stack: the newer half is processed first (the older with oldest_first)
+                    if oldest_first:
+                        windows.extend([(middle, end), (start, middle)])
+                    else:
+                        windows.extend([(start, middle), (middle, end)])
+                    self.logger.debug(f"Search window {start}..{end} has {total} results; bisecting")
+                    break
+
+                items = data.get("items", [])
+                for repo in items:
+                    if repo["full_name"] not in seen:
+                        seen.add(repo["full_name"])
+                        yield repo
+
+                if len(items) < per_page or page * per_page >= min(total, self.SEARCH_RESULT_CAP):
+                    complete = True
+                    break
+                page += 1
+
+            if complete and not failed and on_window_done is not None:
+                on_window_done(end)
+
+    def _search_page(
+        self,
+        query: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        page: int,
+        per_page: int,
+        field: str = "created",
+    ) -> Optional[Dict[str, Any]]:
+        """One page of a ``<field>:start..end`` search (None on error)."""
+        def fmt(moment):
+            return moment.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        q = f"{query} {field}:{fmt(start)}..{fmt(end)}".strip()
+        url = (
+            f"{self.api_url}/search/repositories?q={quote(q, safe=':.>=<')}"
+            f"&sort=updated&order=desc&per_page={per_page}&page={page}"
+        )
+        response = self.transport.get(url, headers=self.headers)
+        if response.status_code != 200:
+            self.logger.error(f"Error searching repos: {response.text}")
+            return None
+        return response.json()
+
+    def _collect_batch_insights(self, repos: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Collect insights for a batch of repos concurrently.
+
+        With the GraphQL backend the whole batch goes through one
+        ``collect_insights_many`` call (batched queries) instead of a query
+        per repo.
+
+        Returns one entry per repo, in order: the insights dict, or the
+        exception raised while collecting it.
+        """
+        if not repos:
+            return []
+
+        if self.insights_collector.backend == "graphql":
+            try:
+                insights = self.insights_collector.collect_insights_many([r["full_name"] for r in repos])
+            except Exception as e:
+                return [e] * len(repos)
+            return [insights[r["full_name"]] for r in repos]
+
+        def collect(repo):
+            try:
+                return self.insights_collector.collect_insights(repo["full_name"])
+            except Exception as e:
+                return e
+
+        if len(repos) == 1:
+            return [collect(repos[0])]
+
+        with ThreadPoolExecutor(max_workers=len(repos), thread_name_prefix="scan") as pool:
+            return list(pool.map(collect, repos))
+
     def validate_repo_basic(self, repo):
         """
         Performs cheap, basic validation to filter out obvious garbage.
@@ -110,7 +337,7 @@ class GitHubScanner:
     def _has_substantial_readme(self, repo_full_name):
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/readme"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 data = response.json()
                 # size is in bytes. Let's require at least 500 bytes of documentation.
@@ -123,7 +350,7 @@ class GitHubScanner:
         # Check for successful workflow runs in the last 24 hours
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/actions/runs?per_page=5&status=success"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 runs = response.json().get("workflow_runs", [])
                 return len(runs) > 0
@@ -135,7 +362,7 @@ class GitHubScanner:
         """Fetches the latest commit hash for the default branch."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/commits/HEAD"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 return response.json()["sha"]
             return None
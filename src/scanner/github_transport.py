@@ -0,0 +1,273 @@
+"""
+Shared HTTP transport for GitHub API clients.
+
+Every scanner component talks to api.github.com through one ``GitHubTransport``
+so requests reuse pooled keep-alive connections instead of paying a fresh
+TCP+TLS handshake per call. The transport also records per-endpoint latency
+and connection reuse counters.
+"""
+import re
+import time
+import logging
+import threading
+import importlib.util
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .rate_limiter import bucket_for
+except ImportError:
+    from src.scanner.rate_limiter import bucket_for
+
+logger = logging.getLogger(__name__)
+
+# Path prefixes whose variable segments are collapsed so stats group by endpoint.
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/users/[^/]+"), "/users/{user}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+]
+
+
+def endpoint_name(url: str) -> str:
+    """Normalize a request URL to an endpoint template (no query string)."""
+    path = urlsplit(url).path or "/"
+    for pattern, template in _ENDPOINT_PATTERNS:
+        path = pattern.sub(template, path, count=1)
+    path = re.sub(r"/issues/\d+", "/issues/{number}", path)
+    path = re.sub(r"/pulls/\d+", "/pulls/{number}", path)
+    path = re.sub(r"/commits/[0-9a-f]{7,40}$", "/commits/{sha}", path)
+    return path
+
+
+class GitHubTransport:
+    """
+    Pooled, keep-alive HTTP client shared by all GitHub API callers.
+
+    Uses a ``requests.Session`` with a sized connection pool (HTTP/1.1
+    keep-alive, gzip). When ``http2=True`` and ``httpx`` with ``h2`` is
+    installed, an HTTP/2 ``httpx.Client`` is used instead.
+
+    With a ``ResponseCache`` attached, GET requests are answered from the
+    cache while fresh and otherwise sent as conditional requests.
+
+    With a ``RateLimitScheduler`` attached, each request is sent with the
+    token the scheduler picks (replacing any ``Authorization`` credential),
+    rate-limit headers are fed back to it and rate-limited requests are
+    retried up to ``rate_limit_retries`` times.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        timeout: float = 30.0,
+        http2: bool = False,
+        cache=None,
+        rate_limiter=None,
+        rate_limit_retries: int = 3,
+    ):
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+        self._http_versions: Dict[str, int] = {}
+        self._client = None
+        self.http2 = False
+
+        if http2:
+            if importlib.util.find_spec("httpx") and importlib.util.find_spec("h2"):
+                import httpx
+                self._client = httpx.Client(
+                    http2=True,
+                    timeout=timeout,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                    headers={"Accept-Encoding": "gzip, deflate"},
+                )
+                self.http2 = True
+            else:
+                logger.info("HTTP/2 requested but httpx[http2] is not installed; using HTTP/1.1 keep-alive")
+
+        if self._client is None:
+            self._client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            self._client.mount("https://", adapter)
+            self._client.mount("http://", adapter)
+            self._client.headers.update({
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            })
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """Issue a GET request. Returns the response object."""
+        return self.request("GET", url, headers=headers, **kwargs)
+
+    def post(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """Issue a POST request. Returns the response object."""
+        return self.request("POST", url, headers=headers, **kwargs)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """Send a request through the shared pool, recording its latency."""
+        cache = self.cache if method == "GET" else None
+        entry = None
+        if cache is not None:
+            # Entries are per caller credential (a token pool counts as one)
+            request_headers = headers
+            entry = cache.lookup(url, request_headers)
+            if entry and cache.is_fresh(entry):
+                return cache.serve(url, entry, headers=request_headers)
+            validators = cache.conditional_headers(entry)
+            if validators:
+                headers = {**(headers or {}), **validators}
+
+        response = self._send_scheduled(method, url, headers, **kwargs)
+
+        if cache is not None:
+            if response.status_code == 304 and entry:
+                return cache.serve(url, entry, revalidated=True, headers=request_headers, not_modified=response)
+            cache.store(url, response, request_headers)
+
+        return response
+
+    def _send_scheduled(self, method: str, url: str, headers: Optional[Dict[str, str]], **kwargs):
+        """Send through the rate-limit scheduler, if one is attached."""
+        limiter = self.rate_limiter
+        if limiter is None:
+            return self._send(method, url, headers, **kwargs)
+
+        bucket = bucket_for(url)
+        scheme = ((headers or {}).get("Authorization") or "token ").split(" ", 1)[0]
+        for _ in range(self.rate_limit_retries + 1):
+            token = limiter.acquire(bucket)
+            response = self._send(method, url, {**(headers or {}), "Authorization": f"{scheme} {token}"}, **kwargs)
+            if response.status_code == 304:
+                # Conditional requests answered from GitHub's cache are free
+                limiter.refund(token, bucket)
+            limiter.update(token, bucket, response.headers)
+            if not limiter.is_rate_limited(token, bucket, response):
+                break
+        return response
+
+    def _send(self, method: str, url: str, headers: Optional[Dict[str, str]], **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.perf_counter()
+        failed = False
+        try:
+            response = self._client.request(method, url, headers=headers, **kwargs)
+            return response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(url, time.perf_counter() - started, failed,
+                         None if failed else getattr(response, "http_version", None))
+
+    def _record(self, url: str, elapsed: float, failed: bool, http_version: Optional[str]):
+        endpoint = endpoint_name(url)
+        with self._lock:
+            entry = self._endpoints.setdefault(
+                endpoint, {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["count"] += 1
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            if failed:
+                entry["errors"] += 1
+            if http_version:
+                self._http_versions[http_version] = self._http_versions.get(http_version, 0) + 1
+
+    def _connection_counters(self) -> Dict[str, int]:
+        """Read connection/request counters from the urllib3 pools."""
+        opened = 0
+        sent = 0
+        if isinstance(self._client, requests.Session):
+            seen = set()
+            for adapter in self._client.adapters.values():
+                if id(adapter) in seen:
+                    continue
+                seen.add(id(adapter))
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    opened += getattr(pool, "num_connections", 0)
+                    sent += getattr(pool, "num_requests", 0)
+        return {"opened": opened, "requests": sent, "reused": max(0, sent - opened)}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of transport metrics.
+
+        Returns:
+            Dict with per-endpoint latency (count, errors, avg/max ms) and
+            connection counters (opened, requests, reused). Connection
+            counters are only tracked for the HTTP/1.1 pool.
+        """
+        with self._lock:
+            endpoints = {
+                name: {
+                    "count": int(entry["count"]),
+                    "errors": int(entry["errors"]),
+                    "avg_ms": round(entry["total_seconds"] / entry["count"] * 1000, 2) if entry["count"] else 0.0,
+                    "max_ms": round(entry["max_seconds"] * 1000, 2),
+                }
+                for name, entry in sorted(self._endpoints.items())
+            }
+            http_versions = dict(self._http_versions)
+
+        return {
+            "http2": self.http2,
+            "endpoints": endpoints,
+            "connections": self._connection_counters(),
+            "http_versions": http_versions,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "rate_limits": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+        }
+
+    def log_stats(self):
+        """Log a one-line summary per endpoint."""
+        stats = self.stats()
+        conns = stats["connections"]
+        logger.info(
+            f"GitHub transport: {conns['requests']} requests over {conns['opened']} connections "
+            f"({conns['reused']} reused)"
+        )
+        if stats["cache"]:
+            cache = stats["cache"]
+            logger.info(
+                f"  cache: {cache['fresh_hits']} fresh hits, {cache['revalidated']} revalidated (304), "
+                f"{cache['misses']} misses, {cache['entries']} entries"
+            )
+        if stats["rate_limits"]:
+            limits = stats["rate_limits"]
+            logger.info(
+                f"  rate limits: {limits['tokens']} tokens, {limits['waits']} waits "
+                f"({limits['waited_seconds']:.1f}s), {limits['secondary_limits']} secondary limits"
+            )
+        for name, entry in stats["endpoints"].items():
+            logger.info(f"  {name}: {entry['count']} calls, avg {entry['avg_ms']}ms, max {entry['max_ms']}ms, {entry['errors']} errors")
+
+    def close(self):
+        """Close pooled connections and the response cache."""
+        self._client.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_default_transport: Optional[GitHubTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> GitHubTransport:
+    """Process-wide transport used when a client is not given one explicitly."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = GitHubTransport()
+        return _default_transport
@@ -0,0 +1,367 @@
+"""
+GraphQL backend for repository insights and hidden-gem analysis.
+
+One GraphQL request fetches everything a repository needs (several repos per
+request via aliases), replacing the REST fan-out in ``InsightsCollector`` and
+the PyGithub calls made by ``GemAnalyzer``. Results are mapped back to the
+same shapes the REST code produces, so ``RepoClassifier`` and the scoring
+code do not change.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, List, Iterable
+
+try:
+    from .github_transport import GitHubTransport, get_default_transport
+except ImportError:
+    from src.scanner.github_transport import GitHubTransport, get_default_transport
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Candidate README file names, checked in order (GitHub's README lookup order)
+README_NAMES = ["README.md", "readme.md", "Readme.md", "README.rst", "README.txt", "README"]
+
+_COMMUNITY_FILES = """
+    rootTree: object(expression: "HEAD:") { ... on Tree { entries { name type } } }
+    githubTree: object(expression: "HEAD:.github") { ... on Tree { entries { name type } } }
+    docsTree: object(expression: "HEAD:docs") { ... on Tree { entries { name type } } }
+    codeOfConduct { name }
+    issueTemplates { name }
+    pullRequestTemplates { filename }
+"""
+
+INSIGHTS_FIELDS = """
+    nameWithOwner
+    description
+    licenseInfo { name }
+    openIssues: issues(states: OPEN) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    closedPullRequests: pullRequests(states: [CLOSED, MERGED], first: 100, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { merged }
+    }
+    defaultBranchRef {
+        target {
+            ... on Commit {
+                committedDate
+                recentHistory: history(since: $since) { totalCount }
+            }
+        }
+    }
+""" + _COMMUNITY_FILES
+
+ANALYSIS_FIELDS = """
+    nameWithOwner
+    name
+    description
+    url
+    homepageUrl
+    hasWikiEnabled
+    stargazerCount
+    forkCount
+    createdAt
+    updatedAt
+    pushedAt
+    owner { login }
+    primaryLanguage { name }
+    licenseInfo { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    openIssueCount: issues(states: OPEN) { totalCount }
+    openPullRequestCount: pullRequests(states: OPEN) { totalCount }
+    defaultBranchRef {
+        target {
+            ... on Commit {
+                history(first: 50) {
+                    nodes { oid message author { name date } }
+                }
+            }
+        }
+    }
+    closedIssues: issues(states: CLOSED, first: 30, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { number createdAt comments(first: 1) { totalCount nodes { createdAt } } }
+    }
+    openIssues: issues(states: OPEN, first: 20, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { number createdAt comments { totalCount } }
+    }
+    recentPullRequests: pullRequests(first: 20, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { merged author { login } }
+    }
+    releases(first: 10, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { tagName createdAt }
+    }
+    workflowsTree: object(expression: "HEAD:.github/workflows") { ... on Tree { entries { name type } } }
+""" + _COMMUNITY_FILES + "\n".join(
+    f'    readme{i}: object(expression: "HEAD:{name}") {{ ... on Blob {{ text byteSize }} }}'
+    for i, name in enumerate(README_NAMES)
+)
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL request fails as a whole."""
+
+
+class GraphQLObjectMissing(Exception):
+    """Raised by ``GraphQLRepo`` for resources that do not exist (REST 404 equivalent)."""
+
+
+def _parse_dt(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _tree_entries(tree: Optional[Dict]) -> Optional[List[Dict[str, str]]]:
+    if not tree or "entries" not in tree:
+        return None
+    return tree["entries"]
+
+
+class GraphQLBackend:
+    """
+    Batched GitHub GraphQL client.
+
+    Args:
+        token: GitHub token.
+        transport: Shared HTTP transport (defaults to the process-wide one).
+        batch_size: Repositories fetched per GraphQL request.
+    """
+
+    def __init__(self, token: str, transport: Optional[GitHubTransport] = None, batch_size: int = 10):
+        self.token = token
+        self.transport = transport or get_default_transport()
+        self.batch_size = max(1, batch_size)
+        self.headers = {"Authorization": f"bearer {token}"}
+        self._repo_cache: Dict[str, "GraphQLRepo"] = {}
+
+    def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query and return its ``data``. Partial errors are logged."""
+        response = self.transport.post(
+            GRAPHQL_URL,
+            headers=self.headers,
+            json={"query": query, "variables": variables or {}},
+        )
+        if response.status_code != 200:
+            raise GraphQLError(f"GraphQL request failed ({response.status_code}): {response.text[:200]}")
+
+        payload = response.json()
+        for error in payload.get("errors") or []:
+            logger.warning(f"GraphQL error: {error.get('message')}")
+        if payload.get("data") is None:
+            raise GraphQLError("GraphQL response contained no data")
+        return payload["data"]
+
+    def _fetch(self, names: Iterable[str], fields: str, variables: Dict[str, Any], declarations: str) -> Dict[str, Optional[Dict]]:
+        """Fetch ``fields`` for each repo, ``batch_size`` repos per request."""
+        names = list(dict.fromkeys(names))
+        results: Dict[str, Optional[Dict]] = {}
+
+        for start in range(0, len(names), self.batch_size):
+            batch = names[start:start + self.batch_size]
+            aliases = []
+            for i, full_name in enumerate(batch):
+                owner, _, name = full_name.partition("/")
+                aliases.append(
+                    f"r{i}: repository(owner: {_quote(owner)}, name: {_quote(name)}) {{ {fields} }}"
+                )
+            query = f"query{declarations} {{\n" + "\n".join(aliases) + "\n}"
+
+            try:
+                data = self.execute(query, variables)
+            except Exception as e:
+                logger.error(f"GraphQL batch failed for {', '.join(batch)}: {e}")
+                data = {}
+
+            for i, full_name in enumerate(batch):
+                results[full_name] = data.get(f"r{i}")
+
+        return results
+
+    def fetch_insights_nodes(self, names: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Raw insight nodes per repo (None when the repo could not be fetched)."""
+        since = (datetime.now(timezone.utc) - timedelta(weeks=4)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return self._fetch(names, INSIGHTS_FIELDS, {"since": since}, "($since: GitTimestamp!)")
+
+    def fetch_repos(self, names: Iterable[str]) -> Dict[str, Optional["GraphQLRepo"]]:
+        """
+        Fetch analysis snapshots for several repos in batched requests.
+
+        Results are kept so a later ``get_repo`` for the same name is free.
+        """
+        missing = [n for n in dict.fromkeys(names) if n not in self._repo_cache]
+        for full_name, node in self._fetch(missing, ANALYSIS_FIELDS, {}, "").items():
+            if node is not None:
+                self._repo_cache[full_name] = GraphQLRepo(node)
+        return {name: self._repo_cache.get(name) for name in names}
+
+    def get_repo(self, full_name: str) -> "GraphQLRepo":
+        """PyGithub-style accessor used by ``GemAnalyzer``."""
+        repo = self.fetch_repos([full_name]).get(full_name)
+        if repo is None:
+            raise GraphQLObjectMissing(f"Repository {full_name} not found")
+        return repo
+
+    def forget(self, full_name: str):
+        """Drop a cached snapshot."""
+        self._repo_cache.pop(full_name, None)
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def insights_from_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map an ``INSIGHTS_FIELDS`` node to ``InsightsCollector`` metrics.
+
+    Contributor metrics are not available over GraphQL and are left out;
+    callers fill them via REST.
+    """
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+
+    recent_commits = (target.get("recentHistory") or {}).get("totalCount", 0)
+    commit_score = round(min(recent_commits / 2, 10.0), 1)
+
+    prs = (node.get("closedPullRequests") or {}).get("nodes") or []
+    pr_merge_ratio = round(sum(1 for pr in prs if pr.get("merged")) / len(prs), 2) if prs else 0.0
+
+    open_issues = (
+        (node.get("openIssues") or {}).get("totalCount", 0)
+        + (node.get("openPullRequests") or {}).get("totalCount", 0)
+    )
+
+    return {
+        "commit_frequency_score": commit_score,
+        "health_percentage": community_health(node),
+        "pr_merge_ratio": pr_merge_ratio,
+        "last_commit_date": target.get("committedDate") or "",
+        "open_issues_count": open_issues,
+    }
+
+
+def community_health(node: Dict[str, Any]) -> int:
+    """
+    Approximate GitHub's community profile ``health_percentage``.
+
+    Uses the same checklist (description, README, license, code of conduct,
+    contributing guide, issue and PR templates), evaluated from data in the
+    GraphQL node.
+    """
+    def names(tree_key):
+        return {e["name"].lower() for e in _tree_entries(node.get(tree_key)) or []}
+
+    root, github, docs = names("rootTree"), names("githubTree"), names("docsTree")
+    all_files = root | github | docs
+
+    checks = [
+        bool(node.get("description")),
+        any(name.startswith("readme") for name in root | github | docs),
+        bool(node.get("licenseInfo")),
+        bool(node.get("codeOfConduct")) or any(name.startswith("code_of_conduct") for name in all_files),
+        any(name.startswith("contributing") for name in all_files),
+        bool(node.get("issueTemplates")) or "issue_template" in github or "issue_template.md" in all_files,
+        bool(node.get("pullRequestTemplates")) or "pull_request_template.md" in all_files,
+    ]
+    return round(sum(checks) / len(checks) * 100)
+
+
+class _ContentEntry:
+    """Directory entry with the attributes of PyGithub's ``ContentFile``."""
+
+    def __init__(self, entry: Dict[str, str]):
+        self.name = entry["name"]
+        self.type = "dir" if entry.get("type") == "tree" else "file"
+
+
+class GraphQLRepo:
+    """
+    Read-only repository snapshot built from one ``ANALYSIS_FIELDS`` node.
+
+    Exposes the subset of PyGithub's ``Repository`` API used by
+    ``GemAnalyzer`` so its scoring code runs unchanged on GraphQL data.
+    """
+
+    def __init__(self, node: Dict[str, Any]):
+        self._node = node
+        self.full_name = node["nameWithOwner"]
+        self.name = node.get("name") or self.full_name.split("/")[-1]
+        self.description = node.get("description")
+        self.html_url = node.get("url")
+        self.homepage = node.get("homepageUrl")
+        self.has_wiki = node.get("hasWikiEnabled", False)
+        self.stargazers_count = node.get("stargazerCount", 0)
+        self.forks_count = node.get("forkCount", 0)
+        self.language = (node.get("primaryLanguage") or {}).get("name")
+        self.created_at = _parse_dt(node.get("createdAt"))
+        self.updated_at = _parse_dt(node.get("updatedAt"))
+        self.pushed_at = _parse_dt(node.get("pushedAt"))
+        self.owner = SimpleNamespace(login=(node.get("owner") or {}).get("login", ""))
+        license_info = node.get("licenseInfo")
+        self.license = SimpleNamespace(name=license_info["name"]) if license_info else None
+        # REST's open_issues_count includes open pull requests
+        self.open_issues_count = (
+            (node.get("openIssueCount") or {}).get("totalCount", 0)
+            + (node.get("openPullRequestCount") or {}).get("totalCount", 0)
+        )
+
+    def get_topics(self) -> List[str]:
+        return [n["topic"]["name"] for n in (self._node.get("repositoryTopics") or {}).get("nodes") or []]
+
+    def get_commits(self) -> List[SimpleNamespace]:
+        target = (self._node.get("defaultBranchRef") or {}).get("target") or {}
+        commits = []
+        for c in (target.get("history") or {}).get("nodes") or []:
+            author = c.get("author") or {}
+            commits.append(SimpleNamespace(
+                sha=c.get("oid"),
+                commit=SimpleNamespace(
+                    message=c.get("message") or "",
+                    author=SimpleNamespace(name=author.get("name"), date=_parse_dt(author.get("date"))),
+                ),
+            ))
+        return commits
+
+    def get_readme(self) -> SimpleNamespace:
+        for i in range(len(README_NAMES)):
+            blob = self._node.get(f"readme{i}")
+            if blob and blob.get("text") is not None:
+                return SimpleNamespace(decoded_content=blob["text"].encode("utf-8"), size=blob.get("byteSize", 0))
+        raise GraphQLObjectMissing(f"No README in {self.full_name}")
+
+    def get_contents(self, path: str) -> List[_ContentEntry]:
+        trees = {"": "rootTree", ".github": "githubTree", ".github/workflows": "workflowsTree", "docs": "docsTree"}
+        key = trees.get(path.strip("/"))
+        entries = _tree_entries(self._node.get(key)) if key else None
+        if entries is None:
+            raise GraphQLObjectMissing(f"{path!r} not available for {self.full_name}")
+        return [_ContentEntry(e) for e in entries]
+
+    def get_issues(self, state: str = "open") -> List[SimpleNamespace]:
+        key = "closedIssues" if state == "closed" else "openIssues"
+        issues = []
+        for i in (self._node.get(key) or {}).get("nodes") or []:
+            comments = i.get("comments") or {}
+            first = [SimpleNamespace(created_at=_parse_dt(c["createdAt"])) for c in comments.get("nodes") or []]
+            issues.append(SimpleNamespace(
+                number=i.get("number"),
+                created_at=_parse_dt(i.get("createdAt")),
+                comments=comments.get("totalCount", 0),
+                get_comments=(lambda first=first: first),
+            ))
+        return issues
+
+    def get_pulls(self, state: str = "open") -> List[SimpleNamespace]:
+        pulls = []
+        for pr in (self._node.get("recentPullRequests") or {}).get("nodes") or []:
+            pulls.append(SimpleNamespace(
+                merged=bool(pr.get("merged")),
+                user=SimpleNamespace(login=(pr.get("author") or {}).get("login", "ghost")),
+            ))
+        return pulls
+
+    def get_releases(self) -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(tag_name=r.get("tagName"), created_at=_parse_dt(r.get("createdAt")))
+            for r in (self._node.get("releases") or {}).get("nodes") or []
+        ]
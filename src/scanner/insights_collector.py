@@ -1,13 +1,51 @@
-import requests
 import logging
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterable
+
+try:
+    from .github_transport import GitHubTransport, get_default_transport
+    from .graphql_backend import GraphQLBackend, insights_from_node
+except ImportError:
+    from src.scanner.github_transport import GitHubTransport, get_default_transport
+    from src.scanner.graphql_backend import GraphQLBackend, insights_from_node
 
 class InsightsCollector:
     """
     Collects advanced metrics and insights from GitHub repositories.
+
+    The individual metrics are independent REST calls, so they are issued
+    concurrently on a shared thread pool. ``max_workers`` caps the number of
+    in-flight requests across every repository handled by this collector.
+
+    With ``backend="graphql"`` every metric except the contributor ones is
+    read from a single batched GraphQL query (several repos per request);
+    contributors are not exposed over GraphQL and still come from REST.
+    Repos the GraphQL query cannot return fall back to the REST getters.
     """
 
-    def __init__(self, token: str):
+    # insight key -> collector method
+    METRICS = {
+        "contributors_count": "_get_contributors_count",
+        "commit_frequency_score": "_get_commit_activity",
+        "health_percentage": "_get_community_health",
+        "pr_merge_ratio": "_get_pr_merge_ratio",
+        "top_contributors": "_get_top_contributors",
+        "last_commit_date": "_get_last_commit_date",
+        "open_issues_count": "_get_open_issues_count",
+    }
+
+    # Metrics with no GraphQL equivalent
+    REST_ONLY_METRICS = ("contributors_count", "top_contributors")
+
+    def __init__(
+        self,
+        token: str,
+        max_workers: int = 8,
+        transport: Optional[GitHubTransport] = None,
+        backend: str = "rest",
+        graphql_batch_size: int = 10,
+    ):
         self.token = token
         self.headers = {
             "Authorization": f"token {self.token}",
@@ -15,25 +53,116 @@ class InsightsCollector:
         }
         self.api_url = "https://api.github.com"
         self.logger = logging.getLogger(__name__)
+        self.transport = transport or get_default_transport()
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        if backend not in ("rest", "graphql"):
+            raise ValueError(f"Unknown insights backend: {backend}")
+        self.backend = backend
+        self.graphql = (
+            GraphQLBackend(token, transport=self.transport, batch_size=graphql_batch_size)
+            if backend == "graphql" else None
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the pool shared by all metric requests."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="insights"
+                )
+            return self._executor
+
+    def close(self):
+        """Shut down the request pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
 
     def collect_insights(self, repo_full_name: str) -> Dict[str, Any]:
         """
         Collects comprehensive insights for a repository.
+
+        All metric requests are issued concurrently; the call returns once
+        every metric has completed.
         """
+        if self.graphql is not None:
+            return self.collect_insights_many([repo_full_name])[repo_full_name]
+
         self.logger.info(f"Collecting insights for {repo_full_name}")
 
-        insights = {
-            "contributors_count": self._get_contributors_count(repo_full_name),
-            "commit_frequency_score": self._get_commit_activity(repo_full_name),
-            "health_percentage": self._get_community_health(repo_full_name),
-            "pr_merge_ratio": self._get_pr_merge_ratio(repo_full_name),
-            "top_contributors": self._get_top_contributors(repo_full_name),
-            "last_commit_date": self._get_last_commit_date(repo_full_name),
-            "open_issues_count": self._get_open_issues_count(repo_full_name)
+        executor = self._get_executor()
+        futures = {
+            key: executor.submit(getattr(self, method), repo_full_name)
+            for key, method in self.METRICS.items()
         }
 
+        # Each getter handles its own errors and returns a default value.
+        insights = {key: future.result() for key, future in futures.items()}
+
         return insights
 
+    def collect_insights_many(
+        self,
+        repo_full_names: Iterable[str],
+        max_repos_in_flight: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect insights for several repositories concurrently.
+
+        Args:
+            repo_full_names: Repositories to inspect (e.g. "owner/repo").
+            max_repos_in_flight: How many repositories are processed at once.
+                Defaults to ``max_workers``. The total number of concurrent
+                HTTP requests is always bounded by ``max_workers``.
+
+        Returns:
+            Mapping of repository name to its insights dict, in input order.
+        """
+        names = list(dict.fromkeys(repo_full_names))
+        if not names:
+            return {}
+
+        if self.graphql is not None:
+            return self._collect_graphql_many(names)
+
+        repo_workers = max(1, min(max_repos_in_flight or self.max_workers, len(names)))
+        with ThreadPoolExecutor(max_workers=repo_workers, thread_name_prefix="insights-repo") as pool:
+            results = list(pool.map(self.collect_insights, names))
+
+        return dict(zip(names, results))
+
+    def _collect_graphql_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """GraphQL path: one batched query per ``graphql.batch_size`` repos plus REST contributor calls."""
+        self.logger.info(f"Collecting insights for {len(names)} repos via GraphQL")
+        nodes = self.graphql.fetch_insights_nodes(names)
+
+        executor = self._get_executor()
+        futures = {}
+        for name in names:
+            node = nodes.get(name)
+            metrics = self.METRICS if node is None else {
+                key: self.METRICS[key] for key in self.REST_ONLY_METRICS
+            }
+            if node is None:
+                self.logger.warning(f"GraphQL returned no data for {name}; using REST")
+            futures[name] = {
+                key: executor.submit(getattr(self, method), name) for key, method in metrics.items()
+            }
+
+        results = {}
+        for name in names:
+            node = nodes.get(name)
+            insights = insights_from_node(node) if node is not None else {}
+            insights.update({key: future.result() for key, future in futures[name].items()})
+            # Keep the REST key order
+            results[name] = {key: insights[key] for key in self.METRICS}
+
+        return results
+
     def _get_contributors_count(self, repo_full_name: str) -> int:
         """Get the number of contributors (capped at 100 per page usually)."""
         try:
@@ -42,7 +171,7 @@ class InsightsCollector:
             # For efficiency, we can just check page 1 size or use the Link header.
             # GitHub API doesn't give total count directly in body.
             # Faster way: check page 1.
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 # Check Link header for last page
                 if "Link" in response.headers:
@@ -66,7 +195,7 @@ class InsightsCollector:
         """
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/stats/participation"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 data = response.json()
                 if "all" in data:
@@ -83,7 +212,7 @@ class InsightsCollector:
         """Get community profile health percentage."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/community/profile"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 data = response.json()
                 return data.get("health_percentage", 0)
@@ -98,7 +227,7 @@ class InsightsCollector:
         try:
             # We want closed PRs
             url = f"{self.api_url}/repos/{repo_full_name}/pulls?state=closed&per_page=100"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 prs = response.json()
                 if not prs:
@@ -116,7 +245,7 @@ class InsightsCollector:
         """Get top 5 contributors with their commit counts."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/contributors?per_page=5"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 contributors = []
                 for contrib in response.json():
@@ -136,7 +265,7 @@ class InsightsCollector:
         """Get the date of the last commit."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/commits/HEAD"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 commit = response.json()
                 # Return ISO format date
@@ -150,7 +279,7 @@ class InsightsCollector:
         """Get the number of open issues."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}"
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers)
             if response.status_code == 200:
                 return response.json().get("open_issues_count", 0)
             return 0
@@ -0,0 +1,285 @@
+"""
+Rate-limit-aware scheduling across a pool of GitHub tokens.
+
+GitHub meters each token separately per resource bucket (``core``,
+``search``, ``graphql``) and reports the budget in ``X-RateLimit-*`` response
+headers. ``RateLimitScheduler`` tracks those budgets, hands out the token
+with the most headroom for each request, slows down as a bucket nears
+exhaustion and waits out secondary rate limits (``403``/``429`` with
+``Retry-After``) instead of failing the scan.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Tuple, Callable
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# GitHub asks clients to wait at least a minute after a secondary limit without Retry-After
+SECONDARY_LIMIT_BACKOFF = 60.0
+
+# Documented per-token limits, used until the first response reports the real ones
+DEFAULT_LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+
+
+def bucket_for(url: str) -> str:
+    """Rate-limit bucket a request URL is charged to."""
+    path = urlsplit(url).path
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def tokens_from_env() -> List[str]:
+    """
+    Tokens configured in the environment.
+
+    ``GITHUB_TOKENS`` (comma separated) is read first, then ``GITHUB_TOKEN``
+    and ``GH_PAT``. Duplicates are dropped.
+    """
+    tokens = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",")]
+    tokens += [os.getenv("GITHUB_TOKEN", ""), os.getenv("GH_PAT", "")]
+    return list(dict.fromkeys(t for t in tokens if t))
+
+
+class _Budget:
+    """Known budget of one (token, bucket) pair."""
+
+    __slots__ = ("limit", "remaining", "reset_at", "blocked_until", "next_at")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.next_at = 0.0
+
+
+class RateLimitScheduler:
+    """
+    Chooses a token per request and paces requests to stay within budget.
+
+    Args:
+        tokens: GitHub tokens to spread work across.
+        reserve: Requests left untouched in each bucket (for manual use).
+        pace_below: Fraction of the limit below which requests are spaced
+            evenly over the time left until the reset.
+        clock / sleep: Injectable for tests.
+    """
+
+    def __init__(
+        self,
+        tokens: List[str],
+        reserve: int = 2,
+        pace_below: float = 0.2,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if not tokens:
+            raise ValueError("RateLimitScheduler needs at least one token")
+        self.tokens = list(dict.fromkeys(tokens))
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets: Dict[Tuple[str, str], _Budget] = {}
+        self._counters = {"requests": 0, "waits": 0, "waited_seconds": 0.0, "secondary_limits": 0}
+
+    @classmethod
+    def from_env(cls, **kwargs) -> Optional["RateLimitScheduler"]:
+        """Scheduler over the tokens found in the environment (None if there are none)."""
+        tokens = tokens_from_env()
+        return cls(tokens, **kwargs) if tokens else None
+
+    def _budget(self, token: str, bucket: str) -> _Budget:
+        key = (token, bucket)
+        if key not in self._budgets:
+            self._budgets[key] = _Budget(DEFAULT_LIMITS.get(bucket, DEFAULT_LIMITS["core"]))
+        return self._budgets[key]
+
+    def acquire(self, bucket: str = "core") -> str:
+        """
+        Reserve one request in ``bucket`` and return the token to use.
+
+        Blocks while every token is exhausted, rate limited or being paced.
+        """
+        while True:
+            with self._lock:
+                token, wait = self._choose(bucket)
+                if token is not None:
+                    self._counters["requests"] += 1
+                    return token
+                self._counters["waits"] += 1
+                self._counters["waited_seconds"] += wait
+
+            logger.info(f"GitHub {bucket} budget exhausted on all tokens; waiting {wait:.1f}s")
+            self._sleep(wait)
+
+    def _choose(self, bucket: str) -> Tuple[Optional[str], float]:
+        """Pick the token with the most headroom, or report how long to wait. Caller holds the lock."""
+        now = self._clock()
+        best, best_remaining = None, -1
+        earliest = None
+
+        for token in self.tokens:
+            budget = self._budget(token, bucket)
+            if budget.reset_at and now >= budget.reset_at:
+                budget.remaining = budget.limit
+                budget.reset_at = 0.0
+
+            ready_at = max(budget.blocked_until, budget.next_at)
+            if budget.remaining <= self.reserve:
+                ready_at = max(ready_at, budget.reset_at or now + SECONDARY_LIMIT_BACKOFF)
+
+            if ready_at > now:
+                earliest = ready_at if earliest is None else min(earliest, ready_at)
+                continue
+            if budget.remaining > best_remaining:
+                best, best_remaining = token, budget.remaining
+
+        if best is None:
+            return None, max(0.05, (earliest or now + 1) - now)
+
+        budget = self._budget(best, bucket)
+        # Count the request now so concurrent callers see the reduced budget
+        budget.remaining -= 1
+        if budget.reset_at and budget.remaining < budget.limit * self.pace_below:
+            usable = max(1, budget.remaining - self.reserve)
+            budget.next_at = now + max(0.0, budget.reset_at - now) / usable
+        return best, 0.0
+
+    def update(self, token: str, bucket: str, headers) -> None:
+        """Record the budget reported by a response's ``X-RateLimit-*`` headers."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        bucket = headers.get("X-RateLimit-Resource", bucket) or bucket
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            limit = int(headers.get("X-RateLimit-Limit", 0))
+            reset_at = float(headers.get("X-RateLimit-Reset", 0))
+        except (TypeError, ValueError):
+            return
+        self.observe(token, bucket, remaining, limit, reset_at)
+
+    def refund(self, token: str, bucket: str) -> None:
+        """
+        Give back a request reserved by ``acquire`` that GitHub did not charge
+        (a ``304 Not Modified`` to a conditional request).
+
+        Call before ``update`` so the server's unchanged figure is not
+        mistaken for a spent request.
+        """
+        with self._lock:
+            budget = self._budget(token, bucket)
+            budget.remaining = min(budget.limit, budget.remaining + 1)
+
+    def observe(self, token: str, bucket: str, remaining: int, limit: int, reset_at: float) -> None:
+        """Record a known budget (from headers or a client's own bookkeeping)."""
+        with self._lock:
+            budget = self._budget(token, bucket)
+            if limit > 0:
+                budget.limit = limit
+            if reset_at and reset_at != budget.reset_at:
+                # A new window: trust the server's figure
+                budget.remaining = remaining
+            else:
+                # In-flight requests may already be counted locally
+                budget.remaining = min(budget.remaining, remaining)
+            budget.reset_at = reset_at
+
+    def is_rate_limited(self, token: str, bucket: str, response) -> bool:
+        """
+        Whether ``response`` is a rate-limit rejection; if so the token is
+        blocked until it may be retried.
+        """
+        if response.status_code not in (403, 429):
+            return False
+
+        headers = response.headers
+        retry_after = headers.get("Retry-After")
+        exhausted = headers.get("X-RateLimit-Remaining") == "0"
+        if retry_after is None and not exhausted:
+            # A plain 403 (permissions, blocked repo) is not a rate limit,
+            # unless GitHub says so in the body.
+            text = getattr(response, "text", "") or ""
+            if "secondary rate limit" not in text.lower() and response.status_code != 429:
+                return False
+
+        now = self._clock()
+        with self._lock:
+            budget = self._budget(token, bucket)
+            if retry_after is not None:
+                try:
+                    budget.blocked_until = now + float(retry_after)
+                except ValueError:
+                    budget.blocked_until = now + SECONDARY_LIMIT_BACKOFF
+                self._counters["secondary_limits"] += 1
+            elif exhausted:
+                budget.remaining = 0
+                reset_at = float(headers.get("X-RateLimit-Reset", 0) or 0)
+                budget.reset_at = reset_at or now + SECONDARY_LIMIT_BACKOFF
+            else:
+                budget.blocked_until = now + SECONDARY_LIMIT_BACKOFF
+                self._counters["secondary_limits"] += 1
+        logger.warning(f"GitHub {bucket} rate limit hit (status {response.status_code}); token paused")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduler counters and the known budget per token (tokens are masked)."""
+        with self._lock:
+            budgets = {
+                f"{token[:4]}…/{bucket}": {
+                    "remaining": budget.remaining,
+                    "limit": budget.limit,
+                    "reset_at": budget.reset_at,
+                }
+                for (token, bucket), budget in sorted(self._budgets.items())
+            }
+            return {**self._counters, "tokens": len(self.tokens), "budgets": budgets}
+
+
+class PooledGithub:
+    """
+    PyGithub front end that picks a token from the pool per repository.
+
+    Only the repo lookup (``get_repo`` / ``client``) goes through
+    ``scheduler.acquire``. Each token gets its own ``Github`` client, and the
+    repository object returned keeps using that client directly: its later
+    calls (contents, commits, issues, stats) are neither paced nor moved to
+    another token, and count against the scheduler's budget only when
+    ``_sync`` reads PyGithub's figures before the next lookup. Work is
+    therefore balanced per repository, not per request.
+    """
+
+    def __init__(self, scheduler: RateLimitScheduler, **github_kwargs):
+        from github import Github, Auth
+
+        self.scheduler = scheduler
+        self._clients = {
+            token: Github(auth=Auth.Token(token), **github_kwargs) for token in scheduler.tokens
+        }
+        self._used = set()
+
+    def _sync(self):
+        # Only clients that have made a request: reading an unknown budget
+        # makes PyGithub call /rate_limit.
+        for token in list(self._used):
+            client = self._clients[token]
+            remaining, limit = client.rate_limiting
+            if limit > 0:
+                self.scheduler.observe(token, "core", remaining, limit, float(client.rate_limiting_resettime))
+
+    def client(self):
+        """The ``Github`` client with the most core budget left."""
+        self._sync()
+        token = self.scheduler.acquire("core")
+        self._used.add(token)
+        return self._clients[token]
+
+    def get_repo(self, full_name_or_id, lazy: bool = False):
+        return self.client().get_repo(full_name_or_id, lazy=lazy)
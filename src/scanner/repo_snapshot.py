@@ -0,0 +1,133 @@
+"""
+Per-repository snapshot that fetches each GitHub resource at most once.
+
+Analysis steps (``GemAnalyzer._analyze_*``, ``has_red_flags``, the AI
+reviewers, blog generation) each ask the repository for the same root tree,
+README and commit list. Wrapping the repository in a ``RepoSnapshot`` makes
+the first call fetch and every later call reuse the result.
+"""
+import threading
+from typing import Any, Dict, Iterator, Tuple
+
+from github.PaginatedList import PaginatedList
+
+
+class RepoSnapshot:
+    """
+    Memoizing proxy around a PyGithub ``Repository`` (or ``GraphQLRepo``).
+
+    The ``get_*`` methods in ``MEMOIZED`` are cached per argument tuple,
+    including the exception a call raised (a missing README stays missing).
+    Paginated results are cached as the ``PaginatedList`` itself, which keeps
+    already-fetched pages, so ``get_commits()[:50]`` followed by
+    ``get_commits()[:10]`` costs one page. Other attributes pass through.
+
+    Safe to share between threads: concurrent callers of the same resource
+    wait for a single fetch, and a cached ``PaginatedList`` is handed out
+    behind a lock (``SharedPages``), since it fetches pages into itself.
+    """
+
+    MEMOIZED = frozenset({
+        "get_contents",
+        "get_readme",
+        "get_commits",
+        "get_issues",
+        "get_issues_comments",
+        "get_pulls",
+        "get_releases",
+        "get_topics",
+    })
+
+    def __init__(self, repo):
+        self._repo = repo
+        self._results: Dict[Tuple, Tuple[bool, Any]] = {}
+        self._locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._fetches = 0
+
+    @classmethod
+    def wrap(cls, repo) -> "RepoSnapshot":
+        """Wrap ``repo`` unless it already is a snapshot."""
+        return repo if isinstance(repo, cls) else cls(repo)
+
+    @property
+    def wrapped(self):
+        """The underlying repository object."""
+        return self._repo
+
+    @property
+    def fetch_count(self) -> int:
+        """Number of calls actually forwarded to the repository."""
+        return self._fetches
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repo, name)
+        if name in self.MEMOIZED and callable(attr):
+            return lambda *args, **kwargs: self._call(name, attr, args, kwargs)
+        return attr
+
+    def _call(self, name: str, method, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        key = (name, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key not in self._results:
+                with self._lock:
+                    self._fetches += 1
+                try:
+                    value = method(*args, **kwargs)
+                    if isinstance(value, PaginatedList):
+                        value = SharedPages(value)
+                    self._results[key] = (True, value)
+                except Exception as e:
+                    self._results[key] = (False, e)
+
+        ok, value = self._results[key]
+        if not ok:
+            raise value
+        return value
+
+
+class SharedPages:
+    """
+    A ``PaginatedList`` that several threads can read.
+
+    ``PaginatedList`` grows its element list as pages are fetched, so each
+    access runs under a lock. Slices are returned as lists (fetched under
+    the lock) rather than PyGithub's lazy slice objects, and iteration
+    takes the lock per element, so readers interleave instead of one
+    holding the lock for the whole walk.
+    """
+
+    def __init__(self, pages: PaginatedList):
+        self._pages = pages
+        self._lock = threading.RLock()
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                return list(self._pages[index])
+            return self._pages[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        index = 0
+        while True:
+            with self._lock:
+                try:
+                    item = self._pages[index]
+                except IndexError:
+                    return
+            yield item
+            index += 1
+
+    def __getattr__(self, name: str) -> Any:
+        # totalCount, get_page, reversed: all may fetch
+        with self._lock:
+            attr = getattr(self._pages, name)
+        if callable(attr):
+            def locked(*args, **kwargs):
+                with self._lock:
+                    return attr(*args, **kwargs)
+            return locked
+        return attr
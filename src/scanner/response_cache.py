@@ -0,0 +1,272 @@
+"""
+Persistent conditional-request cache for GitHub API responses.
+
+Responses are stored on disk (SQLite) keyed by URL and credential (a hash
+of the ``Authorization`` header, since a token can see private data another
+cannot) together with their ``ETag``/``Last-Modified`` validators. Repeat requests are sent with
+``If-None-Match``/``If-Modified-Since``; GitHub answers unchanged resources
+with ``304 Not Modified``, which does not count against the rate limit.
+"""
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Rate-limit headers are never stored: they describe the moment a response
+# was received. A revalidated entry is served with the 304's (live) values; a
+# fresh hit, which made no request, carries none.
+RATE_LIMIT_HEADERS = (
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+    "X-RateLimit-Used",
+    "X-RateLimit-Resource",
+)
+
+# Response headers worth keeping alongside the cached body
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+def cache_key(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+    """Key of ``url`` requested with ``headers``: the URL plus a hash of the credential."""
+    authorization = CaseInsensitiveDict(headers or {}).get("Authorization") or ""
+    digest = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16] if authorization else "-"
+    return f"{digest} {url}"
+
+
+class CachedResponse:
+    """Minimal response object served from the cache (mirrors ``requests.Response``)."""
+
+    from_cache = True
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    On-disk ETag/Last-Modified cache with TTL and size-bounded LRU eviction.
+
+    Args:
+        path: SQLite file location (parent directories are created).
+        ttl: Seconds a stored response is served without contacting GitHub.
+        max_age: Seconds after which an entry is dropped instead of revalidated.
+        max_entries: LRU bound on the number of stored responses.
+        max_bytes: LRU bound on the total size of stored bodies.
+    """
+
+    def __init__(
+        self,
+        path: str = ".cache/github_http.sqlite",
+        ttl: float = 60.0,
+        max_age: float = 7 * 24 * 3600,
+        max_entries: int = 20000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+        if columns and "key" not in columns:
+            # Entries from before credentials were part of the key
+            self._conn.execute("DROP TABLE responses")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._count, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def lookup(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for ``url`` requested with ``headers`` (or None), dropping expired ones."""
+        key = cache_key(url, headers)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            etag, last_modified, headers, body, stored_at = row
+            if time.time() - stored_at > self.max_age:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count -= 1
+                self._bytes -= len(body)
+                return None
+
+            return {
+                "etag": etag,
+                "last_modified": last_modified,
+                "headers": json.loads(headers),
+                "body": bytes(body),
+                "stored_at": stored_at,
+            }
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry can be served without revalidation."""
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Validator headers to send for a stored entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def serve(
+        self,
+        url: str,
+        entry: Dict[str, Any],
+        revalidated: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        not_modified=None,
+    ) -> CachedResponse:
+        """
+        Build a response from a stored entry and bump its LRU position.
+
+        Args:
+            headers: Request headers ``entry`` was looked up with.
+            not_modified: The ``304`` response that revalidated ``entry``;
+                its rate-limit headers replace the stored ones.
+        """
+        key = cache_key(url, headers)
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                # A 304 proves the stored body is current again
+                self._conn.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+                )
+                self._counters["revalidated"] += 1
+            else:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._counters["fresh_hits"] += 1
+
+        response_headers = dict(entry["headers"])
+        if not_modified is not None:
+            for name in RATE_LIMIT_HEADERS:
+                if name in not_modified.headers:
+                    response_headers[name] = not_modified.headers[name]
+        return CachedResponse(url, 200, response_headers, entry["body"])
+
+    def store(self, url: str, response, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record a network response to a request with ``headers``.
+
+        200s are stored when they carry a validator (``ETag`` or
+        ``Last-Modified``), or with ``ttl > 0`` even without one: such an
+        entry is served while fresh, then refetched in full.
+        """
+        with self._lock:
+            self._counters["misses"] += 1
+        if response.status_code != 200:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified and self.ttl <= 0:
+            return
+
+        body = response.content
+        key = cache_key(url, headers)
+        stored_headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(stored_headers), sqlite3.Binary(body), len(body), now, now),
+            )
+            if previous:
+                self._bytes -= previous[0]
+            else:
+                self._count += 1
+            self._bytes += len(body)
+            self._counters["stored"] += 1
+            if self._count > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used entries down to 90% of both bounds, so
+        eviction runs once per batch of inserts rather than on every one.
+        Caller holds the lock.
+        """
+        target_count = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        victims = []
+        count, total = self._count, self._bytes
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            if count <= target_count and total <= target_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+
+        self._conn.execute("BEGIN")
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._conn.execute("COMMIT")
+        self._count, self._bytes = count, total
+        self._counters["evicted"] += len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus current size."""
+        with self._lock:
+            return {**self._counters, "entries": self._count, "bytes": self._bytes}
+
+    def clear(self) -> None:
+        """Remove every stored response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._count, self._bytes = 0, 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
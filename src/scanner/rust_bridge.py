@@ -2,14 +2,94 @@
 Rust Scanner Bridge - Integrates Rust-based GitHub scanner with Python workflow
 """
 import subprocess
+import threading
+import atexit
+import queue
+import time
 import json
 import os
 import logging
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator, List
 
 logger = logging.getLogger(__name__)
 
+LEGACY_START = "__REPO_JSON__"
+LEGACY_END = "__END_JSON__"
+
+
+def iter_json_records(cmd: List[str], env: Dict[str, str], timeout: float) -> Iterator[Dict]:
+    """
+    Run a scanner binary and yield each repo it reports, as it reports it.
+
+    Reads the streaming protocol (one JSON object per stdout line, from
+    ``--jsonl``) and also accepts the legacy ``__REPO_JSON__``/``__END_JSON__``
+    block, holding a single object or a list, so older binaries keep working.
+
+    The process is killed after ``timeout`` seconds, or when the consumer
+    stops iterating early.
+    """
+    process = subprocess.Popen(
+        cmd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    # Drain stderr (the Rust logs) so a full pipe cannot stall the scanner
+    stderr_tail = deque(maxlen=50)
+
+    def drain_stderr():
+        for raw in process.stderr:
+            stderr_tail.append(raw.decode("utf-8", errors="ignore").rstrip())
+
+    threading.Thread(target=drain_stderr, daemon=True).start()
+
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        if process.poll() is None:
+            timed_out.set()
+            process.kill()
+
+    watchdog = threading.Timer(timeout, kill_on_timeout)
+    watchdog.daemon = True
+    watchdog.start()
+
+    legacy_block = None
+    try:
+        for raw in process.stdout:
+            line = raw.decode("utf-8", errors="ignore").strip()
+
+            if legacy_block is not None:
+                if line == LEGACY_END:
+                    data = json.loads("\n".join(legacy_block))
+                    legacy_block = None
+                    yield from (data if isinstance(data, list) else [data])
+                else:
+                    legacy_block.append(line)
+            elif line == LEGACY_START:
+                legacy_block = []
+            elif line.startswith("{"):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed scanner line: {line[:120]}")
+
+        returncode = process.wait()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if returncode != 0:
+            logger.error(f"Rust scanner failed with code {returncode}")
+            logger.error("stderr: " + "\n".join(stderr_tail))
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
 
 class RustScanner:
     """Bridge to Rust-based GitHub scanner for faster performance"""
@@ -37,10 +117,30 @@ class RustScanner:
         """Check if Rust scanner is available"""
         return self.rust_binary is not None and self.rust_binary.exists()
 
+    def _env(self) -> Dict[str, str]:
+        env = os.environ.copy()
+        env['GITHUB_TOKEN'] = self.token
+        env['RUST_LOG'] = 'info'
+        return env
+
+    def iter_repos(self, timeout: float = 60, max_results: Optional[int] = None, **_) -> Iterator[Dict]:
+        """Yield valid repositories as the Rust scanner finds them."""
+        records = iter_json_records([str(self.rust_binary), "--jsonl"], self._env(), timeout)
+        try:
+            for count, repo in enumerate(records, 1):
+                yield repo
+                if max_results is not None and count >= max_results:
+                    return
+        finally:
+            records.close()
+
     def scan_and_find_repo(self) -> Optional[Dict]:
         """
         Use Rust scanner to find a valid repository
         Returns repository data or None
+
+        Returns as soon as the first valid repository is streamed; the scan
+        is then stopped.
         """
         if not self.is_available():
             logger.warning("Rust scanner not available, falling back to Python scanner")
@@ -49,35 +149,13 @@ class RustScanner:
         try:
             logger.info("🦀 Running Rust scanner for faster performance...")
 
-            env = os.environ.copy()
-            env['GITHUB_TOKEN'] = self.token
-            env['RUST_LOG'] = 'info'
-
-            # Run Rust binary
-            result = subprocess.run(
-                [str(self.rust_binary)],
-                capture_output=True,
-                text=True,
-                env=env,
-                timeout=60  # 1 minute timeout
-            )
-
-            if result.returncode != 0:
-                logger.error(f"Rust scanner failed with code {result.returncode}")
-                logger.error(f"stderr: {result.stderr}")
-                return None
-
-            # Parse output
-            output = result.stdout
-            logger.info(f"Rust scanner output:\n{output}")
+            repos = self.iter_repos(timeout=60, max_results=1)  # 1 minute timeout
+            try:
+                repo_data = next(repos, None)
+            finally:
+                repos.close()
 
-            # Extract JSON between markers
-            if "__REPO_JSON__" in output and "__END_JSON__" in output:
-                json_start = output.index("__REPO_JSON__") + len("__REPO_JSON__\n")
-                json_end = output.index("__END_JSON__")
-                json_str = output[json_start:json_end].strip()
-
-                repo_data = json.loads(json_str)
+            if repo_data:
                 logger.info(f"✅ Rust scanner found repository: {repo_data.get('full_name')}")
                 return repo_data
             else:
@@ -92,18 +170,238 @@ class RustScanner:
             return None
 
 
-def get_scanner(token: str, prefer_rust: bool = True):
+# Binaries (path, mtime) that failed to start in --serve mode
+_no_serve = set()
+_no_serve_lock = threading.Lock()
+
+
+def _binary_key(binary: Path):
+    try:
+        return (str(binary), os.stat(binary).st_mtime_ns)
+    except OSError:
+        return (str(binary), None)
+
+
+class RustScannerWorker(RustScanner):
+    """
+    Client for a long-lived Rust scanner (``--serve`` mode).
+
+    The process is started once and keeps its HTTP connections warm; each
+    scan is a JSON request line on its stdin, answered by JSON lines tagged
+    with the request id. Requests may come from several threads; the worker
+    answers them in order. A worker that dies is restarted on the next
+    request. Binaries without ``--serve`` fall back to one-shot scans; that
+    is remembered per binary, so only the first request waits to find out.
+    """
+
+    READY_TIMEOUT = 10
+
+    def __init__(self, token: str):
+        super().__init__(token)
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, queue.Queue] = {}
+        self._next_id = 0
+        self._stderr_tail = deque(maxlen=50)
+
+    def _ensure_started(self):
+        """Start (or restart) the worker process. Caller holds the lock."""
+        if self._process is not None and self._process.poll() is None:
+            return
+        if self._process is not None:
+            logger.warning(f"Rust scanner worker exited with code {self._process.returncode}; restarting")
+
+        binary = _binary_key(self.rust_binary)
+        with _no_serve_lock:
+            if binary in _no_serve:
+                raise RuntimeError("Rust scanner binary does not support --serve")
+
+        process = subprocess.Popen(
+            [str(self.rust_binary), "--serve"],
+            env=self._env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._process = process
+        handshake: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read_replies, args=(process, handshake), daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(process,), daemon=True).start()
+
+        try:
+            ready = handshake.get(timeout=self.READY_TIMEOUT)
+        except queue.Empty:
+            ready = False
+        if not ready:
+            # Remembered per binary, so later requests fall back at once
+            # instead of waiting READY_TIMEOUT again; a rebuilt binary is
+            # probed afresh.
+            with _no_serve_lock:
+                _no_serve.add(binary)
+            process.kill()
+            self._process = None
+            raise RuntimeError("Rust scanner did not start in --serve mode")
+        logger.info(f"🦀 Rust scanner worker started (pid {process.pid})")
+
+    def _read_replies(self, process: subprocess.Popen, handshake: queue.Queue):
+        """Route reply lines to their requests; report startup on ``handshake``."""
+        started = False
+        for raw in process.stdout:
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            if message.get("ready"):
+                started = True
+                handshake.put(True)
+                continue
+            if not started:
+                # Nothing is requested before the ready line (and the
+                # starting thread holds the lock)
+                continue
+            with self._lock:
+                replies = self._pending.get(message.get("id"))
+            # Replies to abandoned requests are dropped
+            if replies is not None:
+                replies.put(message)
+
+        # EOF before the ready line: the binary has no --serve mode
+        if not started:
+            handshake.put(False)
+
+        # EOF: wake every request still waiting on this process
+        with self._lock:
+            if process is not self._process:
+                return
+            waiting = list(self._pending.values())
+        for replies in waiting:
+            replies.put(None)
+
+    def _drain_stderr(self, process: subprocess.Popen):
+        for raw in process.stderr:
+            self._stderr_tail.append(raw.decode("utf-8", errors="ignore").rstrip())
+
+    def iter_repos(
+        self,
+        timeout: float = 60,
+        max_results: Optional[int] = None,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Yield valid repositories for one scan request as the worker finds them.
+
+        Args:
+            timeout: Seconds to wait for the whole request; on expiry the
+                worker is stopped (and restarted by the next request).
+            max_results: Stop after this many valid repos (worker default: 3).
+            query: GitHub search query (worker default: recent quality repos).
+            limit: Search results to validate (up to 100).
+        """
+        with self._lock:
+            try:
+                self._ensure_started()
+            except Exception as e:
+                start_error = e
+            else:
+                start_error = None
+                self._next_id += 1
+                request_id = self._next_id
+                replies: queue.Queue = queue.Queue()
+                self._pending[request_id] = replies
+                process = self._process
+
+        if start_error is not None:
+            logger.warning(f"Rust scanner worker unavailable ({start_error}); running a one-shot scan")
+            yield from super().iter_repos(timeout=timeout, max_results=max_results)
+            return
+
+        request = {"id": request_id}
+        if query:
+            request["query"] = query
+        if limit:
+            request["limit"] = limit
+        if max_results:
+            request["max_results"] = max_results
+
+        try:
+            process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+            process.stdin.flush()
+
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    message = replies.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    logger.error(f"Rust scanner request {request_id} timed out; stopping worker")
+                    process.kill()
+                    raise subprocess.TimeoutExpired(process.args, timeout)
+
+                if message is None:
+                    logger.error("stderr: " + "\n".join(self._stderr_tail))
+                    raise RuntimeError("Rust scanner worker exited")
+                if "error" in message:
+                    raise RuntimeError(f"Rust scanner error: {message['error']}")
+                if message.get("done"):
+                    return
+                yield message["repo"]
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def close(self):
+        """Ask the worker to exit (closing stdin) and wait for it."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except Exception:
+            process.kill()
+            process.wait()
+
+
+_workers: Dict[str, RustScannerWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def _close_workers():
+    with _workers_lock:
+        for worker in _workers.values():
+            worker.close()
+        _workers.clear()
+
+
+atexit.register(_close_workers)
+
+
+def get_scanner(token: str, prefer_rust: bool = True, persistent: bool = False):
     """
     Get the best available scanner (Rust or Python fallback)
 
     Args:
         token: GitHub API token
         prefer_rust: If True, try Rust scanner first
+        persistent: Return the process-wide ``RustScannerWorker`` for this
+            token (started once, reused by every caller) instead of a
+            scanner that spawns the binary per scan
 
     Returns:
-        Scanner instance (RustScanner or GitHubScanner)
+        Scanner instance (RustScannerWorker, RustScanner or GitHubScanner)
     """
     if prefer_rust:
+        if persistent:
+            with _workers_lock:
+                worker = _workers.get(token) or RustScannerWorker(token)
+                if worker.is_available():
+                    _workers[token] = worker
+                    logger.info("🦀 Using persistent Rust scanner worker")
+                    return worker
+
         rust_scanner = RustScanner(token)
         if rust_scanner.is_available():
             logger.info("🦀 Using Rust scanner (faster)")
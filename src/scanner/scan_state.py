@@ -0,0 +1,97 @@
+"""
+Persisted state for incremental ("since last run") scanning.
+
+``ScanState`` stores a watermark (the end of the newest search window swept
+completely, windows being swept oldest first) and the ``pushed_at`` of every
+repository already evaluated. The next
+scan only searches repos pushed after the watermark, and skips those whose
+``pushed_at`` has not moved without any API or database call.
+"""
+import os
+import json
+import logging
+import datetime
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScanState:
+    """
+    JSON-backed scan watermark plus a map of seen repos.
+
+    Args:
+        path: State file location (parent directories are created).
+        initial_lookback: Range searched on the first run, before any
+            watermark exists.
+        max_seen: Bound on remembered repos; the least recently pushed are
+            forgotten first.
+    """
+
+    def __init__(
+        self,
+        path: str = ".cache/scan_state.json",
+        initial_lookback: datetime.timedelta = datetime.timedelta(days=1),
+        max_seen: int = 50000,
+    ):
+        self.path = Path(path)
+        self.initial_lookback = initial_lookback
+        self.max_seen = max_seen
+        self._lock = threading.Lock()
+        self.watermark: Optional[datetime.datetime] = None
+        self.seen: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("watermark"):
+                self.watermark = datetime.datetime.fromisoformat(data["watermark"])
+            self.seen = dict(data.get("seen", {}))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable scan state {self.path}: {e}")
+
+    def since(self) -> datetime.datetime:
+        """Start of the range the next scan should search."""
+        if self.watermark is not None:
+            return self.watermark
+        return datetime.datetime.now(datetime.timezone.utc) - self.initial_lookback
+
+    def is_unchanged(self, repo: Dict[str, Any]) -> bool:
+        """Whether ``repo`` was evaluated before and has not been pushed since."""
+        with self._lock:
+            pushed_at = self.seen.get(repo.get("full_name"))
+        return pushed_at is not None and pushed_at == repo.get("pushed_at")
+
+    def mark(self, repo: Dict[str, Any]):
+        """Remember that ``repo`` was evaluated at its current ``pushed_at``."""
+        if not repo.get("pushed_at"):
+            return
+        with self._lock:
+            self.seen[repo["full_name"]] = repo["pushed_at"]
+
+    def advance(self, until: datetime.datetime):
+        """Move the watermark to the end of the swept part of the range."""
+        with self._lock:
+            self.watermark = until
+
+    def save(self):
+        """Write the state atomically (temp file + rename)."""
+        with self._lock:
+            if len(self.seen) > self.max_seen:
+                # ISO timestamps sort chronologically
+                newest = sorted(self.seen.items(), key=lambda item: item[1], reverse=True)[:self.max_seen]
+                self.seen = dict(newest)
+            data = {
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+                "seen": self.seen,
+            }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,123 @@
+import os
+import json
+
+import pytest
+
+from api.dataset import DatasetHolder, public_repo
+
+
+def _write(path, repos, wrap=False):
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"repos": repos} if wrap else repos), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+@pytest.fixture
+def scan_file(tmp_path):
+    path = tmp_path / "ai_scan.json"
+    _write(path, [
+        {"full_name": "Owner/Alpha", "language": "Python", "insights": "x", "ai_analysis": {}},
+        {"full_name": "owner/beta", "language": "Rust"},
+    ])
+    return path
+
+
+def test_loads_once_and_reuses_snapshot(scan_file):
+    holder = DatasetHolder(scan_file)
+
+    first = holder.get()
+    second = holder.get()
+
+    assert first is second
+    assert len(first) == 2
+    assert holder.reloads == 1
+
+
+def test_reloads_on_atomic_replace(scan_file):
+    holder = DatasetHolder(scan_file)
+    old = holder.get()
+
+    _write(scan_file, [{"full_name": "owner/gamma"}], wrap=True)
+    new = holder.get()
+
+    assert new is not old
+    assert [repo["full_name"] for repo in new.repos] == ["owner/gamma"]
+    # The previous snapshot is untouched for requests still using it
+    assert len(old) == 2
+
+
+def test_reloads_on_mtime_change(scan_file):
+    holder = DatasetHolder(scan_file)
+    holder.get()
+
+    scan_file.write_text(json.dumps([{"full_name": "owner/delta"}]), encoding="utf-8")
+    stat = scan_file.stat()
+    os.utime(scan_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert holder.get().get("owner/delta") is not None
+
+
+def test_invalid_file_keeps_previous_snapshot(scan_file):
+    holder = DatasetHolder(scan_file)
+    old = holder.get()
+
+    scan_file.write_text("[{", encoding="utf-8")
+
+    assert holder.get() is old
+    assert holder.get() is old
+    assert holder.reloads == 1
+
+
+def test_missing_file_is_empty(tmp_path):
+    snapshot = DatasetHolder(tmp_path / "missing.json").get()
+
+    assert len(snapshot) == 0
+    assert snapshot.fingerprint is None
+
+
+def test_lookup_is_case_insensitive(scan_file):
+    snapshot = DatasetHolder(scan_file).get()
+
+    assert snapshot.get("owner/alpha")["language"] == "Python"
+    assert snapshot.get("OWNER/BETA")["language"] == "Rust"
+    assert snapshot.get("owner/missing") is None
+
+
+def test_repos_are_read_only(scan_file):
+    snapshot = DatasetHolder(scan_file).get()
+
+    with pytest.raises(TypeError):
+        snapshot.repos[0]["insights"] = None
+    with pytest.raises(AttributeError):
+        snapshot.repos[0].pop("insights")
+
+
+def test_public_repo_strips_premium_fields_from_a_copy(scan_file):
+    snapshot = DatasetHolder(scan_file).get()
+    repo = snapshot.get("owner/alpha")
+
+    free = public_repo(repo, include_premium=False)
+    paid = public_repo(repo, include_premium=True)
+
+    assert "insights" not in free and "ai_analysis" not in free
+    assert paid["insights"] == "x"
+    assert "insights" in repo
+
+    # Nested values are copies too
+    paid["ai_analysis"]["verdict"] = "changed"
+    assert repo["ai_analysis"] == {}
+
+
+def test_derived_is_computed_once_per_snapshot(scan_file):
+    holder = DatasetHolder(scan_file)
+    calls = []
+
+    def build(snapshot):
+        calls.append(snapshot)
+        return len(snapshot)
+
+    assert holder.get().derived("count", build) == 2
+    assert holder.get().derived("count", build) == 2
+    _write(scan_file, [])
+    assert holder.get().derived("count", build) == 0
+    assert len(calls) == 2
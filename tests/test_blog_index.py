@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import generate_blog_index as blog_index
+
+
+def _post(site, category, slug, title):
+    path = site / "src" / "content" / "blog" / category / slug / "index.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f'---\ntitle: "{title}"\nrepo: owner/{slug}\ndate: 2025-11-27\n---\n\nBody\n', encoding="utf-8")
+    return path
+
+
+def test_index_is_incremental(tmp_path, monkeypatch):
+    site = tmp_path / "website"
+    first = _post(site, "ai", "one", "One")
+    _post(site, "ai", "two", "Two")
+    kwargs = dict(
+        blog_dir=str(site / "src" / "content" / "blog"),
+        output_file=str(site / "public" / "blog_index.json"),
+        state_file=str(tmp_path / "state.json"),
+        site_dir=str(site),
+    )
+
+    assert blog_index.generate_blog_index(**kwargs) is True
+    output = Path(kwargs["output_file"])
+    posts = json.loads(output.read_text())["posts"]
+    assert [p["title"] for p in posts] == ["One", "Two"]
+    assert posts[0]["date"] == "2025-11-27"
+    assert posts[0]["path"] == "src/content/blog/ai/one/index.md"
+
+    # Nothing changed: no parsing and no rewrite
+    parsed = []
+    real_build = blog_index.build_entry
+    monkeypatch.setattr(blog_index, "build_entry", lambda *a: parsed.append(a[0]) or real_build(*a))
+    mtime = output.stat().st_mtime_ns
+    assert blog_index.generate_blog_index(**kwargs) is False
+    assert parsed == [] and output.stat().st_mtime_ns == mtime
+
+    # One edit, one deletion: only the edited post is re-parsed
+    first.write_text('---\ntitle: "One, edited"\n---\n', encoding="utf-8")
+    os.remove(site / "src" / "content" / "blog" / "ai" / "two" / "index.md")
+    assert blog_index.generate_blog_index(**kwargs) is True
+    assert parsed == [first]
+    assert [p["title"] for p in json.loads(output.read_text())["posts"]] == ["One, edited"]
+
+
+def test_script_needs_only_the_standard_library():
+    # The deploy workflows run it without installing requirements
+    import subprocess
+    script_dir = Path(__file__).parent.parent / "scripts"
+    code = (
+        f"import sys; sys.path.insert(0, {str(script_dir)!r}); import generate_blog_index; "
+        "print(sorted(m for m in ('yaml', 'blog_generator') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_parse_frontmatter():
+    data = blog_index.parse_frontmatter([
+        'title: "Say \\"hi\\""\n',
+        "repo: 'it''s/repo'\n",
+        "description: >-\n",
+        "  Folded\n",
+        "  text\n",
+        "repo_data:\n",
+        "  full_name: nested/ignored\n",
+        "tags: [a, 'b']\n",
+        "- stray\n",
+    ])
+
+    assert data == {
+        "title": 'Say "hi"',
+        "repo": "it's/repo",
+        "description": "Folded text",
+        "repo_data": "",
+        "tags": ["a", "b"],
+    }
+
+
+def test_fresh_checkout_does_not_rewrite_the_index(tmp_path):
+    site = tmp_path / "website"
+    post = _post(site, "ai", "one", "One")
+    kwargs = dict(
+        blog_dir=str(site / "src" / "content" / "blog"),
+        output_file=str(site / "public" / "blog_index.json"),
+        state_file=str(tmp_path / "state.json"),
+        site_dir=str(site),
+    )
+    assert blog_index.generate_blog_index(**kwargs) is True
+    output = Path(kwargs["output_file"])
+    assert json.loads(output.read_text())["posts"][0]["last_updated"] == "2025-11-27"
+
+    # A CI checkout: new mtimes and no state file carried over
+    stat = post.stat()
+    os.utime(post, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+    os.remove(kwargs["state_file"])
+    content = output.read_text()
+
+    assert blog_index.generate_blog_index(**kwargs) is False
+    assert output.read_text() == content
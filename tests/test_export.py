@@ -0,0 +1,103 @@
+import io
+import csv
+import json
+import gzip
+
+import pytest
+
+from api import export
+from api.export import EXPORT_COLUMNS, gzip_stream, stream_export
+
+
+def _repos(count=1234):
+    return [
+        {
+            "full_name": f"owner/repo{i}",
+            "name": f"repo{i}",
+            "description": "Ünïcode, commas and \"quotes\"",
+            "stargazers_count": i,
+            "topics": ["a", "b"],
+            "score": i / 10,
+            "insights": {"summary": "x"} if i % 2 else None,
+            # Fields outside the schema (and varying per repo) are fine
+            **({"extra_field": True} if i % 3 == 0 else {}),
+        }
+        for i in range(count)
+    ]
+
+
+def _collect(chunks):
+    return b"".join(chunks)
+
+
+def test_json_keeps_the_data_envelope():
+    repos = _repos()
+
+    data = json.loads(_collect(stream_export(repos, "json")))
+
+    assert data == {"data": repos}
+    assert json.loads(_collect(stream_export([], "json"))) == {"data": []}
+
+
+def test_ndjson_is_one_repo_per_line():
+    repos = _repos()
+
+    lines = _collect(stream_export(repos, "ndjson")).decode("utf-8").splitlines()
+
+    assert [json.loads(line) for line in lines] == repos
+
+
+def test_csv_uses_the_fixed_schema():
+    repos = _repos()
+
+    rows = list(csv.reader(io.StringIO(_collect(stream_export(repos, "csv")).decode("utf-8"))))
+
+    assert rows[0] == [column for column, _ in EXPORT_COLUMNS]
+    assert len(rows) == len(repos) + 1
+    first = dict(zip(rows[0], rows[1]))
+    assert first["full_name"] == "owner/repo0"
+    assert first["description"] == repos[0]["description"]
+    assert json.loads(first["topics"]) == ["a", "b"]
+    assert first["insights"] == ""
+    assert json.loads(dict(zip(rows[0], rows[2]))["insights"]) == {"summary": "x"}
+
+
+def test_csv_of_nothing_is_just_the_header():
+    assert _collect(stream_export([], "csv")).decode("utf-8").strip() == ",".join(c for c, _ in EXPORT_COLUMNS)
+
+
+@pytest.mark.parametrize("export_format", ["json", "ndjson", "csv"])
+def test_exports_are_streamed_in_batches(export_format):
+    consumed = []
+
+    def repos():
+        for repo in _repos(5 * export.BATCH_SIZE):
+            consumed.append(repo)
+            yield repo
+
+    chunks = stream_export(repos(), export_format)
+    next(chunks)
+    next(chunks)
+
+    # Only the rows for the chunks produced so far were read
+    assert len(consumed) <= 2 * export.BATCH_SIZE + 1
+
+
+def test_gzip_stream_round_trips():
+    raw = _collect(stream_export(_repos(), "ndjson"))
+
+    assert gzip.decompress(_collect(gzip_stream(stream_export(_repos(), "ndjson")))) == raw
+
+
+def test_columnar_formats_round_trip():
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    repos = _repos()
+    parquet = pq.read_table(pyarrow.BufferReader(_collect(stream_export(repos, "parquet"))))
+    arrow = pyarrow.ipc.open_stream(_collect(stream_export(repos, "arrow"))).read_all()
+
+    for table in (parquet, arrow):
+        assert table.num_rows == len(repos)
+        assert table.column_names == [column for column, _ in EXPORT_COLUMNS]
+        assert table.column("stargazers_count").to_pylist() == list(range(len(repos)))
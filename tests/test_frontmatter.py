@@ -0,0 +1,67 @@
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from blog_generator import frontmatter
+from blog_generator.frontmatter import load_frontmatter, parse_frontmatter, split_frontmatter
+
+
+POST = """---
+title: "pdfly"
+date: 2025-11-27
+stars: 494
+tags: ["cli", "pdf"]
+repo_data:
+  full_name: "py-pdf/pdfly"
+---
+
+# Body with a --- rule
+
+---
+"""
+
+
+def test_parses_yaml_and_keeps_dates_as_strings():
+    data = parse_frontmatter(POST)
+
+    assert data["title"] == "pdfly"
+    assert data["date"] == "2025-11-27"
+    assert data["stars"] == 494
+    assert data["tags"] == ["cli", "pdf"]
+    assert data["repo_data"]["full_name"] == "py-pdf/pdfly"
+
+
+def test_split_stops_at_closing_delimiter():
+    fm, body = split_frontmatter(POST)
+
+    assert fm.startswith('title: "pdfly"') and fm.endswith('full_name: "py-pdf/pdfly"\n')
+    assert body == "\n# Body with a --- rule\n\n---\n"
+    assert split_frontmatter("no frontmatter") == (None, "no frontmatter")
+    assert parse_frontmatter("---\ntitle: unterminated\n") == {}
+
+
+def test_invalid_yaml_falls_back_to_line_parser():
+    assert parse_frontmatter('---\ntitle: a: b: [\nrepo: "o/r"\n---\n') == {"title": "a: b: [", "repo": "o/r"}
+
+
+def test_load_is_memoized_per_mtime_and_size(tmp_path, monkeypatch):
+    frontmatter.clear_cache()
+    post = tmp_path / "index.md"
+    post.write_text(POST, encoding="utf-8")
+
+    reads = []
+    real_read = frontmatter.read_frontmatter_text
+    monkeypatch.setattr(frontmatter, "read_frontmatter_text", lambda p: reads.append(p) or real_read(p))
+
+    assert load_frontmatter(post)["stars"] == 494
+    load_frontmatter(post)["stars"] = 0  # callers get their own copy
+    assert load_frontmatter(post)["stars"] == 494
+    assert len(reads) == 1
+
+    post.write_text(POST.replace("494", "500"), encoding="utf-8")
+    os.utime(post, ns=(1, 1))
+    assert load_frontmatter(post)["stars"] == 500
+    assert len(reads) == 2
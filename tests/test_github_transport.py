@@ -0,0 +1,150 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.github_transport import GitHubTransport, endpoint_name
+from scanner.response_cache import ResponseCache
+
+
+def test_endpoint_name_collapses_repo_segments():
+    assert endpoint_name("https://api.github.com/repos/owner/repo/contributors?per_page=1") == "/repos/{owner}/{repo}/contributors"
+    assert endpoint_name("https://api.github.com/repos/a/b") == "/repos/{owner}/{repo}"
+    assert endpoint_name("https://api.github.com/search/repositories?q=x") == "/search/repositories"
+    assert endpoint_name("https://api.github.com/repos/a/b/issues/42/comments") == "/repos/{owner}/{repo}/issues/{number}/comments"
+
+
+def test_transport_records_latency_per_endpoint():
+    transport = GitHubTransport(pool_size=4)
+    response = MagicMock(status_code=200)
+
+    with patch("requests.Session.request", return_value=response) as mock_request:
+        assert transport.get("https://api.github.com/repos/a/b/pulls", headers={"X": "1"}) is response
+        transport.get("https://api.github.com/repos/c/d/pulls")
+
+    # Requests go through the pooled session with the default timeout applied
+    method, url = mock_request.call_args[0]
+    assert method == "GET"
+    assert mock_request.call_args[1]["timeout"] == transport.timeout
+
+    stats = transport.stats()
+    assert stats["endpoints"]["/repos/{owner}/{repo}/pulls"]["count"] == 2
+    assert stats["endpoints"]["/repos/{owner}/{repo}/pulls"]["errors"] == 0
+    assert set(stats["connections"]) == {"opened", "requests", "reused"}
+
+
+def test_transport_counts_errors():
+    transport = GitHubTransport()
+
+    with patch("requests.Session.request", side_effect=ConnectionError("boom")):
+        try:
+            transport.get("https://api.github.com/rate_limit")
+        except ConnectionError:
+            pass
+
+    assert transport.stats()["endpoints"]["/rate_limit"]["errors"] == 1
+
+
+def _response(status, body=b"{}", headers=None):
+    response = MagicMock(status_code=status, content=body)
+    response.headers = headers or {}
+    response.json.side_effect = lambda: json.loads(body)
+    return response
+
+
+def test_cached_get_sends_conditional_request(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    transport = GitHubTransport(cache=cache)
+    url = "https://api.github.com/repos/a/b"
+
+    first = _response(200, b'{"open_issues_count": 3}', {"ETag": '"abc"'})
+    with patch("requests.Session.request", side_effect=[first, _response(304)]) as mock_request:
+        assert transport.get(url, headers={"Authorization": "token x"}).json()["open_issues_count"] == 3
+        second = transport.get(url, headers={"Authorization": "token x"})
+
+    # Second request revalidates with the stored ETag and is served from disk
+    sent_headers = mock_request.call_args_list[1][1]["headers"]
+    assert sent_headers["If-None-Match"] == '"abc"'
+    assert sent_headers["Authorization"] == "token x"
+    assert second.status_code == 200
+    assert second.json() == {"open_issues_count": 3}
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_cache_entries_are_per_credential(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=3600)
+    transport = GitHubTransport(cache=cache)
+    url = "https://api.github.com/repos/a/private"
+
+    with patch("requests.Session.request", side_effect=[
+        _response(200, b'{"private": true}', {"ETag": "x"}),
+        _response(404, b"{}"),
+    ]) as mock_request:
+        transport.get(url, headers={"Authorization": "token insider"})
+        other = transport.get(url, headers={"Authorization": "token outsider"})
+
+    # Another token's request goes to GitHub, without the first token's validators
+    assert other.status_code == 404
+    assert "If-None-Match" not in mock_request.call_args_list[1][1]["headers"]
+    assert cache.lookup(url, {"Authorization": "token insider"}) is not None
+    assert cache.lookup(url) is None
+
+
+def test_revalidated_response_keeps_current_rate_limit_headers(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    transport = GitHubTransport(cache=cache)
+    url = "https://api.github.com/repos/a/b"
+
+    with patch("requests.Session.request", side_effect=[
+        _response(200, b"{}", {"ETag": "x", "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "100"}),
+        _response(304, b"", {"X-RateLimit-Remaining": "4998", "X-RateLimit-Reset": "100"}),
+    ]):
+        transport.get(url)
+        revalidated = transport.get(url)
+
+    assert revalidated.headers["X-RateLimit-Remaining"] == "4998"
+    assert revalidated.headers["X-RateLimit-Reset"] == "100"
+    assert revalidated.headers["ETag"] == "x"
+
+
+def test_fresh_hits_carry_no_rate_limit_figures(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=3600)
+    transport = GitHubTransport(cache=cache)
+    url = "https://api.github.com/repos/a/b"
+
+    with patch("requests.Session.request", return_value=_response(
+        200, b"{}", {"ETag": "x", "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "100"}
+    )):
+        transport.get(url)
+        cached = transport.get(url)
+
+    # No request was made, so there is no current budget to report
+    assert cached.from_cache
+    assert "X-RateLimit-Remaining" not in cached.headers
+
+
+def test_fresh_cache_entry_skips_network(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=3600)
+    transport = GitHubTransport(cache=cache)
+    url = "https://api.github.com/repos/a/b/contributors?per_page=1"
+
+    with patch("requests.Session.request", return_value=_response(200, b"[]", {"ETag": "x", "Link": "<u?page=2>; rel=\"last\""})) as mock_request:
+        transport.get(url)
+        cached = transport.get(url)
+
+    assert mock_request.call_count == 1
+    assert cached.headers["Link"] == "<u?page=2>; rel=\"last\""
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=10)
+    for i in range(12):
+        cache.store(f"https://api.github.com/repos/a/r{i}", _response(200, b"{}", {"ETag": str(i)}))
+
+    stats = cache.stats()
+    assert stats["entries"] <= 10
+    assert cache.lookup("https://api.github.com/repos/a/r0") is None
+    assert cache.lookup("https://api.github.com/repos/a/r11") is not None
@@ -0,0 +1,140 @@
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.graphql_backend import GraphQLBackend, GraphQLObjectMissing, insights_from_node
+from scanner.insights_collector import InsightsCollector
+from scanner.gem_analyzer import GemAnalyzer
+
+
+def _iso(days_ago):
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+INSIGHTS_NODE = {
+    "nameWithOwner": "owner/repo",
+    "description": "A tool",
+    "licenseInfo": {"name": "MIT License"},
+    "openIssues": {"totalCount": 3},
+    "openPullRequests": {"totalCount": 2},
+    "closedPullRequests": {"nodes": [{"merged": True}, {"merged": True}, {"merged": False}, {"merged": True}]},
+    "defaultBranchRef": {"target": {"committedDate": "2024-05-01T10:00:00Z", "recentHistory": {"totalCount": 30}}},
+    "rootTree": {"entries": [{"name": "README.md", "type": "blob"}, {"name": "CONTRIBUTING.md", "type": "blob"}]},
+    "githubTree": None,
+    "docsTree": None,
+    "codeOfConduct": None,
+    "issueTemplates": [],
+    "pullRequestTemplates": [],
+}
+
+ANALYSIS_NODE = {
+    "nameWithOwner": "owner/repo",
+    "name": "repo",
+    "description": "A tool",
+    "stargazerCount": 120,
+    "forkCount": 10,
+    "createdAt": _iso(400),
+    "updatedAt": _iso(2),
+    "owner": {"login": "owner"},
+    "primaryLanguage": {"name": "Rust"},
+    "licenseInfo": {"name": "MIT License"},
+    "openIssueCount": {"totalCount": 4},
+    "openPullRequestCount": {"totalCount": 1},
+    "defaultBranchRef": {"target": {"history": {"nodes": [
+        {"oid": f"{i:040x}", "message": "feat: add thing", "author": {"name": "dev", "date": _iso(i)}}
+        for i in range(10)
+    ]}}},
+    "closedIssues": {"nodes": [
+        {"number": 1, "createdAt": _iso(10), "comments": {"totalCount": 1, "nodes": [{"createdAt": _iso(9)}]}},
+    ]},
+    "openIssues": {"nodes": [{"number": 2, "createdAt": _iso(1), "comments": {"totalCount": 0}}]},
+    "recentPullRequests": {"nodes": [{"merged": True, "author": {"login": "alice"}}, {"merged": False, "author": None}]},
+    "releases": {"nodes": [{"tagName": "v1.0.0", "createdAt": _iso(30)}]},
+    "workflowsTree": {"entries": [{"name": "ci.yml", "type": "blob"}]},
+    "rootTree": {"entries": [{"name": "tests", "type": "tree"}, {"name": "Cargo.toml", "type": "blob"}]},
+    "docsTree": None,
+    "githubTree": {"entries": [{"name": "workflows", "type": "tree"}]},
+    "readme0": {"text": "# repo\n" + "x" * 600, "byteSize": 607},
+}
+
+
+def _backend_returning(data):
+    transport = MagicMock()
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"data": data}
+    transport.post.return_value = response
+    return GraphQLBackend("token", transport=transport, batch_size=2), transport
+
+
+def test_insights_from_node_matches_rest_shapes():
+    insights = insights_from_node(INSIGHTS_NODE)
+
+    assert insights["commit_frequency_score"] == 10.0
+    assert insights["pr_merge_ratio"] == 0.75
+    assert insights["open_issues_count"] == 5
+    assert insights["last_commit_date"] == "2024-05-01T10:00:00Z"
+    # description, README, license, contributing out of 7 checks
+    assert insights["health_percentage"] == 57
+
+
+def test_repos_are_batched_with_aliases():
+    backend, transport = _backend_returning({"r0": INSIGHTS_NODE, "r1": None})
+
+    nodes = backend.fetch_insights_nodes(["owner/repo", "owner/missing", "other/repo"])
+
+    # 3 repos with batch_size=2 -> 2 requests
+    assert transport.post.call_count == 2
+    query = transport.post.call_args_list[0][1]["json"]["query"]
+    assert 'r0: repository(owner: "owner", name: "repo")' in query
+    assert 'r1: repository(owner: "owner", name: "missing")' in query
+    assert nodes["owner/repo"] is INSIGHTS_NODE
+    assert nodes["owner/missing"] is None
+
+
+def test_collector_graphql_backend_uses_rest_for_contributors_only():
+    collector = InsightsCollector("token", transport=MagicMock(), backend="graphql")
+    collector.graphql.fetch_insights_nodes = MagicMock(return_value={"owner/repo": INSIGHTS_NODE})
+    collector._get_contributors_count = MagicMock(return_value=12)
+    collector._get_top_contributors = MagicMock(return_value=[])
+    collector._get_pr_merge_ratio = MagicMock()
+
+    insights = collector.collect_insights("owner/repo")
+
+    assert list(insights) == list(InsightsCollector.METRICS)
+    assert insights["contributors_count"] == 12
+    assert insights["pr_merge_ratio"] == 0.75
+    collector._get_pr_merge_ratio.assert_not_called()
+    collector.close()
+
+
+def test_gem_analyzer_runs_on_graphql_snapshot():
+    backend, transport = _backend_returning({"r0": ANALYSIS_NODE})
+    analyzer = GemAnalyzer(backend)
+
+    result = analyzer.analyze_repo("owner/repo")
+    repo = backend.get_repo("owner/repo")
+
+    assert result is not None
+    assert result["repo"] == "owner/repo"
+    assert result["data"]["quality"]["has_tests"]
+    assert result["data"]["quality"]["has_ci_cd"]
+    assert repo.open_issues_count == 5
+    assert [c.name for c in repo.get_contents("")] == ["tests", "Cargo.toml"]
+    assert analyzer.has_red_flags(repo) == (False, [])
+    # Snapshot is fetched once and reused
+    assert transport.post.call_count == 1
+
+
+def test_graphql_repo_missing_paths_raise():
+    backend, _ = _backend_returning({"r0": ANALYSIS_NODE})
+    repo = backend.get_repo("owner/repo")
+
+    try:
+        repo.get_contents("docs")
+        assert False, "expected GraphQLObjectMissing"
+    except GraphQLObjectMissing:
+        pass
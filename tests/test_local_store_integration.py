@@ -1,6 +1,7 @@
 
 import sys
 import os
+import stat
 import shutil
 from pathlib import Path
 import pytest
@@ -8,6 +9,7 @@ import pytest
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from persistence import local_store
 from persistence.local_store import LocalStore
 
 @pytest.fixture
@@ -58,3 +60,112 @@ def test_list_investigations(temp_store_dir):
 
     items = store.list_investigations()
     assert "owner/test-repo" in items
+
+def _save(store, name, language, stars, commit):
+    store.save_investigation(
+        {
+            "name": name.split("/")[1],
+            "full_name": name,
+            "stargazers_count": stars,
+            "language": language,
+            "latest_commit_hash": commit,
+        },
+        {"content": f"Analysis of {name}"},
+    )
+
+def test_index_answers_queries(tmp_path):
+    store = LocalStore(storage_dir=str(tmp_path))
+    _save(store, "owner/fast_rs", "Rust", 500, "a1")
+    _save(store, "owner/big-rs", "Rust", 900, "b1")
+    _save(store, "owner/py", "Python", 1000, "c1")
+
+    top = store.query_investigations(language="Rust", limit=1)
+    assert [r["repo_full_name"] for r in top] == ["owner/big-rs"]
+
+    # Underscores in repo names survive (the file name would mangle them)
+    assert "owner/fast_rs" in store.list_investigations()
+
+    current = {"owner/fast_rs": "a1", "owner/big-rs": "b2", "owner/unknown": "x"}
+    assert store.outdated_investigations(current) == ["owner/big-rs"]
+
+def test_index_is_rebuilt_from_markdown(tmp_path):
+    store = LocalStore(storage_dir=str(tmp_path))
+    _save(store, "owner/one", "Go", 10, "a")
+    _save(store, "owner/two", "Go", 20, "b")
+    store.index.close()
+
+    # Losing the index loses nothing: Markdown is the source of truth
+    (tmp_path / LocalStore.INDEX_FILE).unlink()
+    reopened = LocalStore(storage_dir=str(tmp_path))
+
+    assert reopened.list_investigations() == ["owner/one", "owner/two"]
+    assert reopened.query_investigations(language="go")[0]["stars"] == 20
+
+def test_index_catches_up_with_files_changed_behind_its_back(tmp_path):
+    store = LocalStore(storage_dir=str(tmp_path))
+    _save(store, "owner/one", "Go", 10, "a")
+    _save(store, "owner/two", "Go", 20, "b")
+    store.index.close()
+
+    # Reopening with nothing changed reads no files
+    assert LocalStore(storage_dir=str(tmp_path)).refresh_index() == 0
+
+    # Same number of files, but one edited, one replaced by another
+    edited = tmp_path / "owner_one.md"
+    edited.write_text(edited.read_text(encoding="utf-8").replace("stars: 10", "stars: 11"), encoding="utf-8")
+    replacement = LocalStore(storage_dir=str(tmp_path / "elsewhere"), use_index=False)
+    _save(replacement, "owner/three", "Go", 30, "c")
+    (tmp_path / "owner_two.md").unlink()
+    (tmp_path / "elsewhere" / "owner_three.md").rename(tmp_path / "owner_three.md")
+
+    reopened = LocalStore(storage_dir=str(tmp_path))
+
+    assert reopened.list_investigations() == ["owner/one", "owner/three"]
+    assert [r["stars"] for r in reopened.query_investigations(order_by="repo_full_name", descending=False)] == [11, 30]
+
+def _repo(i):
+    return {"name": f"repo{i}", "full_name": f"owner/repo{i}", "stargazers_count": i, "latest_commit_hash": "abc"}
+
+def test_unchanged_investigations_are_not_rewritten(tmp_path, monkeypatch):
+    store = LocalStore(storage_dir=str(tmp_path))
+    items = [(_repo(i), {"content": f"analysis {i}"}) for i in range(20)]
+    paths = store.save_many(items, max_workers=4)
+    assert len(paths) == 20 and all(os.path.exists(p) for p in paths)
+
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda src, dst: (replaced.append(dst), real_replace(src, dst)))
+
+    # Re-running the analysis on unchanged repos writes nothing
+    assert store.save_many(items) == paths
+    assert store.save_investigation(*items[0]) == paths[0]
+    assert replaced == []
+
+    store.save_investigation(_repo(0), {"content": "new analysis"})
+    assert len(replaced) == 1
+    assert store.get_investigation("owner/repo0")["content"].strip() == "new analysis"
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    store = LocalStore(storage_dir=str(tmp_path))
+    path = store.save_investigation(_repo(1), {"content": "original"})
+
+    def crash(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", crash)
+
+    with pytest.raises(OSError):
+        store.save_investigation(_repo(1), {"content": "changed"})
+
+    assert store.get_investigation("owner/repo1")["content"].strip() == "original"
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_saved_files_keep_normal_permissions(tmp_path):
+    store = LocalStore(storage_dir=str(tmp_path))
+    path = Path(store.save_investigation(_repo(1), {"content": "first"}))
+    assert stat.S_IMODE(path.stat().st_mode) == local_store.NEW_FILE_MODE
+
+    # A rewrite keeps whatever mode the file had
+    os.chmod(path, 0o640)
+    store.save_investigation(_repo(1), {"content": "second"})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
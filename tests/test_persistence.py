@@ -4,6 +4,7 @@ Unit tests for Firebase persistence module.
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from google.api_core import exceptions as google_exceptions
 from src.persistence.firebase_store import FirebaseStore
 
 
@@ -206,3 +207,166 @@ class TestFirebaseStore:
         assert len(result) == 2
         assert result[0]["repo_name"] == "owner/repo1"
         assert result[1]["repo_name"] == "owner/repo2"
+
+    def _setup_processed(self, mock_firebase, names):
+        collection = mock_firebase['collection']
+        collection.document.side_effect = lambda name: MagicMock(path=f"processed_repos/{name}")
+        docs = []
+        for name in names:
+            doc = MagicMock()
+            doc.to_dict.return_value = {"repo_name": name}
+            docs.append(doc)
+        collection.select.return_value.stream.return_value = docs
+
+        def get_all(refs):
+            return [MagicMock(exists=ref.path.split("/", 1)[1] in names, reference=ref) for ref in refs]
+        mock_firebase['db'].get_all.side_effect = get_all
+
+    def test_filter_unprocessed_confirms_only_bloom_hits(self, firebase_store, mock_firebase):
+        """Names the Bloom filter never saw need no Firestore read."""
+        self._setup_processed(mock_firebase, ["owner/done"])
+
+        result = firebase_store.filter_unprocessed(["owner/new", "owner/done", "owner/other"])
+
+        assert result == ["owner/new", "owner/other"]
+        mock_firebase['db'].get_all.assert_called_once()
+        refs = mock_firebase['db'].get_all.call_args[0][0]
+        assert [ref.path for ref in refs] == ["processed_repos/owner/done"]
+
+    def test_filter_unprocessed_sees_saved_repos(self, firebase_store, mock_firebase):
+        """save_repo keeps the Bloom filter current."""
+        self._setup_processed(mock_firebase, [])
+        assert firebase_store.filter_unprocessed(["owner/repo"]) == ["owner/repo"]
+        mock_firebase['db'].get_all.assert_not_called()
+
+        firebase_store.save_repo("owner/repo", {})
+
+        assert "owner/repo" in firebase_store._processed_filter
+        # Now a possible hit: confirmed with a batched read
+        firebase_store.filter_unprocessed(["owner/repo"])
+        mock_firebase['db'].get_all.assert_called_once()
+
+    def test_warm_up_builds_the_filter_once(self, firebase_store, mock_firebase):
+        select = mock_firebase['collection'].select
+        select.return_value.stream.return_value = []
+
+        firebase_store.warm_processed_filter().join(timeout=5)
+        firebase_store.filter_unprocessed(["owner/repo"])
+
+        assert firebase_store._processed_filter is not None
+        select.assert_called_once()
+
+    def test_filter_unprocessed_fails_safe(self, firebase_store, mock_firebase):
+        """Read errors leave repos unprocessed, like is_processed."""
+        self._setup_processed(mock_firebase, ["owner/done"])
+        mock_firebase['db'].get_all.side_effect = Exception("Network error")
+
+        assert firebase_store.filter_unprocessed(["owner/done"]) == ["owner/done"]
+
+
+@pytest.fixture
+def write_behind_store(mock_firebase, tmp_path):
+    """FirebaseStore buffering writes (no background flushes during tests)."""
+    creds_file = tmp_path / "creds.json"
+    creds_file.write_text('{"type": "service_account", "project_id": "test"}')
+
+    with patch('src.persistence.firebase_store.credentials.Certificate'), \
+         patch('src.persistence.firebase_store.atexit'):
+        store = FirebaseStore(credentials_path=str(creds_file), write_behind=True, flush_interval=3600)
+    yield store
+    store.close()
+
+
+class TestWriteBehind:
+    """Write-behind buffering of save_repo/update_status."""
+
+    def test_status_transitions_coalesce_into_one_write(self, write_behind_store, mock_firebase):
+        store = write_behind_store
+        store.save_repo("owner/repo", {"description": "Test repo"}, status="pending")
+        store.update_status("owner/repo", status="processing")
+        store.update_status("owner/repo", status="completed", video_url="https://youtu.be/x")
+
+        # Nothing hits Firestore on the critical path
+        mock_firebase['collection'].document.return_value.set.assert_not_called()
+        mock_firebase['db'].batch.assert_not_called()
+        assert store.is_processed("owner/repo")
+
+        assert store.flush() == 1
+        batch = mock_firebase['db'].batch.return_value
+        batch.set.assert_called_once()
+        data = batch.set.call_args[0][1]
+        assert data["status"] == "completed"
+        assert data["video_url"] == "https://youtu.be/x"
+        assert data["description"] == "Test repo"
+        batch.update.assert_not_called()
+        batch.commit.assert_called_once()
+
+    def test_flush_splits_batches_at_firestore_limit(self, write_behind_store, mock_firebase):
+        store = write_behind_store
+        for i in range(FirebaseStore.MAX_BATCH_OPS + 1):
+            store.update_status(f"owner/repo{i}", status="completed")
+
+        assert store.flush() == FirebaseStore.MAX_BATCH_OPS + 1
+        assert mock_firebase['db'].batch.return_value.commit.call_count == 2
+        assert store.flush() == 0
+
+    def test_failed_batch_is_retried_per_document(self, write_behind_store, mock_firebase):
+        store = write_behind_store
+        store.update_status("owner/a", status="completed")
+        store.update_status("owner/b", status="failed", error_message="boom")
+        mock_firebase['db'].batch.return_value.commit.side_effect = Exception("batch rejected")
+
+        assert store.flush() == 2
+        assert mock_firebase['collection'].document.return_value.update.call_count == 2
+
+    def test_writes_that_keep_failing_stay_buffered(self, write_behind_store, mock_firebase):
+        store = write_behind_store
+        store.update_status("owner/a", status="completed")
+        mock_firebase['db'].batch.return_value.commit.side_effect = Exception("batch rejected")
+        document = mock_firebase['collection'].document.return_value
+        document.update.side_effect = Exception("unavailable")
+
+        assert store.flush() == 0
+        assert store.is_processed("owner/a")
+
+        # A newer write made meanwhile wins over the failed one
+        store.update_status("owner/a", status="failed", error_message="boom")
+        document.update.side_effect = None
+        assert store.flush() == 1
+        data = document.update.call_args[0][0]
+        assert data["status"] == "failed" and data["error_message"] == "boom"
+        assert store.flush() == 0
+
+    def test_permanently_failing_write_is_dropped(self, write_behind_store, mock_firebase):
+        store = write_behind_store
+        store.update_status("owner/gone", status="completed")
+        mock_firebase['db'].batch.return_value.commit.side_effect = Exception("batch rejected")
+        document = mock_firebase['collection'].document.return_value
+        document.update.side_effect = google_exceptions.NotFound("no such document")
+        document.get.return_value.exists = False
+
+        assert store.flush() == 0
+        # Not recorded anywhere, so the repo can be picked up again
+        assert not store.is_processed("owner/gone")
+        assert document.update.call_count == 1
+        store.flush()
+        assert document.update.call_count == 1
+
+    def test_transient_failures_are_retried_a_bounded_number_of_times(self, write_behind_store, mock_firebase):
+        store = write_behind_store
+        store.update_status("owner/a", status="completed")
+        mock_firebase['db'].batch.return_value.commit.side_effect = Exception("batch rejected")
+        document = mock_firebase['collection'].document.return_value
+        document.update.side_effect = google_exceptions.ServiceUnavailable("try later")
+
+        for _ in range(FirebaseStore.MAX_FLUSH_ATTEMPTS + 2):
+            store.flush()
+
+        assert document.update.call_count == FirebaseStore.MAX_FLUSH_ATTEMPTS
+        assert not store._is_pending("owner/a")
+
+    def test_close_flushes_buffer(self, write_behind_store, mock_firebase):
+        write_behind_store.save_repo("owner/repo", {})
+        write_behind_store.close()
+
+        mock_firebase['db'].batch.return_value.commit.assert_called_once()
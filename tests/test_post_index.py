@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from blog_generator import post_index as post_index_module
+from blog_generator.markdown_writer import MarkdownWriter
+from blog_generator.post_index import PostIndex
+
+
+def _bundle(root, category, slug, repo):
+    path = root / category / slug / "index.md"
+    path.parent.mkdir(parents=True)
+    path.write_text(f"---\ntitle: {slug}\nrepo: {repo}\n---\n\nBody\n", encoding="utf-8")
+    return path
+
+
+def _count_reads(monkeypatch):
+    reads = []
+    real = post_index_module.load_frontmatter
+    monkeypatch.setattr(post_index_module, "load_frontmatter", lambda p: reads.append(p) or real(p))
+    return reads
+
+
+def test_find_reads_only_changed_posts(tmp_path, monkeypatch):
+    blog = tmp_path / "blog"
+    manifest = tmp_path / "cache" / "post_index.json"
+    first = _bundle(blog, "ai", "one", "Owner/One")
+    _bundle(blog, "ai", "two", "owner/two")
+
+    reads = _count_reads(monkeypatch)
+    assert PostIndex(str(blog), str(manifest)).find("owner/one") == first
+    assert len(reads) == 2
+
+    # A new process with an unchanged tree reads nothing
+    reads.clear()
+    index = PostIndex(str(blog), str(manifest))
+    assert index.find("OWNER/TWO") == blog / "ai" / "two" / "index.md"
+    assert index.find("owner/missing") is None
+    assert reads == []
+
+    # Editing a post re-reads only that post
+    first.write_text("---\nrepo: owner/renamed\n---\n\nLonger body\n", encoding="utf-8")
+    assert index.find("owner/one") is None
+    assert index.find("owner/renamed") == first
+    assert reads == [first]
+
+
+def test_create_post_records_into_index(tmp_path):
+    blog = tmp_path / "blog"
+    writer = MarkdownWriter(output_dir=str(blog), post_index_path=str(tmp_path / "post_index.json"))
+    repo_data = {"full_name": "owner/tool", "name": "tool", "language": "Python", "topics": []}
+    script_data = {"hook": "Hook", "summary": "Summary"}
+
+    path = writer.create_post(repo_data, script_data)
+
+    assert writer._find_existing_post("owner/tool") == Path(path)
+    assert writer.create_post(repo_data, script_data) == path
+    assert len(list(blog.rglob("*.md"))) == 1
+
+
+def test_groups_lists_duplicate_bundles(tmp_path):
+    blog = tmp_path / "blog"
+    _bundle(blog, "ai", "tool", "owner/tool")
+    _bundle(blog, "development", "owner-tool", "owner/tool")
+    _bundle(blog, "ai", "other", "owner/other")
+
+    groups = PostIndex(str(blog), str(tmp_path / "post_index.json")).groups()
+
+    assert len(groups["owner/tool"]) == 2
+    assert len(groups["owner/other"]) == 1
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("redis")
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from redis.exceptions import ResponseError
+
+from api.rate_limit import RateLimiter, window_keys
+
+NOW = 1_700_000_000.0
+TIERS = {"free": (3, 5), "pro": (10, 100)}
+
+
+@pytest.fixture(params=["script", "pipeline"])
+def limiter(request):
+    limiter = RateLimiter(fakeredis.FakeRedis(), TIERS)
+    limiter.scripting = request.param == "script"
+    return limiter
+
+
+def _add_key(limiter, key_hash, tier="free", active="true"):
+    limiter.redis.hset(f"api_key:{key_hash}", mapping={"email": "a@b.c", "tier": tier, "active": active})
+
+
+def test_window_keys():
+    minute_key, day_key = window_keys("abc", NOW)
+
+    assert minute_key == f"rate:abc:minute:{int(NOW // 60)}"
+    assert day_key == "rate:abc:day:2023-11-14"
+
+
+def test_minute_window_denies_without_counting_the_day(limiter):
+    results = [limiter.hit("abc", 3, 5, now=NOW) for _ in range(4)]
+
+    assert results == [(True, 1, 5), (True, 2, 5), (True, 3, 5), (False, 4, 3)]
+    minute_key, day_key = window_keys("abc", NOW)
+    assert int(limiter.redis.get(day_key)) == 3
+    assert 0 < limiter.redis.ttl(minute_key) <= 60
+    assert 0 < limiter.redis.ttl(day_key) <= 86400
+
+
+def test_day_window_denies(limiter):
+    results = [limiter.hit("abc", 3, 5, now=NOW + 60 * i) for i in range(6)]
+
+    assert [allowed for allowed, _, _ in results] == [True] * 5 + [False]
+    assert results[-1] == (False, 6, 5)
+
+
+def test_authorize_unknown_and_inactive_keys_count_nothing(limiter):
+    _add_key(limiter, "revoked", active="false")
+
+    assert limiter.authorize("missing", now=NOW) == (None, None)
+    key_data, rate = limiter.authorize("revoked", now=NOW)
+    assert key_data["active"] == "false" and rate is None
+    assert limiter.redis.keys("rate:*") == []
+
+
+def test_authorize_uses_the_key_tier(limiter):
+    _add_key(limiter, "pro-key", tier="pro")
+    _add_key(limiter, "odd-key", tier="legacy")
+
+    key_data, rate = limiter.authorize("pro-key", now=NOW)
+    assert key_data == {"email": "a@b.c", "tier": "pro", "active": "true"}
+    assert rate == (True, 1, 100)
+
+    # Unknown tiers get the default tier's limits
+    assert limiter.authorize("odd-key", now=NOW)[1] == (True, 1, 5)
+
+
+def test_falls_back_to_pipelines_when_scripts_fail():
+    limiter = RateLimiter(fakeredis.FakeRedis(), TIERS)
+
+    def refuse(**kwargs):
+        raise ResponseError("unknown command 'EVALSHA'")
+
+    limiter._rate_limit = refuse
+    assert limiter.hit("abc", 3, 5, now=NOW) == (True, 1, 5)
+    assert limiter.scripting is False
+
+
+def test_other_script_errors_fall_back_for_one_call():
+    limiter = RateLimiter(fakeredis.FakeRedis(), TIERS)
+    real = limiter._rate_limit
+
+    def busy_once(**kwargs):
+        limiter._rate_limit = real
+        raise ResponseError("BUSY Redis is busy running a script")
+
+    limiter._rate_limit = busy_once
+    assert limiter.hit("abc", 3, 5, now=NOW) == (True, 1, 5)
+    assert limiter.scripting is True
+    assert limiter.hit("abc", 3, 5, now=NOW) == (True, 2, 5)
@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.github_transport import GitHubTransport
+from scanner.rate_limiter import RateLimitScheduler, bucket_for, tokens_from_env
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _response(status=200, headers=None, text=""):
+    response = MagicMock(status_code=status, text=text)
+    response.headers = headers or {}
+    return response
+
+
+def test_bucket_for_url():
+    assert bucket_for("https://api.github.com/search/repositories?q=x") == "search"
+    assert bucket_for("https://api.github.com/graphql") == "graphql"
+    assert bucket_for("https://api.github.com/repos/a/b/pulls") == "core"
+
+
+def test_tokens_from_env_dedupes(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKENS", "t1, t2")
+    monkeypatch.setenv("GITHUB_TOKEN", "t2")
+    monkeypatch.setenv("GH_PAT", "t3")
+    assert tokens_from_env() == ["t1", "t2", "t3"]
+
+
+def test_scheduler_prefers_token_with_most_budget():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(["a", "b"], clock=clock, sleep=clock.sleep)
+    scheduler.update("a", "core", {"X-RateLimit-Remaining": "100", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "4600"})
+    scheduler.update("b", "core", {"X-RateLimit-Remaining": "4000", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "4600"})
+
+    assert scheduler.acquire("core") == "b"
+    # Buckets are tracked separately
+    assert scheduler.acquire("search") in ("a", "b")
+
+
+def test_scheduler_waits_for_reset_when_exhausted():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(["a"], clock=clock, sleep=clock.sleep)
+    scheduler.update("a", "search", {"X-RateLimit-Remaining": "0", "X-RateLimit-Limit": "30", "X-RateLimit-Reset": "1030"})
+
+    assert scheduler.acquire("search") == "a"
+    assert sum(clock.sleeps) == 30
+    assert scheduler.stats()["waits"] == 1
+
+
+def test_secondary_limit_blocks_token_and_retries_with_another():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(["a", "b"], clock=clock, sleep=clock.sleep)
+    transport = GitHubTransport(rate_limiter=scheduler)
+
+    limited = _response(403, {"Retry-After": "120"}, "You have exceeded a secondary rate limit")
+    ok = _response(200, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "4600"})
+
+    with patch("requests.Session.request", side_effect=[limited, ok]) as mock_request:
+        response = transport.get("https://api.github.com/repos/o/r", headers={"Authorization": "token original"})
+
+    assert response is ok
+    used = [call[1]["headers"]["Authorization"] for call in mock_request.call_args_list]
+    assert used[0] != used[1]
+    assert all(header.startswith("token ") for header in used)
+    assert scheduler.stats()["secondary_limits"] == 1
+
+
+def test_plain_403_is_not_a_rate_limit():
+    scheduler = RateLimitScheduler(["a"])
+    assert not scheduler.is_rate_limited("a", "core", _response(403, {}, "Resource not accessible"))
+
+
+def test_not_modified_responses_do_not_spend_budget():
+    clock = FakeClock()
+    scheduler = RateLimitScheduler(["a"], clock=clock, sleep=clock.sleep)
+    transport = GitHubTransport(rate_limiter=scheduler)
+    headers = {"X-RateLimit-Remaining": "4000", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "4600"}
+    scheduler.update("a", "core", headers)
+
+    # GitHub's count stays the same on every 304
+    with patch("requests.Session.request", return_value=_response(304, headers)):
+        for _ in range(3):
+            transport.get("https://api.github.com/repos/o/r", headers={"If-None-Match": '"etag"'})
+
+    assert scheduler._budget("a", "core").remaining == 4000
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from api.repo_index import RepoIndex, encode_cursor
+
+LANGUAGES = ["Python", "Rust", "Go", "TypeScript"]
+CATEGORIES = ["AI", "DevOps", "Web", "CLI", "Data"]
+
+
+def _repos(count=300, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "full_name": f"owner{i % 17}/repo{i}",
+            "language": rng.choice(LANGUAGES),
+            "categories": rng.sample(CATEGORIES, rng.randint(0, 2)),
+            # Narrow ranges so there are plenty of ties
+            "score": rng.randint(0, 10),
+            "stargazers_count": rng.randint(0, 50),
+            "updated_at": f"2025-0{rng.randint(1, 9)}-01",
+        }
+        for i in range(count)
+    ]
+
+
+def _brute_force(repos, language=None, category=None, min_score=None, sort_by="score", order="desc"):
+    """The filter/sort list_repos used to run on every request."""
+    repos = list(repos)
+    if language:
+        repos = [r for r in repos if r.get("language", "").lower() == language.lower()]
+    if min_score:
+        repos = [r for r in repos if r.get("score", 0) >= min_score]
+    if category:
+        repos = [r for r in repos if category.lower() in [c.lower() for c in r.get("categories", [])]]
+    reverse = order.lower() == "desc"
+    if sort_by == "stars":
+        repos.sort(key=lambda x: x.get("stargazers_count", 0), reverse=reverse)
+    elif sort_by == "updated":
+        repos.sort(key=lambda x: x.get("updated_at", ""), reverse=reverse)
+    else:
+        repos.sort(key=lambda x: x.get("score", 0), reverse=reverse)
+    return repos
+
+
+FILTERS = [
+    {},
+    {"language": "python"},
+    {"category": "ai"},
+    {"min_score": 7},
+    {"language": "Rust", "category": "Web", "min_score": 3},
+    {"language": "Cobol"},
+    # Few passing repos: taken from the score order instead of walking
+    {"category": "Data", "min_score": 10},
+    {"min_score": 11},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("sort_by", ["score", "stars", "updated", "bogus"])
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_pages_match_brute_force(filters, sort_by, order):
+    repos = _repos()
+    index = RepoIndex(repos)
+    expected = _brute_force(repos, sort_by=sort_by, order=order, **filters)
+
+    for page in (1, 2, 5):
+        per_page = 20
+        ids, total, _ = index.page(
+            sort_by=sort_by, descending=order == "desc",
+            offset=(page - 1) * per_page, limit=per_page, **filters
+        )
+        assert total == len(expected)
+        assert [repos[i] for i in ids] == expected[(page - 1) * per_page:page * per_page]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_cursor_walk_covers_every_match_once(filters):
+    repos = _repos()
+    index = RepoIndex(repos)
+    expected = _brute_force(repos, sort_by="stars", **filters)
+
+    seen = []
+    cursor = None
+    while True:
+        ids, _, cursor = index.page(sort_by="stars", limit=7, cursor=cursor, **filters)
+        seen.extend(repos[i] for i in ids)
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_cursor_survives_removed_repo():
+    repos = _repos()
+    index = RepoIndex(repos)
+    ids, _, cursor = index.page(sort_by="score", limit=10)
+    last = repos[ids[-1]]
+
+    remaining = [repo for repo in repos if repo is not last]
+    ids, _, _ = RepoIndex(remaining).page(sort_by="score", limit=5, cursor=cursor)
+
+    # Resumes after every repo sorting at or before the removed one
+    assert all(remaining[i]["score"] < last["score"] for i in ids)
+
+
+def test_invalid_cursors_are_rejected():
+    index = RepoIndex(_repos(10))
+
+    with pytest.raises(ValueError):
+        index.page(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        index.page(sort_by="score", cursor=encode_cursor("stars", True, 3, "owner1/repo1"))
+
+
+def test_pages_before_the_first_are_empty():
+    ids, total, cursor = RepoIndex(_repos(10)).page(offset=-20, limit=20)
+
+    assert ids == [] and total == 10 and cursor is None
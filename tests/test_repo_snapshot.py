@@ -0,0 +1,190 @@
+import sys
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from github.PaginatedList import PaginatedList
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.repo_snapshot import RepoSnapshot
+from scanner.gem_analyzer import GemAnalyzer
+
+
+def _entry(name, type_="file"):
+    entry = MagicMock(type=type_)
+    entry.name = name
+    return entry
+
+
+def _mock_repo():
+    repo = MagicMock()
+    repo.full_name = "owner/repo"
+    repo.stargazers_count = 50
+    repo.forks_count = 5
+    repo.language = "Python"
+    repo.created_at = datetime.now(timezone.utc) - timedelta(days=300)
+    repo.updated_at = datetime.now(timezone.utc)
+    repo.get_contents.side_effect = lambda path: (
+        [_entry("tests", "dir"), _entry("setup.py"), _entry("README.md")] if path == ""
+        else [_entry("ci.yml")]
+    )
+    repo.get_readme.side_effect = Exception("404 README")
+    repo.get_commits.return_value = []
+    repo.get_issues.return_value = []
+    repo.get_pulls.return_value = []
+    repo.get_releases.return_value = []
+    return repo
+
+
+def test_snapshot_memoizes_calls_per_arguments():
+    repo = _mock_repo()
+    snapshot = RepoSnapshot(repo)
+
+    assert snapshot.get_contents("") is snapshot.get_contents("")
+    snapshot.get_contents(".github/workflows")
+
+    assert repo.get_contents.call_count == 2
+    assert snapshot.fetch_count == 2
+    # Plain attributes pass through
+    assert snapshot.full_name == "owner/repo"
+
+
+def test_snapshot_memoizes_exceptions():
+    repo = _mock_repo()
+    snapshot = RepoSnapshot(repo)
+
+    for _ in range(2):
+        try:
+            snapshot.get_readme()
+            assert False, "expected the README error"
+        except Exception as e:
+            assert "404" in str(e)
+
+    assert repo.get_readme.call_count == 1
+
+
+class _Item:
+    def __init__(self, requester, headers, element, completed):
+        self.value = element
+
+
+class _SlowPages:
+    """Requester serving five pages of two items, slowly enough to overlap."""
+
+    per_page = 2
+
+    def __init__(self):
+        self.calls = 0
+
+    def requestJsonAndCheck(self, verb, url, parameters=None, headers=None):
+        self.calls += 1
+        page = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+        time.sleep(0.01)
+        links = {"link": f'<https://api.test/items?page={page + 1}>; rel="next"'} if page < 5 else {}
+        return links, [page * 10, page * 10 + 1]
+
+
+def test_snapshot_paginated_lists_are_shared_safely():
+    requester = _SlowPages()
+    repo = MagicMock()
+    repo.get_commits.side_effect = lambda: PaginatedList(_Item, requester, "https://api.test/items", None)
+    snapshot = RepoSnapshot(repo)
+    expected = [10, 11, 20, 21, 30, 31, 40, 41, 50, 51]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append([c.value for c in snapshot.get_commits()]))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [expected] * 8
+    assert [c.value for c in snapshot.get_commits()[:3]] == expected[:3]
+    # Every page was fetched once, whichever thread got there first
+    assert requester.calls == 5
+
+
+def test_analyzer_fetches_each_resource_once():
+    repo = _mock_repo()
+    snapshot = RepoSnapshot(repo)
+    analyzer = GemAnalyzer(MagicMock())
+
+    analyzer.has_red_flags(snapshot)
+    result = analyzer.analyze_repo("owner/repo", repo=snapshot)
+
+    assert result is not None
+    # Root tree is read by code quality, language specifics and maturity
+    assert [c.args for c in repo.get_contents.call_args_list].count(("",)) == 1
+    assert repo.get_readme.call_count == 1
+    analyzer.client.get_repo.assert_not_called()
+
+
+def test_analyzer_runs_sub_analyses_concurrently():
+    import threading
+
+    barrier = threading.Barrier(len(GemAnalyzer.SUB_ANALYSES), timeout=5)
+    analyzer = GemAnalyzer(MagicMock())
+    for name in GemAnalyzer.SUB_ANALYSES:
+        # Each sub-analysis only returns once all four are running
+        setattr(analyzer, name, lambda repo: (barrier.wait(), (50.0, {}))[1])
+
+    result = analyzer.analyze_repo("owner/repo", repo=_mock_repo())
+    analyzer.close()
+
+    assert result["total_score"] == 50.0
+
+
+def _issue(number, created, comments):
+    issue = MagicMock(number=number, created_at=created, comments=comments)
+    issue.get_comments.return_value = [MagicMock(created_at=created + timedelta(days=number))]
+    return issue
+
+
+def _comment(number, created):
+    return MagicMock(issue_url=f"https://api.github.com/repos/owner/repo/issues/{number}", created_at=created)
+
+
+def test_engagement_joins_bulk_comments_to_issues():
+    base = datetime.now(timezone.utc) - timedelta(days=60)
+    repo = _mock_repo()
+    repo.open_issues_count = 2
+    issues = [_issue(1, base, 2), _issue(2, base + timedelta(days=1), 1), _issue(3, base, 0)]
+    repo.get_issues.return_value = issues
+    repo.get_issues_comments.return_value = [
+        _comment(1, base + timedelta(days=1)),
+        _comment(9, base + timedelta(days=2)),   # an issue outside the sample
+        _comment(1, base + timedelta(days=3)),   # not the first comment
+        _comment(2, base + timedelta(days=5)),
+    ]
+
+    _, data = GemAnalyzer(MagicMock())._analyze_engagement(RepoSnapshot(repo))
+
+    # (1 + 4) / 2 days, same as the per-issue path
+    assert data["avg_response_days"] == 2.5
+    assert data["closed_ratio"] == 0.6
+    assert repo.get_issues_comments.call_count == 1
+    assert repo.get_issues_comments.call_args[1]["since"] == base
+    for issue in issues:
+        issue.get_comments.assert_not_called()
+
+
+def test_engagement_falls_back_per_issue_for_missing_comments():
+    base = datetime.now(timezone.utc) - timedelta(days=60)
+    repo = _mock_repo()
+    repo.open_issues_count = 0
+    issues = [_issue(1, base, 1), _issue(2, base, 1)]
+    repo.get_issues.return_value = issues
+    repo.get_issues_comments.return_value = [_comment(1, base + timedelta(days=1))]
+
+    _, data = GemAnalyzer(MagicMock())._analyze_engagement(RepoSnapshot(repo))
+
+    issues[0].get_comments.assert_not_called()
+    issues[1].get_comments.assert_called_once()
+    assert data["avg_response_days"] == 1.5
@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.rust_bridge import iter_json_records
+
+
+def _fake_scanner(script):
+    """Command running ``script`` as a stand-in for the Rust binary."""
+    return [sys.executable, "-u", "-c", script]
+
+
+def test_streams_jsonl_records_before_exit():
+    script = (
+        "import sys, time\n"
+        "print('{\"full_name\": \"a/one\"}', flush=True)\n"
+        "print('log noise', file=sys.stderr, flush=True)\n"
+        "time.sleep(5)\n"
+        "print('{\"full_name\": \"b/two\"}', flush=True)\n"
+    )
+    started = time.monotonic()
+    records = iter_json_records(_fake_scanner(script), dict(os.environ), timeout=30)
+
+    first = next(records)
+    assert first == {"full_name": "a/one"}
+    # The first record arrives without waiting for the process to finish
+    assert time.monotonic() - started < 4
+    records.close()
+
+
+def test_accepts_legacy_marker_block():
+    script = (
+        "print('starting')\n"
+        "print('__REPO_JSON__')\n"
+        "print('[{\"full_name\": \"a/one\"},')\n"
+        "print(' {\"full_name\": \"b/two\"}]')\n"
+        "print('__END_JSON__')\n"
+    )
+    records = list(iter_json_records(_fake_scanner(script), dict(os.environ), timeout=30))
+
+    assert [r["full_name"] for r in records] == ["a/one", "b/two"]
+
+
+def test_timeout_kills_scanner():
+    script = "import time\nprint('{\"full_name\": \"a/one\"}', flush=True)\ntime.sleep(30)\n"
+    records = iter_json_records(_fake_scanner(script), dict(os.environ), timeout=1)
+
+    assert next(records)["full_name"] == "a/one"
+    with pytest.raises(subprocess.TimeoutExpired):
+        next(records)
+
+
+FAKE_WORKER = '''
+import json, os, sys
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get("query") == "boom":
+        print(json.dumps({"id": request["id"], "error": "search failed"}), flush=True)
+        continue
+    count = request.get("max_results", 3)
+    for i in range(count):
+        repo = {"full_name": f"owner/repo{i}", "pid": os.getpid(), "query": request.get("query")}
+        print(json.dumps({"id": request["id"], "repo": repo}), flush=True)
+    print(json.dumps({"id": request["id"], "done": True, "count": count}), flush=True)
+'''
+
+
+@pytest.fixture
+def worker(tmp_path):
+    from scanner.rust_bridge import RustScannerWorker
+
+    binary = tmp_path / "fake-scanner"
+    binary.write_text(f"#!{sys.executable}\n" + FAKE_WORKER)
+    binary.chmod(0o755)
+
+    worker = RustScannerWorker("token")
+    worker.rust_binary = binary
+    yield worker
+    worker.close()
+
+
+def test_worker_reuses_one_process_across_requests(worker):
+    first = list(worker.iter_repos(max_results=2, query="stars:>10"))
+    second = list(worker.iter_repos(max_results=1))
+
+    assert [r["full_name"] for r in first] == ["owner/repo0", "owner/repo1"]
+    assert first[0]["query"] == "stars:>10"
+    assert len(second) == 1
+    assert first[0]["pid"] == second[0]["pid"]
+    assert worker.scan_and_find_repo()["pid"] == first[0]["pid"]
+
+
+def test_worker_reports_errors_and_restarts(worker):
+    with pytest.raises(RuntimeError, match="search failed"):
+        list(worker.iter_repos(query="boom"))
+
+    pid = next(worker.iter_repos())["pid"]
+    worker._process.kill()
+    worker._process.wait()
+
+    assert next(worker.iter_repos())["pid"] != pid
+
+
+def test_binary_without_serve_falls_back_without_waiting_again(tmp_path, monkeypatch):
+    from scanner import rust_bridge
+
+    # An old one-shot binary: ignores --serve, prints its result and exits
+    binary = tmp_path / "old-scanner"
+    starts = tmp_path / "starts"
+    binary.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        f"open({str(starts)!r}, 'a').write(' '.join(sys.argv[1:]) + '\\n')\n"
+        "print(json.dumps({'full_name': 'owner/oneshot'}), flush=True)\n"
+    )
+    binary.chmod(0o755)
+
+    worker = rust_bridge.RustScannerWorker("token")
+    worker.rust_binary = binary
+    monkeypatch.setattr(rust_bridge, "_no_serve", set())
+    try:
+        started = time.monotonic()
+        assert [r["full_name"] for r in worker.iter_repos()] == ["owner/oneshot"]
+        assert [r["full_name"] for r in worker.iter_repos()] == ["owner/oneshot"]
+        # Exiting without the ready line fails fast, not after READY_TIMEOUT
+        assert time.monotonic() - started < worker.READY_TIMEOUT
+
+        assert starts.read_text().split("\n")[:-1] == ["--serve", "--jsonl", "--jsonl"]
+    finally:
+        worker.close()
@@ -0,0 +1,170 @@
+import datetime
+from unittest.mock import patch, MagicMock
+
+from src.scanner.github_scanner import GitHubScanner
+from src.scanner.scan_state import ScanState
+
+
+def _repo(i, pushed_at):
+    return {"full_name": f"user/repo{i}", "name": f"repo{i}", "pushed_at": pushed_at}
+
+
+def _search(items, calls):
+    def get(url, headers=None):
+        calls.append(url)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"total_count": len(items), "items": list(items)}
+        return response
+    return get
+
+
+def _scan(scanner, state, items, calls, limit=10, consume=None):
+    """Scan, then mark the first ``consume`` accepted repos (all by default) as the caller would."""
+    with patch.object(scanner.transport, "get", side_effect=_search(items, calls)), \
+         patch.object(scanner, "validate_repo_basic", return_value=True), \
+         patch.object(scanner.insights_collector, "collect_insights", return_value={}) as collect, \
+         patch.object(scanner.classifier, "classify_repo", return_value={"is_real_project": True, "score": 80}):
+        repos = scanner.scan_recent_repos(limit=limit, scan_state=state)
+    for repo in repos[:consume]:
+        state.mark(repo)
+    state.save()
+    return repos, collect
+
+
+def test_state_round_trips_through_disk(tmp_path):
+    path = tmp_path / "state.json"
+    state = ScanState(str(path))
+    moment = datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+    state.mark(_repo(1, "2024-05-01T00:00:00Z"))
+    state.advance(moment)
+    state.save()
+
+    reloaded = ScanState(str(path))
+    assert reloaded.since() == moment
+    assert reloaded.is_unchanged(_repo(1, "2024-05-01T00:00:00Z"))
+    assert not reloaded.is_unchanged(_repo(1, "2024-06-01T00:00:00Z"))
+
+
+def test_second_cycle_skips_unchanged_repos(tmp_path):
+    state = ScanState(str(tmp_path / "state.json"))
+    scanner = GitHubScanner(token="mock_token")
+    items = [_repo(i, "2024-05-01T00:00:00Z") for i in range(3)]
+
+    calls = []
+    repos, collect = _scan(scanner, state, items, calls)
+    assert len(repos) == 3
+    assert "pushed%3A" in calls[0] or "pushed:" in calls[0]
+    # Accepted repos were only handled after the scan returned
+    assert state.watermark is None
+
+    # Next cycle: nothing new, so the sweep settles and the watermark moves
+    repos, collect = _scan(scanner, ScanState(str(tmp_path / "state.json")), items, [])
+    assert repos == [] and collect.call_count == 0
+    watermark = ScanState(str(tmp_path / "state.json")).watermark
+    assert watermark is not None
+
+    # Then only repo1 is pushed again
+    items[1] = _repo(1, "2024-05-02T00:00:00Z")
+    calls = []
+    repos, collect = _scan(scanner, ScanState(str(tmp_path / "state.json")), items, calls)
+
+    assert [r["full_name"] for r in repos] == ["user/repo1"]
+    assert collect.call_count == 1
+    # The search starts at the previous watermark
+    assert watermark.strftime("%Y-%m-%dT%H:%M:%SZ") in calls[0].replace("%3A", ":")
+
+
+def test_watermark_holds_until_the_sweep_is_exhausted(tmp_path):
+    state = ScanState(str(tmp_path / "state.json"))
+    scanner = GitHubScanner(token="mock_token")
+    items = [_repo(i, "2024-05-01T00:00:00Z") for i in range(5)]
+
+    repos, _ = _scan(scanner, state, items, [], limit=2, consume=0)
+
+    assert len(repos) == 2
+    assert state.watermark is None
+    # Accepted repos are left for the caller to mark
+    assert not any(state.is_unchanged(item) for item in items)
+
+
+def _hourly_search(items):
+    """Search over ``items`` by pushed window; anything wider than an hour exceeds the cap."""
+    def get(url, headers=None):
+        window = url.replace("%3A", ":").split("pushed:")[1].split("&")[0].split("+")[0]
+        start, end = (_time(x) for x in window.split(".."))
+        hits = [r for r in items if start <= _time(r["pushed_at"]) <= end]
+        response = MagicMock(status_code=200)
+        total = len(hits) if end - start <= datetime.timedelta(hours=1) else 5000
+        response.json.return_value = {"total_count": total, "items": hits if total == len(hits) else []}
+        return response
+    return get
+
+
+def _time(text):
+    return datetime.datetime.strptime(text, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=datetime.timezone.utc)
+
+
+def _hourly_items(base, count=16):
+    # Four repos per hour
+    return [
+        _repo(i, (base + datetime.timedelta(minutes=15 * i + 1)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        for i in range(count)
+    ]
+
+
+def _nothing_below_watermark_is_lost(state, items):
+    return state.watermark is None or all(
+        state.is_unchanged(r) for r in items if _time(r["pushed_at"]) <= state.watermark
+    )
+
+
+def test_watermark_advances_past_completed_windows(tmp_path):
+    """A sweep cut short by ``limit`` still moves past the windows it finished."""
+    base = datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+    until = base + datetime.timedelta(hours=4)
+    items = _hourly_items(base)
+
+    state = ScanState(str(tmp_path / "state.json"))
+    scanner = GitHubScanner(token="mock_token")
+    with patch.object(scanner.transport, "get", side_effect=_hourly_search(items)), \
+         patch.object(scanner, "validate_repo_basic", return_value=True), \
+         patch.object(scanner.insights_collector, "collect_insights", return_value={}), \
+         patch.object(scanner.classifier, "classify_repo", return_value={"is_real_project": True, "score": 80}):
+        first = scanner.scan_recent_repos(limit=6, since=base, until=until, scan_state=state)
+        # Oldest first; nothing is settled until the caller handles the repos
+        assert [r["full_name"] for r in first] == [f"user/repo{i}" for i in range(6)]
+        assert state.watermark is None
+        for repo in first:
+            state.mark(repo)
+
+        second = scanner.scan_recent_repos(limit=6, since=base, until=until, scan_state=state)
+        assert [r["full_name"] for r in second] == [f"user/repo{i}" for i in range(6, 12)]
+        # The first hour is done; the second still holds unhandled repos
+        assert state.watermark == base + datetime.timedelta(hours=1)
+        assert _nothing_below_watermark_is_lost(state, items)
+
+
+def test_repos_the_caller_did_not_handle_come_back(tmp_path):
+    base = datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+    until = base + datetime.timedelta(hours=4)
+    items = _hourly_items(base)
+
+    state = ScanState(str(tmp_path / "state.json"))
+    scanner = GitHubScanner(token="mock_token")
+    handled = []
+    with patch.object(scanner.transport, "get", side_effect=_hourly_search(items)), \
+         patch.object(scanner, "validate_repo_basic", return_value=True), \
+         patch.object(scanner.insights_collector, "collect_insights", return_value={}), \
+         patch.object(scanner.classifier, "classify_repo", return_value={"is_real_project": True, "score": 80}):
+        for _ in range(len(items) + 1):
+            repos = scanner.scan_recent_repos(limit=3, since=state.watermark or base, until=until,
+                                              scan_state=state)
+            if not repos:
+                break
+            # The caller gets through only one accepted repo per run
+            handled.append(repos[0]["full_name"])
+            state.mark(repos[0])
+            assert _nothing_below_watermark_is_lost(state, items)
+
+    # Every repo was handed to the caller until it was handled, none skipped
+    assert handled == [r["full_name"] for r in items]
@@ -8,7 +8,7 @@ class TestGitHubScanner:
     def scanner(self):
         return GitHubScanner(token="mock_token")
 
-    @patch("src.scanner.github_scanner.requests.get")
+    @patch("src.scanner.github_transport.GitHubTransport.get")
     def test_scan_recent_repos_success(self, mock_get, scanner):
         # Mock response
         mock_response = MagicMock()
@@ -31,7 +31,7 @@ class TestGitHubScanner:
             assert repos[0]["name"] == "repo1"
             mock_get.assert_called_once()
 
-    @patch("src.scanner.github_scanner.requests.get")
+    @patch("src.scanner.github_transport.GitHubTransport.get")
     def test_scan_recent_repos_failure(self, mock_get, scanner):
         mock_response = MagicMock()
         mock_response.status_code = 403
@@ -69,3 +69,65 @@ class TestGitHubScanner:
             "name": "bad"
         }
         assert scanner.validate_repo(bad_repo) is False
+
+
+def _fake_search(created_times):
+    """Search endpoint stand-in over repos created at ``created_times``."""
+    import datetime
+    import re
+    from urllib.parse import unquote
+
+    calls = []
+
+    def get(url, headers=None):
+        calls.append(url)
+        q = unquote(re.search(r"q=([^&]*)", url).group(1))
+        lo, hi = re.search(r"created:(\S+)\.\.(\S+)", q).groups()
+        parse = lambda s: datetime.datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=datetime.timezone.utc)
+        lo, hi = parse(lo), parse(hi)
+        page = int(re.search(r"page=(\d+)", url.split("per_page")[1]).group(1))
+        per_page = int(re.search(r"per_page=(\d+)", url).group(1))
+
+        matches = [i for i, t in enumerate(created_times) if lo <= t <= hi]
+        visible = matches[:1000]
+        items = [{"full_name": f"user/repo{i}", "name": f"repo{i}"} for i in visible[(page - 1) * per_page:page * per_page]]
+
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"total_count": len(matches), "items": items}
+        return response
+
+    return get, calls
+
+
+def test_sharded_search_sweeps_past_the_result_cap():
+    import datetime
+
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    created = [start + datetime.timedelta(seconds=30 * i) for i in range(2500)]
+    get, calls = _fake_search(created)
+
+    scanner = GitHubScanner(token="mock_token")
+    with patch.object(scanner.transport, "get", side_effect=get):
+        names = [r["full_name"] for r in scanner.iter_search_results("language:rust", start, created[-1])]
+
+    assert len(names) == len(set(names)) == 2500
+    assert all("language%3Arust" in url or "language:rust" in url for url in calls)
+
+
+def test_scan_recent_repos_with_since_reads_stream_lazily():
+    import datetime
+
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    created = [start + datetime.timedelta(seconds=i) for i in range(500)]
+    get, calls = _fake_search(created)
+
+    scanner = GitHubScanner(token="mock_token")
+    with patch.object(scanner.transport, "get", side_effect=get), \
+         patch.object(scanner, "validate_repo_basic", return_value=True), \
+         patch.object(scanner.insights_collector, "collect_insights", return_value={}), \
+         patch.object(scanner.classifier, "classify_repo", return_value={"is_real_project": True, "score": 80}):
+        repos = scanner.scan_recent_repos(limit=3, since=start, until=created[-1])
+
+    assert len(repos) == 3
+    # Only the first page of the sweep was needed
+    assert len(calls) == 1
@@ -1,3 +1,4 @@
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 import sys
@@ -15,7 +16,7 @@ class TestScannerEnhanced(unittest.TestCase):
         self.token = "fake_token"
         self.scanner = GitHubScanner(self.token)
 
-    @patch("scanner.github_scanner.requests.get")
+    @patch("scanner.github_transport.GitHubTransport.get")
     def test_scan_recent_repos_flow(self, mock_get):
         # Mock search response
         mock_search_resp = MagicMock()
@@ -112,6 +113,62 @@ class TestScannerEnhanced(unittest.TestCase):
         self.assertTrue(good["analysis"]["is_real_project"])
         self.assertGreater(good["analysis"]["score"], 60)
 
+    @patch("scanner.github_transport.GitHubTransport.get")
+    def test_collect_insights_runs_metrics_concurrently(self, mock_get):
+        # Every metric request waits until all seven are in flight; a
+        # sequential collector would time out and fall back to defaults.
+        barrier = threading.Barrier(len(InsightsCollector.METRICS), timeout=5)
+
+        def side_effect(url, headers):
+            barrier.wait()
+            m = MagicMock()
+            m.status_code = 200
+            m.headers = {}
+            if "stats/participation" in url:
+                m.json.return_value = {"all": [10, 10, 10, 10]}
+            elif "community/profile" in url:
+                m.json.return_value = {"health_percentage": 80}
+            elif "pulls" in url:
+                m.json.return_value = [{"merged_at": "2024-01-01"}]
+            elif "commits/HEAD" in url:
+                m.json.return_value = {"commit": {"committer": {"date": "2024-01-01T00:00:00Z"}}}
+            elif "contributors" in url:
+                m.json.return_value = [{"login": "user1", "avatar_url": "", "html_url": "", "contributions": 3}]
+            else:
+                m.json.return_value = {"open_issues_count": 4}
+            return m
+
+        mock_get.side_effect = side_effect
+
+        collector = InsightsCollector(self.token, max_workers=len(InsightsCollector.METRICS))
+        try:
+            insights = collector.collect_insights_many(["owner/repo"])["owner/repo"]
+        finally:
+            collector.close()
+
+        self.assertEqual(insights["commit_frequency_score"], 10.0)
+        self.assertEqual(insights["health_percentage"], 80)
+        self.assertEqual(insights["pr_merge_ratio"], 1.0)
+        self.assertEqual(insights["open_issues_count"], 4)
+        self.assertEqual(insights["last_commit_date"], "2024-01-01T00:00:00Z")
+        self.assertEqual(mock_get.call_count, len(InsightsCollector.METRICS))
+
+    def test_graphql_batch_collects_insights_in_one_call(self):
+        scanner = GitHubScanner(self.token, insights_backend="graphql")
+        repos = [{"full_name": f"owner/repo{i}"} for i in range(3)]
+        scanner.insights_collector.collect_insights_many = MagicMock(
+            return_value={r["full_name"]: {"name": r["full_name"]} for r in repos}
+        )
+        scanner.insights_collector.collect_insights = MagicMock()
+
+        outcomes = scanner._collect_batch_insights(repos)
+
+        scanner.insights_collector.collect_insights_many.assert_called_once_with(
+            ["owner/repo0", "owner/repo1", "owner/repo2"]
+        )
+        scanner.insights_collector.collect_insights.assert_not_called()
+        self.assertEqual([o["name"] for o in outcomes], ["owner/repo0", "owner/repo1", "owner/repo2"])
+
     def test_classifier_logic(self):
         classifier = RepoClassifier()
 
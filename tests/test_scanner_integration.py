@@ -12,7 +12,7 @@ class TestGitHubScanner(unittest.TestCase):
     def setUp(self):
         self.scanner = GitHubScanner(token="dummy_token")
 
-    @patch('requests.get')
+    @patch('scanner.github_transport.GitHubTransport.get')
     def test_scan_recent_repos(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -27,7 +27,7 @@ class TestGitHubScanner(unittest.TestCase):
             self.assertEqual(len(repos), 1)
             self.assertEqual(repos[0]["name"], "repo1")
 
-    @patch('requests.get')
+    @patch('scanner.github_transport.GitHubTransport.get')
     def test_validate_repo_valid(self, mock_get):
         # Mock validation calls (Readme, CI)
         mock_response = MagicMock()
@@ -54,7 +54,7 @@ class TestGitHubScanner(unittest.TestCase):
         is_valid = self.scanner.validate_repo(repo)
         self.assertTrue(is_valid)
 
-    @patch('requests.get')
+    @patch('scanner.github_transport.GitHubTransport.get')
     def test_validate_repo_invalid(self, mock_get):
         # Mock validation calls (Readme too small)
         mock_response = MagicMock()
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from api.search_index import SearchIndex, tokenize
+
+
+REPOS = [
+    {"name": "tensorflow", "full_name": "tensorflow/tensorflow",
+     "description": "An open source machine learning framework", "topics": ["ml", "deep-learning"], "score": 90},
+    {"name": "chatgpt-cli", "full_name": "someone/chatgpt-cli",
+     "description": "Talk to language models from the terminal", "topics": ["cli", "llm"], "score": 40},
+    {"name": "fastapi", "full_name": "tiangolo/fastapi",
+     "description": "High performance web framework", "topics": ["python", "web"], "score": 80},
+    {"name": "flask", "full_name": "pallets/flask",
+     "description": "The Python micro framework for building web applications", "topics": ["python", "web"],
+     "score": 70},
+    {"name": "web", "full_name": "acme/web",
+     "description": None, "topics": [], "score": 10},
+]
+
+
+def _names(repos):
+    return [repo["name"] for repo in repos]
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.sync(REPOS)
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Deep-Learning, C++ & GPT4!") == ["deep", "learning", "c", "gpt4"]
+
+
+def test_exact_prefix_and_infix_matches(index):
+    assert _names(index.search("tensorflow")[0]) == ["tensorflow"]
+    assert _names(index.search("tensor")[0]) == ["tensorflow"]
+    assert _names(index.search("gpt")[0]) == ["chatgpt-cli"]
+
+
+def test_typos_fall_back_to_similar_terms(index):
+    assert _names(index.search("tensorflwo")[0]) == ["tensorflow"]
+
+
+def test_every_word_must_match(index):
+    repos, total = index.search("python framework")
+
+    assert set(_names(repos)) == {"fastapi", "flask"}
+    assert total == 2
+    assert index.search("python tensorflow") == ([], 0)
+
+
+def test_exact_name_ranks_first(index):
+    repos, _ = index.search("web")
+
+    # "web" has the lowest score but its name is exactly the query
+    assert _names(repos)[0] == "web"
+    assert set(_names(repos)) == {"fastapi", "flask", "web"}
+
+
+def test_score_breaks_equal_text_matches():
+    index = SearchIndex()
+    index.sync([
+        {"name": "a", "full_name": "x/a", "description": "vector database", "score": 10},
+        {"name": "b", "full_name": "x/b", "description": "vector database", "score": 90},
+    ])
+
+    assert _names(index.search("vector")[0]) == ["b", "a"]
+
+
+def test_pagination(index):
+    first, total = index.search("framework", offset=0, limit=2)
+    second, _ = index.search("framework", offset=2, limit=2)
+
+    assert total == 3
+    assert len(first) == 2 and len(second) == 1
+    assert not set(_names(first)) & set(_names(second))
+
+
+def test_sync_is_incremental(index):
+    changed = dict(REPOS[2], description="Modern async API framework")
+    added = {"name": "axum", "full_name": "tokio-rs/axum", "description": "Web framework for Rust", "score": 60}
+    repos = [REPOS[0], REPOS[1], changed, added]
+
+    assert index.sync(repos) == (2, 2)
+    assert index.sync(repos) == (0, 0)
+    assert _names(index.search("async")[0]) == ["fastapi"]
+    assert index.search("flask") == ([], 0)
+    assert _names(index.search("rust")[0]) == ["axum"]
+
+
+def test_incremental_sync_matches_fresh_build():
+    rng = random.Random(3)
+    words = ["graph", "vector", "search", "engine", "rust", "python", "cli", "agent", "llm", "database"]
+
+    def repo(i):
+        return {
+            "name": f"{rng.choice(words)}-{i}",
+            "full_name": f"owner/repo{i}",
+            "description": " ".join(rng.sample(words, 4)),
+            "topics": rng.sample(words, 2),
+            "score": rng.randint(0, 100),
+        }
+
+    repos = [repo(i) for i in range(200)]
+    incremental = SearchIndex()
+    incremental.sync(repos)
+
+    updated = [r if rng.random() > 0.2 else repo(i) for i, r in enumerate(repos[:180])] + [repo(i) for i in range(300, 330)]
+    incremental.sync(updated)
+    fresh = SearchIndex()
+    fresh.sync(updated)
+
+    for query in ["graph", "vec", "rust agent", "datab", "engine python cli"]:
+        assert incremental.search(query, limit=50) == fresh.search(query, limit=50)
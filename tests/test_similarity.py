@@ -0,0 +1,82 @@
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from blog_generator.similarity import SimilarityIndex
+from generate_blogs_from_analysis import find_similar_projects
+
+
+def brute_force(current, all_projects, limit=3):
+    """The original all-pairs implementation."""
+    similar = []
+    current_lang = current['metadata'].get('language', 'Unknown')
+    current_topics = set(current['metadata'].get('topics', []))
+    for other in all_projects:
+        if other['repo'] == current['repo']:
+            continue
+        score = 0
+        if other['metadata'].get('language') == current_lang:
+            score += 2
+        score += len(current_topics.intersection(set(other['metadata'].get('topics', []))))
+        if score > 0:
+            similar.append({
+                'name': other['repo'],
+                'url': f"https://github.com/{other['repo']}",
+                'description': other['metadata'].get('description', ''),
+                'score': score
+            })
+    similar.sort(key=lambda x: x['score'], reverse=True)
+    return similar[:limit]
+
+
+def _analyses(n, seed):
+    rng = random.Random(seed)
+    languages = ["Python", "Rust", "Go", "Unknown", None]
+    topics = [f"t{i}" for i in range(12)]
+    analyses = []
+    for i in range(n):
+        metadata = {"description": f"project {i}", "topics": rng.sample(topics, rng.randint(0, 4))}
+        language = rng.choice(languages)
+        if language is not None:
+            metadata["language"] = language
+        # A few repeated names, as in re-analysed batches
+        analyses.append({"repo": f"owner/repo{rng.randint(0, n - 5)}", "metadata": metadata})
+    return analyses
+
+
+def test_matches_brute_force_scores_and_tie_order():
+    for seed in range(5):
+        analyses = _analyses(80, seed)
+        index = SimilarityIndex.from_analyses(analyses)
+        for limit in (1, 3, 10):
+            for current in analyses:
+                assert find_similar_projects(current, analyses, limit, index=index) == brute_force(current, analyses, limit)
+
+
+def test_description_terms_add_weighted_bonus():
+    index = SimilarityIndex(text_weight=1.0)
+    index.add("a/vector", "Rust", [], "Embedded vector database for similarity search")
+    index.add("b/web", "Rust", [], "Web framework")
+    index.add("c/vectors", "Python", [], "Approximate similarity search over vector embeddings")
+    for i in range(10):
+        index.add(f"filler/{i}", "Go", [], f"filler number{i}")
+
+    top = [index.key(doc_id) for doc_id, _ in index.similar("a/vector", k=2)]
+    assert top == ["c/vectors", "b/web"]
+
+
+def test_indexes_published_blog_posts(tmp_path):
+    for slug, language, tags in [("one", "Rust", ["cli"]), ("two", "Rust", ["web"]), ("three", "Go", ["cli"])]:
+        post = tmp_path / "dev" / slug / "index.md"
+        post.parent.mkdir(parents=True)
+        post.write_text(f'---\nrepo: owner/{slug}\nlanguage: {language}\ntags: {tags}\n---\n', encoding="utf-8")
+
+    index = SimilarityIndex.from_blog(str(tmp_path))
+    related = [(index.key(doc_id), score) for doc_id, score in index.similar("owner/one", k=5)]
+
+    assert related == [("owner/two", 2), ("owner/three", 1)]
+    assert index.payload(0)["path"].endswith("index.md")